@@ -0,0 +1,46 @@
+"""create note analytics table
+
+Revision ID: 5b7e2c91d4a3
+Revises: 427db3e3d49e
+Create Date: 2026-10-17 10:12:31.402117
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b7e2c91d4a3"
+down_revision: Union[str, None] = "427db3e3d49e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "note_analytics",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("note_count", sa.Integer(), nullable=False),
+        sa.Column("total_word_count", sa.Integer(), nullable=False),
+        sa.Column("word_frequencies", sa.JSON(), nullable=False),
+        sa.Column("longest_candidates", sa.JSON(), nullable=False),
+        sa.Column("shortest_candidates", sa.JSON(), nullable=False),
+        sa.Column("is_stale", sa.Boolean(), nullable=False),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("note_analytics")
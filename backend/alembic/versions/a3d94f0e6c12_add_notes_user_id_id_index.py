@@ -0,0 +1,32 @@
+"""add notes user_id id index
+
+Revision ID: a3d94f0e6c12
+Revises: 5b7e2c91d4a3
+Create Date: 2026-10-17 11:03:48.215604
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a3d94f0e6c12"
+down_revision: Union[str, None] = "5b7e2c91d4a3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("notes", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_notes_user_id_id", ["user_id", "id"], unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("notes", schema=None) as batch_op:
+        batch_op.drop_index("ix_notes_user_id_id")
@@ -0,0 +1,34 @@
+"""add notes previous_version_id index
+
+Revision ID: b5c1e7a9d402
+Revises: f2d8c4a61b37
+Create Date: 2026-10-17 17:12:05.381946
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b5c1e7a9d402"
+down_revision: Union[str, None] = "f2d8c4a61b37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("notes", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_notes_previous_version_id",
+            ["previous_version_id"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("notes", schema=None) as batch_op:
+        batch_op.drop_index("ix_notes_previous_version_id")
@@ -0,0 +1,51 @@
+"""add note version deltas
+
+Revision ID: c7e2a4f8b913
+Revises: b5c1e7a9d402
+Create Date: 2026-10-17 18:05:44.902317
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c7e2a4f8b913"
+down_revision: Union[str, None] = "b5c1e7a9d402"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing versions keep their full text; compress them afterwards with
+    # ``python -m src.notes.commands compress-versions``.
+    with op.batch_alter_table("notes", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("delta", sa.Text(), nullable=True))
+        batch_op.add_column(
+            sa.Column("delta_base_id", sa.Integer(), nullable=True)
+        )
+        batch_op.add_column(
+            sa.Column(
+                "version", sa.Integer(), nullable=False, server_default="0"
+            )
+        )
+        batch_op.alter_column("text", existing_type=sa.Text(), nullable=True)
+        batch_op.create_index(
+            "ix_notes_delta_base_id", ["delta_base_id"], unique=False
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Run ``compress-versions --expand`` first, deltas cannot be restored
+    # in SQL.
+    with op.batch_alter_table("notes", schema=None) as batch_op:
+        batch_op.drop_index("ix_notes_delta_base_id")
+        batch_op.alter_column("text", existing_type=sa.Text(), nullable=False)
+        batch_op.drop_column("version")
+        batch_op.drop_column("delta_base_id")
+        batch_op.drop_column("delta")
@@ -0,0 +1,41 @@
+"""create summary cache table
+
+Revision ID: c81f5a7d2e94
+Revises: a3d94f0e6c12
+Create Date: 2026-10-17 12:20:05.774391
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c81f5a7d2e94"
+down_revision: Union[str, None] = "a3d94f0e6c12"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "summary_cache",
+        sa.Column("key", sa.String(length=64), nullable=False),
+        sa.Column("model_name", sa.String(length=64), nullable=False),
+        sa.Column("summary", sa.Text(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("key"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("summary_cache")
@@ -0,0 +1,58 @@
+"""add notes is_head
+
+Revision ID: d3f6b8a2c751
+Revises: c7e2a4f8b913
+Create Date: 2026-10-17 19:21:37.114052
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d3f6b8a2c751"
+down_revision: Union[str, None] = "c7e2a4f8b913"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("notes", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "is_head",
+                sa.Boolean(),
+                nullable=False,
+                server_default=sa.text("true"),
+            )
+        )
+
+    op.execute(
+        "UPDATE notes SET is_head = false WHERE id IN ("
+        "SELECT previous_version_id FROM notes "
+        "WHERE previous_version_id IS NOT NULL)"
+    )
+    # Aggregates counted every version so far, rebuild them on next read.
+    op.execute("UPDATE note_analytics SET is_stale = true")
+
+    with op.batch_alter_table("notes", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_notes_user_id_id_head",
+            ["user_id", "id"],
+            unique=False,
+            postgresql_where=sa.text("is_head"),
+            sqlite_where=sa.text("is_head"),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("notes", schema=None) as batch_op:
+        batch_op.drop_index("ix_notes_user_id_id_head")
+        batch_op.drop_column("is_head")
+
+    op.execute("UPDATE note_analytics SET is_stale = true")
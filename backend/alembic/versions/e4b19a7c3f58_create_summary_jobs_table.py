@@ -0,0 +1,70 @@
+"""create summary jobs table
+
+Revision ID: e4b19a7c3f58
+Revises: c81f5a7d2e94
+Create Date: 2026-10-17 13:05:41.208614
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e4b19a7c3f58"
+down_revision: Union[str, None] = "c81f5a7d2e94"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing notes were summarized inline, so they start out completed.
+    with op.batch_alter_table("notes", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column(
+                "summary_status",
+                sa.String(length=16),
+                server_default="completed",
+                nullable=False,
+            )
+        )
+
+    op.create_table(
+        "summary_jobs",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("note_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(length=16), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("run_after", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("locked_by", sa.String(length=64), nullable=True),
+        sa.Column("locked_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(["note_id"], ["notes.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_summary_jobs_status_run_after",
+        "summary_jobs",
+        ["status", "run_after"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_summary_jobs_status_run_after", table_name="summary_jobs"
+    )
+    op.drop_table("summary_jobs")
+
+    with op.batch_alter_table("notes", schema=None) as batch_op:
+        batch_op.drop_column("summary_status")
@@ -0,0 +1,38 @@
+"""add notes search vector
+
+Revision ID: e8a3c5d1f264
+Revises: d3f6b8a2c751
+Create Date: 2026-10-17 20:34:12.667813
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e8a3c5d1f264"
+down_revision: Union[str, None] = "d3f6b8a2c751"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Generated, so every write keeps it current without application code.
+    op.execute(
+        "ALTER TABLE notes ADD COLUMN search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('english', coalesce(text, ''))) "
+        "STORED"
+    )
+    op.execute(
+        "CREATE INDEX ix_notes_search_vector ON notes "
+        "USING gin (search_vector) WHERE is_head"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP INDEX ix_notes_search_vector")
+    op.execute("ALTER TABLE notes DROP COLUMN search_vector")
@@ -0,0 +1,64 @@
+"""hash refresh tokens
+
+Revision ID: f2d8c4a61b37
+Revises: e4b19a7c3f58
+Create Date: 2026-10-17 15:42:18.530927
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f2d8c4a61b37"
+down_revision: Union[str, None] = "e4b19a7c3f58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table("refresh_tokens", schema=None) as batch_op:
+        batch_op.add_column(
+            sa.Column("token_hash", sa.String(length=64), nullable=True)
+        )
+
+    # Keep existing sessions valid by hashing the stored tokens.
+    op.execute(
+        "UPDATE refresh_tokens "
+        "SET token_hash = encode(sha256(convert_to(token, 'UTF8')), 'hex')"
+    )
+
+    with op.batch_alter_table("refresh_tokens", schema=None) as batch_op:
+        batch_op.alter_column("token_hash", nullable=False)
+        batch_op.create_unique_constraint(
+            "uq_refresh_tokens_token_hash", ["token_hash"]
+        )
+        batch_op.drop_column("token")
+        batch_op.create_index(
+            "ix_refresh_tokens_user_id_expires_at",
+            ["user_id", "expires_at"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Only digests are stored, so the tokens themselves cannot be restored.
+    op.execute("DELETE FROM refresh_tokens")
+
+    with op.batch_alter_table("refresh_tokens", schema=None) as batch_op:
+        batch_op.drop_index("ix_refresh_tokens_user_id_expires_at")
+        batch_op.drop_constraint(
+            "uq_refresh_tokens_token_hash", type_="unique"
+        )
+        batch_op.drop_column("token_hash")
+        batch_op.add_column(
+            sa.Column("token", sa.String(length=512), nullable=False)
+        )
+        batch_op.create_unique_constraint(
+            "refresh_tokens_token_key", ["token"]
+        )
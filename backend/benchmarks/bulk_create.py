@@ -0,0 +1,96 @@
+"""
+Benchmark of note creation through the API.
+
+Creates notes with one ``POST /notes/`` per note and with
+``POST /notes/bulk/`` in batches, in-process against a SQLite database,
+and reports notes per second for both paths. Summaries are only queued,
+as in production. ``--skip-profanity-check`` isolates the database work
+from note validation, which costs the same on both paths.
+
+Usage:
+    python -m benchmarks.bulk_create [--notes N] [--batch-size N]
+                                     [--skip-profanity-check]
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from asgi_lifespan import LifespanManager
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.database import BaseModel, get_db
+from core.dependencies import get_jwt_auth_manager, get_read_db
+from src.auth.models import UserModel
+from src.main import app
+from src.notes import validators
+
+
+async def benchmark(notes: int, batch_size: int) -> None:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+    session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db():
+        async with session() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+
+    async with session() as db:
+        user = UserModel.create("bulk-benchmark@example.com", "-")
+        db.add(user)
+        await db.commit()
+    token = get_jwt_auth_manager().create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {token}"}
+    texts = [
+        f"Imported note number {i} with a few words" for i in range(notes)
+    ]
+
+    async with LifespanManager(app):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://benchmark/api/v1",
+        ) as client:
+            started_at = time.perf_counter()
+            for text in texts:
+                response = await client.post(
+                    "/notes/", json={"text": text}, headers=headers
+                )
+                response.raise_for_status()
+            single_rate = notes / (time.perf_counter() - started_at)
+
+            started_at = time.perf_counter()
+            for start in range(0, notes, batch_size):
+                batch = texts[start : start + batch_size]
+                response = await client.post(
+                    "/notes/bulk/",
+                    json={"notes": [{"text": text} for text in batch]},
+                    headers=headers,
+                )
+                response.raise_for_status()
+            bulk_rate = notes / (time.perf_counter() - started_at)
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+    print(f"POST /notes/:      {single_rate:10.0f} notes/s")
+    print(f"POST /notes/bulk/: {bulk_rate:10.0f} notes/s")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=2000)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--skip-profanity-check", action="store_true")
+    args = parser.parse_args(argv)
+    if args.skip_profanity_check:
+        validators.contains_profanity = lambda text: False
+    asyncio.run(benchmark(args.notes, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark of note deletion through the API.
+
+Seeds version chains in a SQLite database, deletes every other version
+with one ``DELETE /notes/{id}/`` per note and, on a fresh copy of the
+same chains, with ``DELETE /notes/bulk/`` in batches, then reports notes
+per second for both paths. Deleting every other version relinks the
+versions kept and promotes the predecessors of deleted heads, so both
+paths do all of their chain fix-ups.
+
+Usage:
+    python -m benchmarks.bulk_delete [--notes N] [--chain-length N]
+                                     [--batch-size N]
+"""
+
+import argparse
+import asyncio
+import time
+
+import httpx
+from asgi_lifespan import LifespanManager
+from sqlalchemy import insert, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.database import BaseModel, get_db
+from core.dependencies import get_jwt_auth_manager, get_read_db
+from src.auth.models import UserModel
+from src.main import app
+from src.notes.models import NoteModel
+
+
+async def seed_chains(
+    session: sessionmaker, user_id: int, notes: int, chain_length: int
+) -> list[int]:
+    async with session() as db:
+        result = await db.scalars(
+            insert(NoteModel).returning(
+                NoteModel.id, sort_by_parameter_order=True
+            ),
+            [
+                {
+                    "text": f"Version {i % chain_length} of chain "
+                    f"{i // chain_length}",
+                    "user_id": user_id,
+                    "version": i % chain_length,
+                    "is_head": (i + 1) % chain_length == 0 or i == notes - 1,
+                }
+                for i in range(notes)
+            ],
+        )
+        ids = result.all()
+        links = [
+            {"id": ids[i], "previous_version_id": ids[i - 1]}
+            for i in range(notes)
+            if i % chain_length
+        ]
+        if links:
+            await db.execute(update(NoteModel), links)
+        await db.commit()
+    return ids[1::2]
+
+
+async def run(
+    notes: int, chain_length: int, batch_size: int, bulk: bool
+) -> float:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+    session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def override_get_db():
+        async with session() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+
+    async with session() as db:
+        user = UserModel.create("bulk-benchmark@example.com", "-")
+        db.add(user)
+        await db.commit()
+    token = get_jwt_auth_manager().create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {token}"}
+    ids = await seed_chains(session, user.id, notes, chain_length)
+
+    async with LifespanManager(app):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://benchmark/api/v1",
+        ) as client:
+            started_at = time.perf_counter()
+            if bulk:
+                for start in range(0, len(ids), batch_size):
+                    response = await client.request(
+                        "DELETE",
+                        "/notes/bulk/",
+                        json={"ids": ids[start : start + batch_size]},
+                        headers=headers,
+                    )
+                    response.raise_for_status()
+            else:
+                for note_id in ids:
+                    response = await client.delete(
+                        f"/notes/{note_id}/", headers=headers
+                    )
+                    response.raise_for_status()
+            rate = len(ids) / (time.perf_counter() - started_at)
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+    return rate
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=10_000)
+    parser.add_argument("--chain-length", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    single_rate = asyncio.run(
+        run(args.notes, args.chain_length, args.batch_size, bulk=False)
+    )
+    bulk_rate = asyncio.run(
+        run(args.notes, args.chain_length, args.batch_size, bulk=True)
+    )
+    print(f"DELETE /notes/{{id}}/: {single_rate:10.0f} notes/s")
+    print(f"DELETE /notes/bulk/: {bulk_rate:10.0f} notes/s")
+
+
+if __name__ == "__main__":
+    main()
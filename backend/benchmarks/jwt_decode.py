@@ -0,0 +1,65 @@
+"""
+Microbenchmark of access token decoding.
+
+Decodes the same bearer token repeatedly with each JWT manager and reports
+decodes per second. Other JWTAuthManagerInterface implementations can be
+compared by passing their import path, e.g. ``--manager pkg.module:Class``;
+they are constructed with the same keyword arguments as JWTAuthManager.
+
+Usage:
+    python -m benchmarks.jwt_decode [--decodes N] [--manager PATH ...]
+"""
+
+import argparse
+import importlib
+import time
+
+from core.settings import settings
+from security.interfaces import JWTAuthManagerInterface
+from security.token_cache import CachedJWTAuthManager
+
+
+def _build_manager(path: str) -> JWTAuthManagerInterface:
+    module_name, class_name = path.split(":")
+    manager_class = getattr(importlib.import_module(module_name), class_name)
+    return manager_class(
+        secret_key_access=settings.secret_key_access,
+        secret_key_refresh=settings.secret_key_refresh,
+        algorithm=settings.jwt_signing_algorithm,
+    )
+
+
+def _measure(manager: JWTAuthManagerInterface, decodes: int) -> float:
+    token = manager.create_access_token({"user_id": 1, "email": "a@b.c"})
+    started_at = time.perf_counter()
+    for _ in range(decodes):
+        manager.decode_access_token(token)
+    return decodes / (time.perf_counter() - started_at)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--decodes", type=int, default=20000)
+    parser.add_argument(
+        "--manager",
+        action="append",
+        default=["security.jwt_manager:JWTAuthManager"],
+        help="Additional JWTAuthManagerInterface implementation to measure.",
+    )
+    args = parser.parse_args(argv)
+
+    for path in args.manager:
+        manager = _build_manager(path)
+        rate = _measure(manager, args.decodes)
+        print(f"{path:45s} {rate:12.0f} decodes/s")
+
+        cached_rate = _measure(
+            CachedJWTAuthManager(manager, max_entries=1024), args.decodes
+        )
+        print(
+            f"{'  + verified-token cache':45s} {cached_rate:12.0f} decodes/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
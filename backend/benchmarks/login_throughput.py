@@ -0,0 +1,87 @@
+"""
+Benchmark of password verification inside one API worker.
+
+Runs concurrent logins (bcrypt verifications) inline on the event loop and
+through the PasswordHasher process pool, while a probe task measures how
+late the event loop wakes it up. Reports logins per second and the probe
+lag, i.e. the latency other requests of the same worker would see.
+
+Usage:
+    python -m benchmarks.login_throughput [--logins N] [--workers N]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from core.executors import BoundedProcessExecutor
+from core.utils import hash_password, verify_password
+from security.passwords import PasswordHasher
+
+
+PROBE_INTERVAL_SECONDS = 0.01
+PASSWORD = "StrongPass123!"
+
+
+async def _probe(lags: list[float], stop: asyncio.Event) -> None:
+    while not stop.is_set():
+        started_at = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL_SECONDS)
+        lags.append(time.perf_counter() - started_at - PROBE_INTERVAL_SECONDS)
+
+
+async def _run(verify, logins: int) -> None:
+    lags: list[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(lags, stop))
+    await asyncio.sleep(0)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(verify() for _ in range(logins)))
+    seconds = time.perf_counter() - started_at
+
+    stop.set()
+    await probe
+    print(
+        f"  {logins / seconds:6.2f} logins/s, event loop lag "
+        f"p50 {statistics.median(lags) * 1000:8.1f} ms, "
+        f"max {max(lags) * 1000:8.1f} ms"
+    )
+
+
+async def benchmark(logins: int, workers: int) -> None:
+    hashed_password = hash_password(PASSWORD)
+
+    async def verify_inline() -> bool:
+        return verify_password(PASSWORD, hashed_password)
+
+    print("inline:")
+    await _run(verify_inline, logins)
+
+    executor = BoundedProcessExecutor(
+        max_workers=workers, max_pending=logins, timeout=600
+    )
+    executor.start()
+    hasher = PasswordHasher(executor)
+    try:
+        # Spawn the worker processes before measuring.
+        await asyncio.gather(
+            *(hasher.verify(PASSWORD, hashed_password) for _ in range(workers))
+        )
+        print(f"process pool ({workers} workers):")
+        await _run(lambda: hasher.verify(PASSWORD, hashed_password), logins)
+    finally:
+        executor.shutdown()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--logins", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args(argv)
+    asyncio.run(benchmark(args.logins, args.workers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Benchmark of reading a note's version history.
+
+Builds a chain of versions linked through ``previous_version_id`` and
+compares walking it with one query per version, as clients had to with
+``GET /notes/{id}/``, against the paginated recursive query behind
+``GET /notes/{id}/history/``. Runs against a fresh SQLite database unless
+``--database-url`` points to a migrated database.
+
+Usage:
+    python -m benchmarks.note_history [--versions N] [--page-size N]
+                                      [--database-url URL]
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.database import BaseModel
+from src.auth.models import UserModel
+from src.notes.history import get_note_history
+from src.notes.models import NoteModel
+
+
+async def _build_chain(db: AsyncSession, versions: int) -> tuple[int, int]:
+    user = UserModel.create("history-benchmark@example.com", "-")
+    db.add(user)
+    await db.flush()
+
+    previous_version_id = None
+    for i in range(versions):
+        result = await db.execute(
+            insert(NoteModel)
+            .values(
+                text=f"Version {i}",
+                user_id=user.id,
+                previous_version_id=previous_version_id,
+            )
+            .returning(NoteModel.id)
+        )
+        previous_version_id = result.scalar_one()
+    await db.commit()
+    return user.id, previous_version_id
+
+
+async def _walk_per_version(db: AsyncSession, note_id: int) -> int:
+    count = 0
+    while note_id is not None:
+        result = await db.execute(
+            select(NoteModel.previous_version_id).where(
+                NoteModel.id == note_id
+            )
+        )
+        note_id = result.scalar_one()
+        count += 1
+    return count
+
+
+async def _walk_history(
+    db: AsyncSession, note_id: int, user_id: int, page_size: int
+) -> int:
+    count = 0
+    before_id = None
+    while True:
+        versions, before_id = await get_note_history(
+            db, note_id, user_id, page_size, before_id
+        )
+        count += len(versions)
+        if before_id is None:
+            return count
+
+
+async def benchmark(versions: int, page_size: int, database_url: str) -> None:
+    engine = create_async_engine(database_url)
+    if database_url.startswith("sqlite"):
+        async with engine.begin() as conn:
+            await conn.run_sync(BaseModel.metadata.create_all)
+    session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with session() as db:
+        user_id, head_id = await _build_chain(db, versions)
+        try:
+            started_at = time.perf_counter()
+            walked = await _walk_per_version(db, head_id)
+            print(
+                f"per-version queries: {walked} versions in "
+                f"{(time.perf_counter() - started_at) * 1000:8.1f} ms"
+            )
+
+            started_at = time.perf_counter()
+            await get_note_history(db, head_id, user_id, page_size)
+            print(
+                f"first history page:  {page_size} versions in "
+                f"{(time.perf_counter() - started_at) * 1000:8.1f} ms"
+            )
+
+            started_at = time.perf_counter()
+            walked = await _walk_history(db, head_id, user_id, page_size)
+            print(
+                f"all history pages:   {walked} versions in "
+                f"{(time.perf_counter() - started_at) * 1000:8.1f} ms"
+            )
+        finally:
+            await db.execute(
+                delete(NoteModel).where(NoteModel.user_id == user_id)
+            )
+            await db.execute(delete(UserModel).where(UserModel.id == user_id))
+            await db.commit()
+    await engine.dispose()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--versions", type=int, default=2000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument(
+        "--database-url", default="sqlite+aiosqlite:///:memory:"
+    )
+    args = parser.parse_args(argv)
+    asyncio.run(benchmark(args.versions, args.page_size, args.database_url))
+
+
+if __name__ == "__main__":
+    main()
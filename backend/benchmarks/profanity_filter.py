@@ -0,0 +1,58 @@
+"""
+Benchmark of the note profanity check.
+
+Times ``ProfanityFilter.is_profane``, which runs one regex substitution
+per profane word, against the compiled pattern of
+``validators.contains_profanity`` on clean notes from 100 B to 1 MB.
+Clean notes are the worst case, as the whole text is scanned.
+
+Usage:
+    python -m benchmarks.profanity_filter [--sizes BYTES ...]
+"""
+
+import argparse
+import timeit
+
+from profanityfilter import ProfanityFilter
+
+from src.notes.validators import contains_profanity
+
+
+SENTENCE = "The quick brown fox jumps over the lazy dog, then naps. "
+
+
+def make_text(size: int) -> str:
+    return (SENTENCE * (size // len(SENTENCE) + 1))[:size]
+
+
+def best_time(check, text: str) -> float:
+    timer = timeit.Timer(lambda: check(text))
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=3, number=number)) / number
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[100, 1_000, 10_000, 100_000, 1_000_000],
+    )
+    args = parser.parse_args(argv)
+
+    profanity_filter = ProfanityFilter()
+    print(f"{'size':>10} {'is_profane':>12} {'compiled':>12} {'speedup':>8}")
+    for size in args.sizes:
+        text = make_text(size)
+        assert contains_profanity(text) == profanity_filter.is_profane(text)
+        baseline = best_time(profanity_filter.is_profane, text)
+        compiled = best_time(contains_profanity, text)
+        print(
+            f"{size:>10} {baseline * 1000:>10.3f}ms "
+            f"{compiled * 1000:>10.3f}ms {baseline / compiled:>7.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
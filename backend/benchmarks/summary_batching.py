@@ -0,0 +1,77 @@
+"""
+Benchmark of batched note summarization.
+
+Summarizes the same notes with one prompt per note and through the
+SummaryBatcher, against the deterministic fake backend with a simulated
+round-trip latency, and reports model calls and wall time for both.
+
+Usage:
+    python -m benchmarks.summary_batching [--notes N] [--batch-size N]
+                                          [--latency SECONDS]
+                                          [--concurrency N]
+"""
+
+import argparse
+import asyncio
+import time
+
+from summarization.backends import FakeSummarizerBackend
+from summarization.batcher import SummaryBatcher
+from summarization.prompts import build_prompt
+
+
+async def _run(summarize, texts: list[str], concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def summarize_one(text: str) -> str:
+        async with semaphore:
+            return await summarize(text)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*map(summarize_one, texts))
+    return time.perf_counter() - started_at
+
+
+async def benchmark(
+    notes: int, batch_size: int, latency: float, concurrency: int
+) -> None:
+    texts = [
+        f"Bulk imported note {i} about the quarterly planning meeting"
+        for i in range(notes)
+    ]
+
+    backend = FakeSummarizerBackend(latency_seconds=latency)
+
+    async def summarize_unbatched(text: str) -> str:
+        return await backend.complete(build_prompt(text))
+
+    seconds = await _run(summarize_unbatched, texts, concurrency)
+    print(f"unbatched: {backend.calls:5d} calls {seconds:8.3f}s")
+
+    backend = FakeSummarizerBackend(latency_seconds=latency)
+    batcher = SummaryBatcher(
+        backend, max_batch_size=batch_size, max_wait_seconds=0.01
+    )
+    seconds = await _run(batcher.summarize, texts, concurrency)
+    print(f"batched:   {backend.calls:5d} calls {seconds:8.3f}s")
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--notes", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=50,
+        help="Maximum number of texts awaiting a summary at a time.",
+    )
+    args = parser.parse_args(argv)
+    asyncio.run(
+        benchmark(args.notes, args.batch_size, args.latency, args.concurrency)
+    )
+
+
+if __name__ == "__main__":
+    main()
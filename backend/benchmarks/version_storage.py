@@ -0,0 +1,115 @@
+"""
+Benchmark of delta storage of note versions.
+
+Edits a note of ``--size`` bytes ``--edits`` times through the same code
+path as ``PATCH /notes/{id}/`` and reports the stored text size with and
+without deltas, the cost of computing a delta per edit and the latency of
+reading old versions, for each snapshot interval.
+
+Usage:
+    python -m benchmarks.version_storage [--size BYTES] [--edits N]
+                                         [--interval N ...]
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.database import BaseModel
+from core.settings import settings
+from src.auth.models import UserModel
+from src.notes.models import NoteModel
+from src.notes.versions import compress_version, load_version_texts
+
+
+def _edit(text: str, rng: random.Random) -> str:
+    words = text.split(" ")
+    position = rng.randrange(len(words))
+    words[position : position + 3] = [f"edit{rng.randrange(10**6)}"]
+    return " ".join(words)
+
+
+async def _run(size: int, edits: int, interval: int) -> None:
+    settings.note_snapshot_interval = interval
+    rng = random.Random(0)
+    words = [f"word{rng.randrange(5000)}" for _ in range(size // 8)]
+    text = " ".join(words)[:size]
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+    session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async with session() as db:
+        user = UserModel.create("versions-benchmark@example.com", "-")
+        db.add(user)
+        await db.flush()
+
+        note = NoteModel(text=text, user_id=user.id)
+        db.add(note)
+        await db.flush()
+        note_ids = [note.id]
+        full_size = len(text)
+        delta_seconds = []
+        for _ in range(edits):
+            text = _edit(text, rng)
+            previous = note
+            note = NoteModel(
+                text=text,
+                user_id=user.id,
+                previous_version_id=previous.id,
+                version=previous.version + 1,
+            )
+            db.add(note)
+            await db.flush()
+            started_at = time.perf_counter()
+            compress_version(previous, note)
+            delta_seconds.append(time.perf_counter() - started_at)
+            note_ids.append(note.id)
+            full_size += len(text)
+        await db.commit()
+
+        result = await db.execute(
+            select(
+                func.sum(func.coalesce(func.length(NoteModel.text), 0))
+                + func.sum(func.coalesce(func.length(NoteModel.delta), 0))
+            )
+        )
+        stored_size = result.scalar_one()
+
+        read_seconds = []
+        for note_id in rng.sample(note_ids, min(50, len(note_ids))):
+            db.expunge_all()
+            started_at = time.perf_counter()
+            await load_version_texts(db, [note_id])
+            read_seconds.append(time.perf_counter() - started_at)
+
+    await engine.dispose()
+    print(
+        f"interval {interval:4d}: stored {stored_size / 1024:9.1f} KiB of "
+        f"{full_size / 1024:9.1f} KiB ({stored_size / full_size:6.1%}), "
+        f"delta {statistics.median(delta_seconds) * 1000:6.2f} ms/edit, "
+        f"read p50 {statistics.median(read_seconds) * 1000:6.2f} ms, "
+        f"max {max(read_seconds) * 1000:6.2f} ms"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=50 * 1024)
+    parser.add_argument("--edits", type=int, default=200)
+    parser.add_argument("--interval", type=int, action="append", default=None)
+    args = parser.parse_args(argv)
+
+    for interval in args.interval or [1, 5, 10, 25]:
+        asyncio.run(_run(args.size, args.edits, interval))
+
+
+if __name__ == "__main__":
+    main()
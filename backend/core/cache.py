@@ -0,0 +1,135 @@
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Hashable
+
+
+class TTLCache:
+    """
+    An in-process LRU cache with per-entry time to live.
+
+    Entries are evicted in least-recently-used order once either the number
+    of entries or their approximate total size in bytes exceeds its limit.
+    Expired entries are dropped lazily when they are read.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        max_bytes: int | None = None,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: The maximum number of entries.
+            ttl_seconds: Seconds an entry stays valid after it is set.
+            max_bytes: The maximum approximate size of all values, if any.
+        """
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[Any, float, int]] = (
+            OrderedDict()
+        )
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _sizeof(value: Any) -> int:
+        if isinstance(value, str):
+            return len(value.encode())
+        return sys.getsizeof(value)
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, size = self._entries.pop(key)
+        self._size -= size
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached value for a key and mark it as recently used.
+
+        Args:
+            key: The cache key.
+            default: Value returned when the key is missing or expired.
+
+        Returns:
+            The cached value or the default.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+
+        value, expires_at, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return default
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(
+        self, key: Hashable, value: Any, ttl_seconds: float | None = None
+    ) -> None:
+        """
+        Store a value, evicting least recently used entries if needed.
+
+        Args:
+            key: The cache key.
+            value: The value to store.
+            ttl_seconds: Overrides the default time to live for this entry.
+        """
+        if key in self._entries:
+            self._remove(key)
+
+        size = self._sizeof(value)
+        if self._max_bytes is not None and size > self._max_bytes:
+            return
+
+        ttl = self._ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (value, time.monotonic() + ttl, size)
+        self._size += size
+
+        while len(self._entries) > self._max_entries or (
+            self._max_bytes is not None and self._size > self._max_bytes
+        ):
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+
+    def delete(self, key: Hashable) -> None:
+        """Remove a key from the cache if present."""
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Remove all entries and reset the size counter."""
+        self._entries.clear()
+        self._size = 0
+
+    def stats(self) -> dict:
+        """
+        Return usage counters of the cache.
+
+        Returns:
+            Dictionary with entry count, size, hits, misses, hit rate and
+            evictions.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "size_bytes": self._size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
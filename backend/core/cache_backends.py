@@ -0,0 +1,307 @@
+import asyncio
+from abc import ABC, abstractmethod
+from urllib.parse import unquote, urlparse
+
+from core.cache import TTLCache
+
+
+class CacheBackendError(Exception):
+    """Raised when a cache backend cannot serve a command."""
+
+
+class CacheBackendInterface(ABC):
+    """
+    Interface for a key-value store shared by cached responses.
+
+    Keys are strings and values bytes. Every entry has a time to live.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        """
+        Return the value of a key, or None if it is missing or expired.
+        """
+        pass
+
+    @abstractmethod
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl_seconds: float,
+        only_new: bool = False,
+    ) -> bool:
+        """
+        Store a value. With only_new, only if the key is missing.
+
+        Returns True if the value was stored.
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """
+        Remove keys if present.
+        """
+        pass
+
+    async def close(self) -> None:
+        """
+        Release the resources of the backend.
+        """
+
+    def stats(self) -> dict:
+        """
+        Return usage counters of the backend.
+        """
+        return {}
+
+
+class MemoryCacheBackend(CacheBackendInterface):
+    """
+    A cache backend keeping entries in a TTLCache of the process.
+
+    Entries are not shared with other processes, so each uvicorn worker
+    keeps its own copy.
+    """
+
+    def __init__(self, memory: TTLCache) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            memory: The in-process store.
+        """
+        self._memory = memory
+
+    async def get(self, key: str) -> bytes | None:
+        return self._memory.get(key)
+
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl_seconds: float,
+        only_new: bool = False,
+    ) -> bool:
+        if only_new and self._memory.get(key) is not None:
+            return False
+        self._memory.set(key, value, ttl_seconds=ttl_seconds)
+        return True
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._memory.delete(key)
+
+    def stats(self) -> dict:
+        return self._memory.stats()
+
+
+def encode_command(*arguments: str | bytes) -> bytes:
+    """
+    Encode a command in the Redis serialization protocol (RESP).
+
+    Args:
+        *arguments: The command name and its arguments.
+
+    Returns:
+        The command as an array of bulk strings.
+    """
+    parts = [b"*%d\r\n" % len(arguments)]
+    for argument in arguments:
+        if isinstance(argument, str):
+            argument = argument.encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(argument), argument))
+    return b"".join(parts)
+
+
+async def read_reply(
+    reader: asyncio.StreamReader,
+) -> bytes | int | list | None:
+    """
+    Read one RESP reply.
+
+    Args:
+        reader: The stream of the connection.
+
+    Returns:
+        The value of the reply: bytes for simple and bulk strings, an int
+        for integers, a list for arrays and None for null replies.
+
+    Raises:
+        CacheBackendError: If the reply is an error or malformed.
+    """
+    line = await reader.readline()
+    if not line.endswith(b"\r\n"):
+        raise CacheBackendError("Connection closed by the cache server")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload
+    if kind == b"-":
+        raise CacheBackendError(payload.decode(errors="replace"))
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise CacheBackendError(
+        f"Unexpected reply from the cache server: {line!r}"
+    )
+
+
+class RespCacheBackend(CacheBackendInterface):
+    """
+    A cache backend on a server speaking the Redis protocol.
+
+    Entries are shared by every process connected to the server, so all
+    uvicorn workers see each other's entries. Connections are opened
+    lazily and pooled; a connection that fails is discarded.
+    """
+
+    def __init__(
+        self, url: str, max_connections: int, timeout: float = 1.0
+    ) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            url: The server URL, ``redis://[:password@]host[:port][/db]``.
+            max_connections: The maximum number of open connections.
+            timeout: Seconds to wait for a connection or a reply.
+        """
+        parsed = urlparse(url)
+        self._host = parsed.hostname or "localhost"
+        self._port = parsed.port or 6379
+        self._password = unquote(parsed.password) if parsed.password else None
+        self._db = parsed.path.lstrip("/") or None
+        self._timeout = timeout
+        self._idle: list[
+            tuple[asyncio.StreamReader, asyncio.StreamWriter]
+        ] = []
+        self._slots = asyncio.Semaphore(max_connections)
+        self.commands = 0
+        self.errors = 0
+
+    async def _connect(
+        self,
+    ) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        reader, writer = await asyncio.open_connection(self._host, self._port)
+        setup = []
+        if self._password is not None:
+            setup.append(("AUTH", self._password))
+        if self._db is not None:
+            setup.append(("SELECT", self._db))
+        try:
+            for arguments in setup:
+                writer.write(encode_command(*arguments))
+                await writer.drain()
+                await read_reply(reader)
+        except BaseException:
+            writer.close()
+            raise
+        return reader, writer
+
+    async def _run(self, *arguments: str | bytes) -> bytes | int | list | None:
+        async with self._slots:
+            connection = self._idle.pop() if self._idle else None
+            try:
+                async with asyncio.timeout(self._timeout):
+                    if connection is None:
+                        connection = await self._connect()
+                    reader, writer = connection
+                    writer.write(encode_command(*arguments))
+                    await writer.drain()
+                    reply = await read_reply(reader)
+            except BaseException as e:
+                # The connection may hold a partial reply.
+                if connection is not None:
+                    connection[1].close()
+                if not isinstance(
+                    e,
+                    (
+                        OSError,
+                        EOFError,
+                        ValueError,
+                        TimeoutError,
+                        CacheBackendError,
+                    ),
+                ):
+                    raise
+                self.errors += 1
+                if isinstance(e, CacheBackendError):
+                    raise
+                raise CacheBackendError(
+                    f"Cache server {self._host}:{self._port} failed: {e!r}"
+                ) from e
+            self.commands += 1
+            self._idle.append(connection)
+            return reply
+
+    async def get(self, key: str) -> bytes | None:
+        return await self._run("GET", key)
+
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl_seconds: float,
+        only_new: bool = False,
+    ) -> bool:
+        arguments = [
+            "SET",
+            key,
+            value,
+            "PX",
+            str(max(int(ttl_seconds * 1000), 1)),
+        ]
+        if only_new:
+            arguments.append("NX")
+        return await self._run(*arguments) is not None
+
+    async def delete(self, *keys: str) -> None:
+        if keys:
+            await self._run("DEL", *keys)
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+    def stats(self) -> dict:
+        return {
+            "open_connections": len(self._idle),
+            "commands": self.commands,
+            "errors": self.errors,
+        }
+
+
+def create_cache_backend(
+    redis_url: str | None,
+    max_entries: int,
+    max_connections: int,
+) -> CacheBackendInterface:
+    """
+    Create the cache backend for the configured URL.
+
+    Args:
+        redis_url: URL of a Redis-protocol server, or None to keep entries
+            in the process.
+        max_entries: The maximum number of entries of the in-process backend.
+        max_connections: The maximum number of connections to the server.
+
+    Returns:
+        A RespCacheBackend if a URL is given, otherwise a
+        MemoryCacheBackend.
+    """
+    if redis_url:
+        return RespCacheBackend(redis_url, max_connections=max_connections)
+    # Entries carry their own time to live.
+    return MemoryCacheBackend(TTLCache(max_entries=max_entries, ttl_seconds=0))
@@ -1,9 +1,23 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+import logging
+import time
 
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine,
+)
+from sqlalchemy.orm import sessionmaker, DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from core.cache import TTLCache
+from core.metrics import register_metrics_source
 from core.settings import settings
 
 
+logger = logging.getLogger(__name__)
+
+
 class BaseModel(DeclarativeBase):
     """
     Base class for all SQLAlchemy models.
@@ -12,13 +26,200 @@ class BaseModel(DeclarativeBase):
     using SQLAlchemy's ORM. All model classes should inherit from this base.
     """
 
-    pass
+    def get_owner_id(self) -> int | None:
+        """
+        Return the id of the user owning this row, if any.
+
+        Used to route the owner's reads to the primary for a short time
+        after they write.
+        """
+        return getattr(self, "user_id", None)
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    A connection pool recording how long checkouts wait for a connection.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            waited = time.perf_counter() - started_at
+            self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.checkouts = self.checkouts
+        pool.wait_seconds_total = self.wait_seconds_total
+        pool.wait_seconds_max = self.wait_seconds_max
+        return pool
 
+    def stats(self) -> dict:
+        """
+        Return the current usage of the pool and its checkout wait times.
 
-engine = create_async_engine(settings.database_url, echo=True)
+        Returns:
+            Dictionary of pool counters.
+        """
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": max(self.overflow(), 0),
+            "max_overflow": self._max_overflow,
+            "checkouts": self.checkouts,
+            "wait_seconds_total": self.wait_seconds_total,
+            "wait_seconds_avg": (
+                self.wait_seconds_total / self.checkouts
+                if self.checkouts
+                else 0.0
+            ),
+            "wait_seconds_max": self.wait_seconds_max,
+        }
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    connect_args = {}
+    if url.startswith("postgresql+asyncpg"):
+        connect_args["prepared_statement_cache_size"] = (
+            settings.database_statement_cache_size
+        )
+    new_engine = create_async_engine(
+        url,
+        echo=settings.database_echo,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout_seconds,
+        pool_recycle=settings.database_pool_recycle_seconds,
+        pool_pre_ping=settings.database_pool_pre_ping,
+        connect_args=connect_args,
+    )
+    event.listen(
+        new_engine.sync_engine, "before_cursor_execute", _start_query_timer
+    )
+    event.listen(
+        new_engine.sync_engine, "after_cursor_execute", _log_slow_query
+    )
+    event.listen(new_engine.sync_engine, "handle_error", _forget_failed_query)
+    return new_engine
+
+
+def _start_query_timer(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _log_slow_query(
+    conn, cursor, statement, parameters, context, executemany
+) -> None:
+    elapsed = time.perf_counter() - conn.info["query_started_at"].pop()
+    threshold = settings.database_slow_query_seconds
+    if threshold and elapsed >= threshold:
+        logger.warning(f"Slow query ({elapsed:.3f}s): {statement}")
+
+
+def _forget_failed_query(context) -> None:
+    # after_cursor_execute does not run for failed statements.
+    conn = context.connection
+    if conn is not None and conn.info.get("query_started_at"):
+        conn.info["query_started_at"].pop()
+
+
+engine = _create_engine(settings.database_url)
 async_session = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
+register_metrics_source("database_pool", lambda: engine.pool.stats())
+
+replica_engine = None
+replica_session = None
+if settings.database_replica_url:
+    replica_engine = _create_engine(settings.database_replica_url)
+    replica_session = sessionmaker(
+        replica_engine, class_=AsyncSession, expire_on_commit=False
+    )
+    register_metrics_source(
+        "database_replica_pool", lambda: replica_engine.pool.stats()
+    )
+
+# Users whose writes were committed within the last READ_YOUR_WRITES_SECONDS.
+# Tracked per process: other workers do not see the writes of this one.
+recent_writers = TTLCache(
+    max_entries=100_000, ttl_seconds=settings.read_your_writes_seconds
+)
+
+_WRITERS_KEY = "writer_ids"
+
+
+def record_writer(session: Session, owner_id: int) -> None:
+    """
+    Record that a session writes data of a user.
+
+    Writes of ORM instances are recorded automatically; statements
+    executed without them, such as bulk inserts, must be recorded here so
+    the user reads from the primary after the commit.
+
+    Args:
+        session: The synchronous session, ``AsyncSession.sync_session``.
+        owner_id: The ID of the user whose data is written.
+    """
+    session.info.setdefault(_WRITERS_KEY, set()).add(owner_id)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_writers(session: Session, flush_context) -> None:
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        owner_id = instance.get_owner_id()
+        if owner_id is not None:
+            record_writer(session, owner_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _record_writers(session: Session) -> None:
+    for owner_id in session.info.pop(_WRITERS_KEY, ()):
+        recent_writers.set(owner_id, True)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_writers(session: Session) -> None:
+    session.info.pop(_WRITERS_KEY, None)
+
+
+def get_read_sessionmaker(user_id: int | None) -> sessionmaker:
+    """
+    Choose where reads on behalf of a user go.
+
+    Reads go to the replica if one is configured, unless the user committed
+    a write within READ_YOUR_WRITES_SECONDS, in which case the replica may
+    not have it yet and the primary is used. Only writes committed by this
+    process are known, so with several workers a user may still read from
+    the replica right after a write.
+
+    Args:
+        user_id: The id of the reading user, if known.
+
+    Returns:
+        The session factory of the primary or of the replica.
+    """
+    if (
+        replica_session is None
+        or user_id is None
+        or recent_writers.get(user_id) is not None
+    ):
+        return async_session
+    return replica_session
 
 
 async def get_db() -> AsyncSession:
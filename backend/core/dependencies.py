@@ -1,31 +1,81 @@
+from functools import lru_cache
+
 from fastapi import Depends, HTTPException, status, Request
-from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from core.database import get_db
+from core.database import get_read_sessionmaker
+from core.executors import BoundedProcessExecutor
+from core.metrics import register_metrics_source
 from security.exceptions import BaseSecurityError
 from security.interfaces import JWTAuthManagerInterface
 from security.jwt_manager import JWTAuthManager
+from security.passwords import PasswordHasher
+from security.principals import CurrentPrincipal
+from security.token_cache import CachedJWTAuthManager
 from core.settings import settings
 from src.auth.models import UserModel
+from src.auth.revocation import deny_list
+from src.auth.user_cache import user_cache
 
 
+@lru_cache(maxsize=None)
 def get_jwt_auth_manager() -> JWTAuthManagerInterface:
     """
-    Create an instance of JWTAuthManager for token management.
+    Return the application's JWT manager for token management.
+
+    The manager is built once and shared. Unless JWT_VERIFIED_CACHE_SIZE is
+    0, it remembers verified access tokens until they expire.
 
     Returns:
-        An instance of JWTAuthManager implementing JWTAuthManagerInterface.
+        An instance implementing JWTAuthManagerInterface.
 
     Example:
         jwt_manager = get_jwt_auth_manager()
         token = jwt_manager.create_access_token({"user_id": 1})
     """
-    return JWTAuthManager(
+    manager = JWTAuthManager(
         secret_key_access=settings.secret_key_access,
         secret_key_refresh=settings.secret_key_refresh,
         algorithm=settings.jwt_signing_algorithm,
     )
+    if not settings.jwt_verified_cache_size:
+        return manager
+
+    cached_manager = CachedJWTAuthManager(
+        manager, max_entries=settings.jwt_verified_cache_size
+    )
+    register_metrics_source("jwt_verified_tokens", cached_manager.stats)
+    return cached_manager
+
+
+def get_analytics_executor(request: Request) -> BoundedProcessExecutor:
+    """
+    Return the application's analytics process pool.
+
+    The executor is created and started in the application lifespan.
+
+    Args:
+        request: The incoming HTTP request.
+
+    Returns:
+        The shared BoundedProcessExecutor instance.
+    """
+    return request.app.state.analytics_executor
+
+
+def get_password_hasher(request: Request) -> PasswordHasher:
+    """
+    Return the application's password hasher.
+
+    The hasher and its process pool are created in the application lifespan.
+
+    Args:
+        request: The incoming HTTP request.
+
+    Returns:
+        The shared PasswordHasher instance.
+    """
+    return request.app.state.password_hasher
 
 
 def get_token(request: Request) -> str:
@@ -62,14 +112,47 @@ def get_token(request: Request) -> str:
     return token
 
 
+async def get_read_db(
+    token: str = Depends(get_token),
+    jwt_manager: JWTAuthManagerInterface = Depends(get_jwt_auth_manager),
+) -> AsyncSession:
+    """
+    Provide a database session for read-only endpoints.
+
+    With DATABASE_REPLICA_URL set, the session reads from the replica,
+    unless the caller committed a write within READ_YOUR_WRITES_SECONDS.
+    Callers whose token cannot be decoded read from the primary; the
+    authentication dependencies reject them anyway.
+
+    Args:
+        token: The Bearer token extracted from the Authorization header.
+        jwt_manager: The JWT manager for decoding the token.
+
+    Yields:
+        AsyncSession: A session on the replica or on the primary.
+    """
+    try:
+        user_id = jwt_manager.decode_access_token(token).get("user_id")
+    except BaseSecurityError:
+        user_id = None
+
+    async with get_read_sessionmaker(user_id)() as session:
+        yield session
+
+
 async def get_current_user(
     token: str = Depends(get_token),
     jwt_manager: JWTAuthManagerInterface = Depends(get_jwt_auth_manager),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> UserModel:
     """
     Retrieve the current authenticated user based on the provided access token.
 
+    Users are served from the user cache, so most requests skip the users
+    query. The read session's connection is returned to the pool right
+    after the lookup, so write routes, which also open a session on the
+    primary, do not hold two connections for the rest of the request.
+
     Args:
         token: The Bearer token extracted from the Authorization header.
         jwt_manager: The JWT manager for decoding the token.
@@ -85,9 +168,9 @@ async def get_current_user(
     try:
         payload = jwt_manager.decode_access_token(token)
         user_id = payload.get("user_id")
-        stmt = select(UserModel).where(UserModel.id == user_id)
-        result = await db.execute(stmt)
-        user = result.scalars().first()
+        user = await user_cache.get(db, user_id)
+        # Ends the lookup's transaction; the session keeps the user loaded.
+        await db.commit()
 
         if not user:
             raise HTTPException(
@@ -98,3 +181,53 @@ async def get_current_user(
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e)
         )
+
+
+async def get_current_principal(
+    token: str = Depends(get_token),
+    jwt_manager: JWTAuthManagerInterface = Depends(get_jwt_auth_manager),
+    db: AsyncSession = Depends(get_read_db),
+) -> CurrentPrincipal:
+    """
+    Retrieve the authenticated caller for endpoints that only need its id.
+
+    With AUTH_STATELESS_PRINCIPAL the principal is built from the token
+    claims without touching the database, and revoked tokens are rejected
+    through the in-memory deny-list. Otherwise it is built from
+    get_current_user.
+
+    Args:
+        token: The Bearer token extracted from the Authorization header.
+        jwt_manager: The JWT manager for decoding the token.
+        db: The asynchronous database session for querying the user.
+
+    Returns:
+        The CurrentPrincipal of the caller.
+
+    Raises:
+        HTTPException:
+            - 401 if the token is invalid, expired, revoked, or the user is
+              not found.
+    """
+    if not settings.auth_stateless_principal:
+        user = await get_current_user(token, jwt_manager, db)
+        return CurrentPrincipal(user_id=user.id, email=user.email)
+
+    try:
+        payload = jwt_manager.decode_access_token(token)
+        principal = CurrentPrincipal.from_claims(payload)
+    except BaseSecurityError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail=str(e)
+        )
+    except KeyError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token."
+        )
+
+    if deny_list.is_revoked(principal):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked.",
+        )
+    return principal
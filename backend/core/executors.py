@@ -0,0 +1,100 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+
+
+class ExecutorSaturatedError(Exception):
+    """Raised when an executor already holds its maximum of pending tasks."""
+
+    def __init__(self, message="Executor queue is full."):
+        super().__init__(message)
+
+
+class BoundedProcessExecutor:
+    """
+    A bounded process pool for CPU-bound work.
+
+    Tasks such as analytics tokenization and password hashing run in worker
+    processes so they do not block the event loop. The number of submitted
+    but unfinished tasks is capped; once the cap is reached new tasks are
+    rejected instead of queued.
+    """
+
+    def __init__(
+        self, max_workers: int, max_pending: int, timeout: float
+    ) -> None:
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: The number of worker processes.
+            max_pending: The maximum number of unfinished tasks.
+            timeout: Seconds to wait for a task result.
+        """
+        self._max_workers = max_workers
+        self._max_pending = max_pending
+        self._timeout = timeout
+        self._pending = 0
+        self._pool: ProcessPoolExecutor | None = None
+
+    @property
+    def pending(self) -> int:
+        """Return the number of submitted tasks that have not finished."""
+        return self._pending
+
+    def start(self) -> None:
+        """Create the worker pool. Worker processes are spawned lazily."""
+        self._pool = ProcessPoolExecutor(
+            max_workers=self._max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def shutdown(self) -> None:
+        """Stop the worker pool and cancel tasks that have not started."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _task_done(self) -> None:
+        self._pending -= 1
+
+    def _on_future_done(self, loop: asyncio.AbstractEventLoop) -> None:
+        try:
+            loop.call_soon_threadsafe(self._task_done)
+        except RuntimeError:
+            # The event loop is already closed during shutdown.
+            pass
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a picklable function in a worker process.
+
+        A task that times out is cancelled if it has not started yet;
+        otherwise it keeps its slot until the worker finishes it, so
+        abandoned work still counts against the pending limit.
+
+        Args:
+            func: A module-level function.
+            *args: Picklable positional arguments for the function.
+
+        Returns:
+            The function's return value.
+
+        Raises:
+            ExecutorSaturatedError: If max_pending tasks are unfinished.
+            asyncio.TimeoutError: If the result is not ready in time.
+        """
+        if self._pool is None:
+            raise RuntimeError("Executor is not started.")
+        if self._pending >= self._max_pending:
+            raise ExecutorSaturatedError
+
+        loop = asyncio.get_running_loop()
+        future = self._pool.submit(func, *args)
+        self._pending += 1
+        future.add_done_callback(lambda _: self._on_future_done(loop))
+
+        return await asyncio.wait_for(
+            asyncio.wrap_future(future), timeout=self._timeout
+        )
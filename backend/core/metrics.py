@@ -0,0 +1,25 @@
+from typing import Callable
+
+
+_metrics_sources: dict[str, Callable[[], dict]] = {}
+
+
+def register_metrics_source(name: str, source: Callable[[], dict]) -> None:
+    """
+    Register a callable reporting the counters of a component.
+
+    Args:
+        name: The key under which the component's metrics are reported.
+        source: A callable returning a JSON-serializable dictionary.
+    """
+    _metrics_sources[name] = source
+
+
+def collect_metrics() -> dict:
+    """
+    Collect the current metrics of all registered components.
+
+    Returns:
+        Dictionary mapping component names to their metrics.
+    """
+    return {name: source() for name, source in _metrics_sources.items()}
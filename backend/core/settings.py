@@ -8,17 +8,72 @@ class Settings(BaseSettings):
 
     access_time_days: int = 7
     refresh_time_days: int = 30
+    refresh_tokens_per_user: int = 5
+    refresh_token_purge_interval_seconds: float = 3600.0
+    refresh_token_purge_batch_size: int = 1000
 
     secret_key_access: str
     secret_key_refresh: str
     jwt_signing_algorithm: str
+    jwt_verified_cache_size: int = 10000
 
     postgres_port: int
     postgres_user: str
     postgres_password: str
     postgres_db: str
 
+    database_replica_url: str | None = None
+    read_your_writes_seconds: float = 5.0
+
+    database_echo: bool = False
+    database_pool_size: int = 5
+    database_max_overflow: int = 10
+    database_pool_timeout_seconds: float = 30.0
+    database_pool_recycle_seconds: int = 1800
+    database_pool_pre_ping: bool = True
+    database_statement_cache_size: int = 100
+    database_slow_query_seconds: float = 0.5
+
     gemini_api_key: str
+    summary_model: str = "gemini-2.0-flash"
+    summary_timeout_seconds: float = 10.0
+    summary_batch_max_size: int = 10
+    summary_batch_window_seconds: float = 0.05
+    summary_max_in_flight: int = 4
+    summary_max_pending: int = 16
+    summary_worker_enabled: bool = False
+    summary_worker_poll_seconds: float = 1.0
+
+    summary_job_max_attempts: int = 5
+    summary_job_backoff_seconds: float = 5.0
+    summary_job_max_backoff_seconds: float = 600.0
+    summary_job_lease_seconds: float = 120.0
+
+    summary_cache_max_entries: int = 1024
+    summary_cache_max_bytes: int = 4 * 1024 * 1024
+    summary_cache_ttl_seconds: float = 3600.0
+
+    user_cache_max_entries: int = 10000
+    user_cache_ttl_seconds: float = 60.0
+    user_cache_notify: bool = False
+
+    auth_stateless_principal: bool = False
+
+    note_snapshot_interval: int = 10
+    notes_bulk_max_size: int = 1000
+
+    analytics_max_workers: int = 2
+    analytics_max_pending: int = 8
+    analytics_timeout_seconds: float = 30.0
+    analytics_cache_ttl_seconds: float = 300.0
+
+    cache_redis_url: str | None = None
+    cache_redis_max_connections: int = 10
+    cache_memory_max_entries: int = 10000
+
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 16
+    password_hash_timeout_seconds: float = 10.0
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", extra="ignore"
@@ -33,8 +33,8 @@ class JWTAuthManager(JWTAuthManagerInterface):
         Create a JWT token with provided data, secret key, and expiration time.
         """
         to_encode = data.copy()
-        expire = datetime.now(timezone.utc) + expires_delta
-        to_encode.update({"exp": expire})
+        issued_at = datetime.now(timezone.utc)
+        to_encode.update({"iat": issued_at, "exp": issued_at + expires_delta})
         return jwt.encode(to_encode, secret_key, algorithm=self._algorithm)
 
     def create_access_token(
@@ -0,0 +1,57 @@
+from core.executors import BoundedProcessExecutor
+from core.utils import hash_password, verify_password
+
+
+class PasswordHasher:
+    """
+    Hashes and verifies passwords off the event loop.
+
+    bcrypt with 14 rounds takes about a second per call, so the work runs
+    in a bounded process pool. Once the pool holds its maximum of pending
+    calls, further calls fail fast with ExecutorSaturatedError, which caps
+    the number of concurrent registrations and logins.
+    """
+
+    def __init__(self, executor: BoundedProcessExecutor) -> None:
+        """
+        Initialize the hasher.
+
+        Args:
+            executor: The started process pool running bcrypt.
+        """
+        self._executor = executor
+
+    async def hash(self, raw_password: str) -> str:
+        """
+        Hash a password.
+
+        Args:
+            raw_password: The plain text password.
+
+        Returns:
+            The bcrypt hash.
+
+        Raises:
+            ExecutorSaturatedError: If the pool is saturated.
+            asyncio.TimeoutError: If hashing does not finish in time.
+        """
+        return await self._executor.run(hash_password, raw_password)
+
+    async def verify(self, raw_password: str, hashed_password: str) -> bool:
+        """
+        Verify a password against a hash.
+
+        Args:
+            raw_password: The plain text password.
+            hashed_password: The stored bcrypt hash.
+
+        Returns:
+            True if the password matches the hash, False otherwise.
+
+        Raises:
+            ExecutorSaturatedError: If the pool is saturated.
+            asyncio.TimeoutError: If verification does not finish in time.
+        """
+        return await self._executor.run(
+            verify_password, raw_password, hashed_password
+        )
@@ -0,0 +1,93 @@
+import time
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class CurrentPrincipal:
+    """
+    The authenticated caller, as described by the claims of its token.
+
+    Attributes:
+        user_id: The id of the user the token was issued to.
+        email: The user's email address at issue time, if embedded.
+        issued_at: Unix time the token was issued at, if embedded.
+    """
+
+    user_id: int
+    email: str | None = None
+    issued_at: int | None = None
+
+    @classmethod
+    def from_claims(cls, payload: dict) -> "CurrentPrincipal":
+        """
+        Build a principal from a decoded access token.
+
+        Args:
+            payload: The decoded token claims.
+
+        Returns:
+            The CurrentPrincipal instance.
+        """
+        return cls(
+            user_id=payload["user_id"],
+            email=payload.get("email"),
+            issued_at=payload.get("iat"),
+        )
+
+
+class DenyList:
+    """
+    A compact in-memory deny-list of revoked users.
+
+    Revoking a user rejects every access token issued to them up to the
+    revocation time. An entry is only needed while such tokens can still be
+    valid, so entries are dropped once the access token lifetime has passed.
+    """
+
+    def __init__(self, token_lifetime_seconds: float) -> None:
+        """
+        Initialize the deny-list.
+
+        Args:
+            token_lifetime_seconds: The maximum lifetime of an access token.
+        """
+        self._token_lifetime_seconds = token_lifetime_seconds
+        self._revoked_at: dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._revoked_at)
+
+    def _prune(self, now: float) -> None:
+        expired_before = now - self._token_lifetime_seconds
+        for user_id, revoked_at in list(self._revoked_at.items()):
+            if revoked_at < expired_before:
+                del self._revoked_at[user_id]
+
+    def revoke_user(self, user_id: int) -> None:
+        """
+        Reject all access tokens issued to a user so far.
+
+        Args:
+            user_id: The id of the user.
+        """
+        now = time.time()
+        self._prune(now)
+        self._revoked_at[user_id] = now
+
+    def is_revoked(self, principal: CurrentPrincipal) -> bool:
+        """
+        Check whether the token of a principal was revoked.
+
+        Tokens without an issue time are treated as issued before any
+        revocation.
+
+        Args:
+            principal: The principal built from the token.
+
+        Returns:
+            True if the token must be rejected, False otherwise.
+        """
+        revoked_at = self._revoked_at.get(principal.user_id)
+        if revoked_at is None:
+            return False
+        return principal.issued_at is None or principal.issued_at <= revoked_at
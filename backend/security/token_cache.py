@@ -0,0 +1,76 @@
+import time
+from datetime import timedelta
+from typing import Optional
+
+from core.cache import TTLCache
+from security.interfaces import JWTAuthManagerInterface
+
+
+class CachedJWTAuthManager(JWTAuthManagerInterface):
+    """
+    A JWT manager remembering access tokens it already verified.
+
+    Wraps any JWTAuthManagerInterface implementation. Decoded access tokens
+    are kept in a bounded LRU until their ``exp``, so a client sending the
+    same bearer token repeatedly pays for parsing and signature
+    verification once. Invalid tokens are never cached, and expired ones
+    fall through to the wrapped manager, which rejects them.
+    """
+
+    def __init__(
+        self, manager: JWTAuthManagerInterface, max_entries: int
+    ) -> None:
+        """
+        Initialize the manager.
+
+        Args:
+            manager: The manager creating and verifying tokens.
+            max_entries: The maximum number of verified tokens kept.
+        """
+        self._manager = manager
+        self._verified = TTLCache(max_entries=max_entries, ttl_seconds=0)
+
+    def create_access_token(
+        self, data: dict, expires_delta: Optional[timedelta] = None
+    ) -> str:
+        """
+        Create a new access token with the wrapped manager.
+        """
+        return self._manager.create_access_token(data, expires_delta)
+
+    def create_refresh_token(
+        self, data: dict, expires_delta: Optional[timedelta] = None
+    ) -> str:
+        """
+        Create a new refresh token with the wrapped manager.
+        """
+        return self._manager.create_refresh_token(data, expires_delta)
+
+    def decode_access_token(self, token: str) -> dict:
+        """
+        Decode an access token, verifying it only if it is not cached.
+        """
+        payload = self._verified.get(token)
+        if payload is not None:
+            return dict(payload)
+
+        payload = self._manager.decode_access_token(token)
+        expires_in = payload.get("exp", 0) - time.time()
+        if expires_in > 0:
+            self._verified.set(token, payload, ttl_seconds=expires_in)
+        return dict(payload)
+
+    def decode_refresh_token(self, token: str) -> dict:
+        """
+        Decode and validate a refresh token with the wrapped manager.
+        """
+        return self._manager.decode_refresh_token(token)
+
+    def stats(self) -> dict:
+        """
+        Return the counters of the verified-token cache.
+
+        Returns:
+            Dictionary of cache counters.
+        """
+        return self._verified.stats()
@@ -1,6 +1,13 @@
 from datetime import datetime
 
-from sqlalchemy import Integer, String, DateTime, ForeignKey
+from sqlalchemy import (
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    UniqueConstraint,
+)
 from sqlalchemy.orm import (
     Mapped,
     mapped_column,
@@ -42,6 +49,42 @@ class UserModel(BaseModel):
         cascade="all, delete-orphan",
     )
 
+    def get_owner_id(self) -> int | None:
+        """
+        Return the id of the user owning this row.
+
+        A user owns their own row, so writes to it keep the user's reads on
+        the primary like writes to their notes.
+
+        Returns:
+            The user's id, or None before the user is flushed.
+        """
+        return self.id
+
+    @classmethod
+    def create(cls, email: str, hashed_password: str) -> "UserModel":
+        """
+        Create a user whose password was already hashed.
+
+        Routes hash passwords with the PasswordHasher off the event loop and
+        use this instead of the blocking password setter.
+
+        Args:
+            email: The user's email address.
+            hashed_password: The bcrypt hash of the user's password.
+
+        Returns:
+            The new UserModel instance.
+        """
+        user = cls(email=email)
+        user._hashed_password = hashed_password
+        return user
+
+    @property
+    def hashed_password(self) -> str:
+        """Return the bcrypt hash of the user's password."""
+        return self._hashed_password
+
     @property
     def password(self) -> None:
         """
@@ -59,6 +102,9 @@ class UserModel(BaseModel):
         """
         Set and hash the user's password.
 
+        Hashing blocks for about a second; async code should use the
+        PasswordHasher and UserModel.create instead.
+
         Args:
             raw_password: The plain text password to hash and store.
 
@@ -82,18 +128,21 @@ class RefreshTokenModel(BaseModel):
     """
     Database model representing a refresh token.
 
-    This model stores refresh tokens associated with users, including their expiration dates.
+    Only the SHA-256 digest of a token is stored, so lookups probe a
+    fixed-width unique index and a leaked table does not expose usable
+    tokens.
     """
 
     __tablename__ = "refresh_tokens"
+    __table_args__ = (
+        UniqueConstraint("token_hash", name="uq_refresh_tokens_token_hash"),
+        Index("ix_refresh_tokens_user_id_expires_at", "user_id", "expires_at"),
+    )
+
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True
     )
-    token: Mapped[str] = mapped_column(
-        String(512),
-        unique=True,
-        nullable=False,
-    )
+    token_hash: Mapped[str] = mapped_column(String(64), nullable=False)
     expires_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
         nullable=False,
@@ -107,4 +156,4 @@ class RefreshTokenModel(BaseModel):
     )
 
     def __repr__(self):
-        return f"<RefreshTokenModel(id={self.id}, token={self.token}, expires_at={self.expires_at})>"
+        return f"<RefreshTokenModel(id={self.id}, user_id={self.user_id}, expires_at={self.expires_at})>"
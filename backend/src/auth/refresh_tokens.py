@@ -0,0 +1,159 @@
+import asyncio
+import hashlib
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.database import async_session
+from core.settings import settings
+from security.interfaces import JWTAuthManagerInterface
+from src.auth.models import RefreshTokenModel
+
+
+logger = logging.getLogger(__name__)
+
+
+def hash_refresh_token(token: str) -> str:
+    """
+    Return the digest under which a refresh token is stored.
+
+    Args:
+        token: The refresh token.
+
+    Returns:
+        Hex SHA-256 digest of the token.
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+async def issue_refresh_token(
+    db: AsyncSession, jwt_manager: JWTAuthManagerInterface, user_id: int
+) -> str:
+    """
+    Create and store a refresh token for a user in the caller's transaction.
+
+    Once the user has more than REFRESH_TOKENS_PER_USER live tokens, the
+    ones expiring first are deleted.
+
+    Args:
+        db: The asynchronous database session.
+        jwt_manager: The JWT manager creating the token.
+        user_id: The id of the user.
+
+    Returns:
+        The new refresh token.
+    """
+    # The jti keeps tokens issued within the same second distinct.
+    token = jwt_manager.create_refresh_token(
+        {"user_id": user_id, "jti": uuid.uuid4().hex}
+    )
+    db.add(
+        RefreshTokenModel(
+            user_id=user_id,
+            token_hash=hash_refresh_token(token),
+            expires_at=datetime.now(timezone.utc)
+            + timedelta(days=settings.refresh_time_days),
+        )
+    )
+    await db.flush()
+
+    kept = (
+        select(RefreshTokenModel.id)
+        .where(RefreshTokenModel.user_id == user_id)
+        .order_by(RefreshTokenModel.expires_at.desc())
+        .limit(settings.refresh_tokens_per_user)
+    )
+    await db.execute(
+        delete(RefreshTokenModel)
+        .where(
+            RefreshTokenModel.user_id == user_id,
+            RefreshTokenModel.id.not_in(kept.scalar_subquery()),
+        )
+        .execution_options(synchronize_session="fetch")
+    )
+    return token
+
+
+async def consume_refresh_token(
+    db: AsyncSession, token: str, user_id: int
+) -> bool:
+    """
+    Delete a stored refresh token so it cannot be used again.
+
+    The delete is a single probe of the unique digest index; of concurrent
+    requests presenting the same token only one consumes it.
+
+    Args:
+        db: The asynchronous database session.
+        token: The presented refresh token.
+        user_id: The id of the user the token was issued to.
+
+    Returns:
+        True if a live token was consumed, False otherwise.
+    """
+    result = await db.execute(
+        delete(RefreshTokenModel)
+        .where(
+            RefreshTokenModel.token_hash == hash_refresh_token(token),
+            RefreshTokenModel.user_id == user_id,
+            RefreshTokenModel.expires_at > datetime.now(timezone.utc),
+        )
+        .execution_options(synchronize_session="fetch")
+    )
+    return result.rowcount == 1
+
+
+async def purge_expired_refresh_tokens(
+    db: AsyncSession, batch_size: int
+) -> int:
+    """
+    Delete expired refresh tokens in batches, committing after each one.
+
+    Args:
+        db: The asynchronous database session.
+        batch_size: The maximum number of rows deleted per statement.
+
+    Returns:
+        The number of deleted rows.
+    """
+    now = datetime.now(timezone.utc)
+    purged = 0
+    while True:
+        expired = (
+            select(RefreshTokenModel.id)
+            .where(RefreshTokenModel.expires_at <= now)
+            .limit(batch_size)
+        )
+        result = await db.execute(
+            delete(RefreshTokenModel)
+            .where(RefreshTokenModel.id.in_(expired.scalar_subquery()))
+            .execution_options(synchronize_session="fetch")
+        )
+        await db.commit()
+        purged += result.rowcount
+        if result.rowcount < batch_size:
+            return purged
+
+
+async def run_refresh_token_purger(
+    interval_seconds: float, batch_size: int
+) -> None:
+    """
+    Purge expired refresh tokens periodically until cancelled.
+
+    Args:
+        interval_seconds: Seconds between purges.
+        batch_size: The maximum number of rows deleted per statement.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with async_session() as db:
+                purged = await purge_expired_refresh_tokens(db, batch_size)
+            if purged:
+                logger.info(f"Purged {purged} expired refresh token(s)")
+        except Exception as e:
+            logger.error(f"Failed to purge refresh tokens: {str(e)}")
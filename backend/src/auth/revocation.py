@@ -0,0 +1,69 @@
+import logging
+
+import asyncpg
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from core.metrics import register_metrics_source
+from core.settings import settings
+from security.principals import DenyList
+from src.auth.models import UserModel
+
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_CHANNEL = "user_revocations"
+
+_REVOKED_IDS_KEY = "revoked_user_ids"
+
+
+deny_list = DenyList(
+    token_lifetime_seconds=settings.access_time_days * 24 * 60 * 60
+)
+register_metrics_source("deny_list", lambda: {"size": len(deny_list)})
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_deleted_users(session: Session, flush_context) -> None:
+    deleted = [
+        instance.id
+        for instance in session.deleted
+        if isinstance(instance, UserModel)
+    ]
+    for user_id in deleted:
+        session.info.setdefault(_REVOKED_IDS_KEY, set()).add(user_id)
+        if settings.user_cache_notify:
+            # NOTIFY is transactional: it is only delivered on commit.
+            session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": REVOCATION_CHANNEL, "payload": str(user_id)},
+            )
+
+
+@event.listens_for(Session, "after_commit")
+def _revoke_deleted_users(session: Session) -> None:
+    for user_id in session.info.pop(_REVOKED_IDS_KEY, ()):
+        deny_list.revoke_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_deleted_users(session: Session) -> None:
+    session.info.pop(_REVOKED_IDS_KEY, None)
+
+
+async def subscribe_revocations(connection: asyncpg.Connection) -> None:
+    """
+    Apply user revocations committed by other workers.
+
+    Args:
+        connection: An asyncpg connection kept open to receive
+            notifications.
+    """
+
+    def on_notification(connection, pid, channel, payload) -> None:
+        try:
+            deny_list.revoke_user(int(payload))
+        except ValueError:
+            logger.warning(f"Ignoring invalid user revocation {payload!r}")
+
+    await connection.add_listener(REVOCATION_CHANNEL, on_notification)
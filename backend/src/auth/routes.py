@@ -1,4 +1,4 @@
-from datetime import datetime, timezone, timedelta
+import asyncio
 
 from fastapi import APIRouter, status, Depends, HTTPException
 from sqlalchemy import select
@@ -6,7 +6,7 @@ from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import get_db
-from core.settings import settings
+from core.executors import ExecutorSaturatedError
 from src.auth.schemas import (
     UserRegistrationRequestSchema,
     UserRegistrationResponseSchema,
@@ -15,14 +15,31 @@ from src.auth.schemas import (
     TokenRefreshRequestSchema,
     TokenRefreshResponseSchema,
 )
-from src.auth.models import UserModel, RefreshTokenModel
+from src.auth.models import UserModel
+from src.auth.refresh_tokens import consume_refresh_token, issue_refresh_token
 from security.interfaces import JWTAuthManagerInterface
-from core.dependencies import get_jwt_auth_manager
+from core.dependencies import get_jwt_auth_manager, get_password_hasher
 from security.exceptions import BaseSecurityError
+from security.passwords import PasswordHasher
 
 
 router = APIRouter()
 
+# Logins of unknown emails are checked against this hash of the same cost,
+# so they are as slow and as likely to be rejected with 503 as other logins
+# and do not reveal which emails are registered.
+_DUMMY_PASSWORD_HASH = (
+    "$2b$14$JRt1DwsOJgl4AxChTy0UCuagcWvNtgJM90Tb.G.93vSlRR94c9Hb2"
+)
+
+
+def _password_hasher_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many concurrent authentication requests. "
+        "Please retry later.",
+    )
+
 
 @router.post(
     "/register/",
@@ -41,6 +58,16 @@ router = APIRouter()
                 }
             },
         },
+        503: {
+            "description": "Service Unavailable - Too many concurrent password checks.",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Too many concurrent authentication requests. Please retry later."
+                    }
+                }
+            },
+        },
         500: {
             "description": "Internal Server Error - An error occurred during user creation.",
             "content": {
@@ -56,6 +83,7 @@ router = APIRouter()
 async def register_user(
     user_data: UserRegistrationRequestSchema,
     db: AsyncSession = Depends(get_db),
+    password_hasher: PasswordHasher = Depends(get_password_hasher),
 ) -> UserRegistrationResponseSchema:
     """
     Register a new user with email and password.
@@ -63,12 +91,14 @@ async def register_user(
     Args:
         user_data: The user registration data including email and password.
         db: The asynchronous database session.
+        password_hasher: The hasher running bcrypt off the event loop.
 
     Returns:
         UserRegistrationResponseSchema containing the registered user's details.
 
     Raises:
-        HTTPException: 409 if email already exists, 500 if database error occurs.
+        HTTPException: 409 if email already exists, 503 if too many passwords
+            are being hashed, 500 if database error occurs.
     """
     stmt = select(UserModel).where(UserModel.email == user_data.email)
     result = await db.execute(stmt)
@@ -81,9 +111,14 @@ async def register_user(
         )
 
     try:
-        new_user = UserModel(
+        hashed_password = await password_hasher.hash(user_data.password)
+    except (ExecutorSaturatedError, asyncio.TimeoutError):
+        raise _password_hasher_unavailable()
+
+    try:
+        new_user = UserModel.create(
             email=user_data.email,
-            password=user_data.password,
+            hashed_password=hashed_password,
         )
         db.add(new_user)
         await db.commit()
@@ -119,6 +154,16 @@ async def register_user(
                 }
             },
         },
+        503: {
+            "description": "Service Unavailable - Too many concurrent password checks.",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Too many concurrent authentication requests. Please retry later."
+                    }
+                }
+            },
+        },
         500: {
             "description": "Internal Server Error - An error occurred while processing the request.",
             "content": {
@@ -135,6 +180,7 @@ async def login_user(
     login_data: UserLoginRequestSchema,
     db: AsyncSession = Depends(get_db),
     jwt_manager: JWTAuthManagerInterface = Depends(get_jwt_auth_manager),
+    password_hasher: PasswordHasher = Depends(get_password_hasher),
 ) -> UserLoginResponseSchema:
     """
     Authenticate a user and return access and refresh tokens.
@@ -143,34 +189,39 @@ async def login_user(
         login_data: The user login data including email and password.
         db: The asynchronous database session.
         jwt_manager: The JWT authentication manager.
+        password_hasher: The hasher running bcrypt off the event loop.
 
     Returns:
         UserLoginResponseSchema with access and refresh tokens.
 
     Raises:
-        HTTPException: 401 if credentials are invalid, 500 if database error occurs.
+        HTTPException: 401 if credentials are invalid, 503 if too many
+            passwords are being verified, 500 if database error occurs.
     """
     stmt = select(UserModel).where(UserModel.email == login_data.email)
     result = await db.execute(stmt)
     user = result.scalars().first()
 
-    if not user or not user.verify_password(login_data.password):
+    try:
+        password_valid = await password_hasher.verify(
+            login_data.password,
+            user.hashed_password if user else _DUMMY_PASSWORD_HASH,
+        )
+    except (ExecutorSaturatedError, asyncio.TimeoutError):
+        raise _password_hasher_unavailable()
+
+    if not user or not password_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password.",
         )
 
-    jwt_refresh_token = jwt_manager.create_refresh_token({"user_id": user.id})
-    jwt_access_token = jwt_manager.create_access_token({"user_id": user.id})
+    jwt_access_token = jwt_manager.create_access_token(
+        {"user_id": user.id, "email": user.email}
+    )
 
     try:
-        refresh_token = RefreshTokenModel(
-            user_id=user.id,
-            expires_at=datetime.now(timezone.utc)
-            + timedelta(days=settings.refresh_time_days),
-            token=jwt_refresh_token,
-        )
-        db.add(refresh_token)
+        jwt_refresh_token = await issue_refresh_token(db, jwt_manager, user.id)
         await db.commit()
         return UserLoginResponseSchema(
             access_token=jwt_access_token,
@@ -188,7 +239,8 @@ async def login_user(
     "/refresh/",
     response_model=TokenRefreshResponseSchema,
     summary="Refresh Access Token",
-    description="Refresh the access token using a valid refresh token.",
+    description="Exchange a valid refresh token for a new access token and a new refresh token. "
+    "The presented refresh token is revoked.",
     status_code=status.HTTP_200_OK,
     responses={
         400: {
@@ -224,7 +276,8 @@ async def refresh_access_token(
     Refresh an access token using a valid refresh token.
 
     This endpoint decodes the provided refresh token, verifies its validity against the database,
-    and issues a new access token for the associated user.
+    and issues a new access token for the associated user. Refresh tokens
+    are rotated: the presented token is deleted and a new one is returned.
 
     Args:
         token_data: The request schema containing the refresh token.
@@ -232,7 +285,8 @@ async def refresh_access_token(
         jwt_manager: The JWT authentication manager for token operations.
 
     Returns:
-        TokenRefreshResponseSchema containing the new access token.
+        TokenRefreshResponseSchema containing the new access and refresh
+        tokens.
 
     Raises:
         HTTPException:
@@ -260,18 +314,19 @@ async def refresh_access_token(
             detail="User not found.",
         )
 
-    stmt_token = select(RefreshTokenModel).where(
-        RefreshTokenModel.token == token_data.refresh_token
-    )
-    result = await db.execute(stmt_token)
-    refresh_token_record = result.scalars().first()
-
-    if not refresh_token_record:
+    if not await consume_refresh_token(db, token_data.refresh_token, user_id):
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Refresh token not found.",
         )
 
-    new_access_token = jwt_manager.create_access_token({"user_id": user_id})
+    new_access_token = jwt_manager.create_access_token(
+        {"user_id": user_id, "email": user.email}
+    )
+    new_refresh_token = await issue_refresh_token(db, jwt_manager, user_id)
+    await db.commit()
 
-    return TokenRefreshResponseSchema(access_token=new_access_token)
+    return TokenRefreshResponseSchema(
+        access_token=new_access_token, refresh_token=new_refresh_token
+    )
@@ -110,8 +110,10 @@ class TokenRefreshResponseSchema(BaseModel):
 
     Defines the structure of the response returned
     after successful token refresh,
-    including a new access token.
+    including a new access token and the refresh token replacing the one
+    that was used.
     """
 
     access_token: str
+    refresh_token: str
     token_type: str = "bearer"
@@ -0,0 +1,168 @@
+import logging
+from typing import Any
+
+import asyncpg
+from sqlalchemy import event, inspect, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from core.cache import TTLCache
+from core.metrics import register_metrics_source
+from core.settings import settings
+from src.auth.models import UserModel
+
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "user_cache_invalidation"
+
+_INVALIDATED_IDS_KEY = "invalidated_user_ids"
+
+
+class UserCache:
+    """
+    An in-process TTL/LRU cache of authenticated users keyed by user id.
+
+    Cached entries are column snapshots rather than ORM instances, so they
+    are never bound to a session. On a hit the snapshot is merged into the
+    request's session without a query, giving routes a regular persistent
+    UserModel.
+
+    Entries are dropped when a flush updates or deletes the user and again
+    after the transaction commits. With USER_CACHE_NOTIFY, committed
+    changes are also announced on a PostgreSQL NOTIFY channel so other
+    workers drop their copies.
+    """
+
+    def __init__(self, memory: TTLCache) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            memory: The in-process store of user snapshots.
+        """
+        self._memory = memory
+        self.invalidations = 0
+
+    @staticmethod
+    def _snapshot(user: UserModel) -> dict[str, Any]:
+        return {
+            attribute.key: getattr(user, attribute.key)
+            for attribute in inspect(UserModel).column_attrs
+        }
+
+    async def get(self, db: AsyncSession, user_id: int) -> UserModel | None:
+        """
+        Return the user with the given id, querying only on a miss.
+
+        Args:
+            db: The asynchronous database session.
+            user_id: The id of the user.
+
+        Returns:
+            The UserModel attached to the session, or None if the user does
+            not exist.
+        """
+        snapshot = self._memory.get(user_id)
+        if snapshot is not None:
+            user = UserModel(**snapshot)
+            make_transient_to_detached(user)
+            return await db.merge(user, load=False)
+
+        result = await db.execute(
+            select(UserModel).where(UserModel.id == user_id)
+        )
+        user = result.scalars().first()
+        if user is not None:
+            self._memory.set(user_id, self._snapshot(user))
+        return user
+
+    def invalidate(self, user_id: int) -> None:
+        """
+        Drop the cached snapshot of a user.
+
+        Args:
+            user_id: The id of the user.
+        """
+        self._memory.delete(user_id)
+        self.invalidations += 1
+
+    def clear(self) -> None:
+        """Drop all cached users."""
+        self._memory.clear()
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters.
+
+        Every hit is a users query that was not run.
+
+        Returns:
+            Dictionary of cache counters.
+        """
+        return {**self._memory.stats(), "invalidations": self.invalidations}
+
+
+user_cache = UserCache(
+    TTLCache(
+        max_entries=settings.user_cache_max_entries,
+        ttl_seconds=settings.user_cache_ttl_seconds,
+    )
+)
+register_metrics_source("user_cache", user_cache.stats)
+
+
+@event.listens_for(Session, "after_flush")
+def _invalidate_flushed_users(session: Session, flush_context) -> None:
+    changed = [
+        instance.id
+        for instance in (*session.dirty, *session.deleted)
+        if isinstance(instance, UserModel) and instance.id is not None
+    ]
+    if not changed:
+        return
+
+    invalidated = session.info.setdefault(_INVALIDATED_IDS_KEY, set())
+    for user_id in changed:
+        user_cache.invalidate(user_id)
+        if settings.user_cache_notify and user_id not in invalidated:
+            # NOTIFY is transactional: it is only delivered on commit.
+            session.execute(
+                text("SELECT pg_notify(:channel, :payload)"),
+                {"channel": INVALIDATION_CHANNEL, "payload": str(user_id)},
+            )
+        invalidated.add(user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_users(session: Session) -> None:
+    # A request may have re-cached the old row between flush and commit.
+    for user_id in session.info.pop(_INVALIDATED_IDS_KEY, ()):
+        user_cache.invalidate(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_users(session: Session) -> None:
+    session.info.pop(_INVALIDATED_IDS_KEY, None)
+
+
+async def listen_for_invalidations() -> asyncpg.Connection:
+    """
+    Subscribe to user invalidations committed by other workers.
+
+    Returns:
+        The asyncpg connection holding the subscription; close it to stop
+        listening.
+    """
+
+    def on_notification(connection, pid, channel, payload) -> None:
+        try:
+            user_cache.invalidate(int(payload))
+        except ValueError:
+            logger.warning(f"Ignoring invalid user invalidation {payload!r}")
+
+    connection = await asyncpg.connect(
+        settings.database_url.replace("postgresql+asyncpg", "postgresql", 1)
+    )
+    await connection.add_listener(INVALIDATION_CHANNEL, on_notification)
+    return connection
@@ -1,3 +1,4 @@
+import asyncio
 import logging
 
 from fastapi import FastAPI
@@ -5,8 +6,20 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import nltk
 
+from core.dependencies import get_jwt_auth_manager
+from core.executors import BoundedProcessExecutor
+from core.metrics import register_metrics_source
+from core.settings import settings
+from security.passwords import PasswordHasher
+from src.auth.refresh_tokens import run_refresh_token_purger
+from src.auth.revocation import subscribe_revocations
 from src.auth.routes import router as auth_router
+from src.auth.user_cache import listen_for_invalidations
+from src.notes.analytics_cache import analytics_cache
 from src.notes.routes import router as notes_router
+from src.notes.worker import create_batcher, run_worker
+from src.system.routes import router as system_router
+from summarization.service import create_summarizer_service
 
 
 logging.basicConfig(level=logging.INFO)
@@ -21,10 +34,62 @@ async def lifespan(app: FastAPI):
         logger.info("NLTK punkt_tab downloaded successfully")
     except Exception as e:
         logger.error(f"Failed to download NLTK punkt_tab: {str(e)}")
+
+    # Build the shared JWT manager before the first request.
+    get_jwt_auth_manager()
+
+    app.state.analytics_executor = BoundedProcessExecutor(
+        max_workers=settings.analytics_max_workers,
+        max_pending=settings.analytics_max_pending,
+        timeout=settings.analytics_timeout_seconds,
+    )
+    app.state.analytics_executor.start()
+
+    app.state.password_executor = BoundedProcessExecutor(
+        max_workers=settings.password_hash_workers,
+        max_pending=settings.password_hash_max_pending,
+        timeout=settings.password_hash_timeout_seconds,
+    )
+    app.state.password_executor.start()
+    app.state.password_hasher = PasswordHasher(app.state.password_executor)
+
+    app.state.summarizer = create_summarizer_service()
+    register_metrics_source("summarizer", app.state.summarizer.stats)
+    summary_worker = None
+    if settings.summary_worker_enabled:
+        summary_worker = asyncio.create_task(
+            run_worker(
+                create_batcher(app.state.summarizer).summarize,
+                batch_size=settings.summary_batch_max_size,
+                poll_interval=settings.summary_worker_poll_seconds,
+            )
+        )
+    refresh_token_purger = asyncio.create_task(
+        run_refresh_token_purger(
+            interval_seconds=settings.refresh_token_purge_interval_seconds,
+            batch_size=settings.refresh_token_purge_batch_size,
+        )
+    )
+    user_cache_listener = None
+    if settings.user_cache_notify:
+        user_cache_listener = await listen_for_invalidations()
+        await subscribe_revocations(user_cache_listener)
     logger.info("Application started")
 
     yield
     logger.info("Shutting down application...")
+    background_tasks = [refresh_token_purger]
+    if summary_worker is not None:
+        background_tasks.append(summary_worker)
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    if user_cache_listener is not None:
+        await user_cache_listener.close()
+    await analytics_cache.backend.close()
+    app.state.summarizer.shutdown()
+    app.state.password_executor.shutdown()
+    app.state.analytics_executor.shutdown()
 
 app = FastAPI(
     title="Notes Management API",
@@ -54,3 +119,6 @@ app.include_router(
 app.include_router(
     notes_router, prefix=f"{api_version_prefix}/notes", tags=["notes"]
 )
+app.include_router(
+    system_router, prefix=f"{api_version_prefix}/system", tags=["system"]
+)
@@ -0,0 +1,298 @@
+import heapq
+from collections import Counter
+from typing import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.executors import BoundedProcessExecutor
+from src.notes.models import NoteAnalyticsModel, NoteModel
+from src.notes.tokenizer import tokenize_note, tokenize_notes
+from src.notes.versions import load_version_texts
+
+
+ANALYTICS_TOP_NOTES = 3
+ANALYTICS_CANDIDATES_LIMIT = 10
+
+
+def _longest_key(candidate: list[int]) -> tuple[int, int]:
+    return -candidate[1], candidate[0]
+
+
+def _shortest_key(candidate: list[int]) -> tuple[int, int]:
+    return candidate[1], candidate[0]
+
+
+def _merge_candidate(
+    candidates: list[list[int]], candidate: list[int], key, note_count: int
+) -> list[list[int]] | None:
+    # Below the limit after deletes, notes ranked after the last candidate
+    # are not tracked, so a new note can only be placed if it beats it.
+    if len(candidates) < min(note_count, ANALYTICS_CANDIDATES_LIMIT) and (
+        not candidates or key(candidate) >= key(candidates[-1])
+    ):
+        return None
+    return heapq.nsmallest(
+        ANALYTICS_CANDIDATES_LIMIT, [*candidates, candidate], key=key
+    )
+
+
+def build_analytics_state(notes: Iterable[tuple[int, str]]) -> dict:
+    """
+    Compute the analytics aggregate for a collection of notes.
+
+    Args:
+        notes: Pairs of note id and note text.
+
+    Returns:
+        Dictionary with the fields of NoteAnalyticsModel.
+    """
+    note_count = 0
+    total_word_count = 0
+    frequencies = Counter()
+    word_counts = []
+
+    for note_id, (word_count, words) in tokenize_notes(notes):
+        note_count += 1
+        total_word_count += word_count
+        frequencies.update(words)
+        word_counts.append([note_id, word_count])
+
+    return {
+        "note_count": note_count,
+        "total_word_count": total_word_count,
+        "word_frequencies": dict(frequencies),
+        "longest_candidates": heapq.nsmallest(
+            ANALYTICS_CANDIDATES_LIMIT, word_counts, key=_longest_key
+        ),
+        "shortest_candidates": heapq.nsmallest(
+            ANALYTICS_CANDIDATES_LIMIT, word_counts, key=_shortest_key
+        ),
+    }
+
+
+async def _get_aggregate_for_update(
+    db: AsyncSession, user_id: int
+) -> NoteAnalyticsModel | None:
+    # Write paths lock the notes, then the note data version, then the
+    # aggregate, so concurrent writes of a user cannot deadlock.
+    stmt = (
+        select(NoteAnalyticsModel)
+        .where(NoteAnalyticsModel.user_id == user_id)
+        .with_for_update()
+    )
+    result = await db.execute(stmt)
+    return result.scalars().first()
+
+
+async def record_note_added(db: AsyncSession, note: NoteModel) -> None:
+    """
+    Apply a newly added note to its owner's analytics aggregate.
+
+    Must run in the same transaction as the insert, after the note has been
+    flushed. Users without an aggregate are skipped, their aggregate is
+    built from scratch on the next analytics read. If the candidate lists
+    cannot tell where the note ranks, the aggregate is marked stale.
+
+    Args:
+        db: The asynchronous database session.
+        note: The flushed note.
+    """
+    aggregate = await _get_aggregate_for_update(db, note.user_id)
+    if aggregate is None or aggregate.is_stale:
+        return
+
+    try:
+        word_count, words = tokenize_note(note.text)
+    except LookupError:
+        aggregate.is_stale = True
+        return
+
+    candidate = [note.id, word_count]
+    longest_candidates = _merge_candidate(
+        aggregate.longest_candidates,
+        candidate,
+        _longest_key,
+        aggregate.note_count,
+    )
+    shortest_candidates = _merge_candidate(
+        aggregate.shortest_candidates,
+        candidate,
+        _shortest_key,
+        aggregate.note_count,
+    )
+    if longest_candidates is None or shortest_candidates is None:
+        aggregate.is_stale = True
+        return
+
+    frequencies = Counter(aggregate.word_frequencies)
+    frequencies.update(words)
+
+    aggregate.note_count += 1
+    aggregate.total_word_count += word_count
+    aggregate.word_frequencies = dict(frequencies)
+    aggregate.longest_candidates = longest_candidates
+    aggregate.shortest_candidates = shortest_candidates
+
+
+async def mark_analytics_stale(db: AsyncSession, user_id: int) -> None:
+    """
+    Mark a user's analytics aggregate for a rebuild on the next read.
+
+    Used by bulk writes, for which one rebuild in the analytics pool is
+    cheaper than tokenizing every note on the event loop.
+
+    Args:
+        db: The asynchronous database session.
+        user_id: The ID of the user whose aggregate is marked.
+    """
+    aggregate = await _get_aggregate_for_update(db, user_id)
+    if aggregate is not None:
+        aggregate.is_stale = True
+
+
+async def record_note_removed(db: AsyncSession, note: NoteModel) -> None:
+    """
+    Remove a note from its owner's analytics aggregate.
+
+    Must run in the same transaction as the delete, after it has been
+    flushed. When the candidate lists can no longer guarantee the top notes,
+    the aggregate is marked stale and rebuilt on the next analytics read.
+
+    Args:
+        db: The asynchronous database session.
+        note: The note being deleted.
+    """
+    aggregate = await _get_aggregate_for_update(db, note.user_id)
+    if aggregate is None or aggregate.is_stale:
+        return
+
+    try:
+        word_count, words = tokenize_note(note.text)
+    except LookupError:
+        aggregate.is_stale = True
+        return
+
+    frequencies = Counter(aggregate.word_frequencies)
+    frequencies.subtract(words)
+
+    aggregate.note_count -= 1
+    aggregate.total_word_count -= word_count
+    aggregate.word_frequencies = {
+        word: count for word, count in frequencies.items() if count > 0
+    }
+    aggregate.longest_candidates = [
+        candidate
+        for candidate in aggregate.longest_candidates
+        if candidate[0] != note.id
+    ]
+    aggregate.shortest_candidates = [
+        candidate
+        for candidate in aggregate.shortest_candidates
+        if candidate[0] != note.id
+    ]
+
+    required = min(ANALYTICS_TOP_NOTES, aggregate.note_count)
+    if (
+        len(aggregate.longest_candidates) < required
+        or len(aggregate.shortest_candidates) < required
+    ):
+        aggregate.is_stale = True
+
+
+async def rebuild_user_analytics(
+    db: AsyncSession,
+    user_id: int,
+    executor: BoundedProcessExecutor | None = None,
+) -> NoteAnalyticsModel:
+    """
+    Recompute a user's analytics aggregate from the latest versions of
+    their notes.
+
+    Used for the first analytics read of a user, after the aggregate has been
+    marked stale, and by the ``rebuild-analytics`` command to recover from
+    drift. The caller is responsible for committing.
+
+    Args:
+        db: The asynchronous database session.
+        user_id: The ID of the user whose aggregate is rebuilt.
+        executor: Process pool to tokenize in; tokenizes inline if None.
+
+    Returns:
+        The rebuilt NoteAnalyticsModel instance.
+    """
+    stmt = (
+        select(NoteModel.id, NoteModel.text)
+        .where(NoteModel.user_id == user_id, NoteModel.is_head)
+        .order_by(NoteModel.id)
+    )
+    result = await db.execute(stmt)
+    notes = result.all()
+    texts = await load_version_texts(
+        db, [note_id for note_id, text in notes if text is None]
+    )
+    notes = [(note_id, texts.get(note_id, text)) for note_id, text in notes]
+    if executor is None:
+        state = build_analytics_state(notes)
+    else:
+        state = await executor.run(build_analytics_state, notes)
+
+    aggregate = await _get_aggregate_for_update(db, user_id)
+    if aggregate is None:
+        aggregate = NoteAnalyticsModel(user_id=user_id)
+        db.add(aggregate)
+
+    for field, value in state.items():
+        setattr(aggregate, field, value)
+    aggregate.is_stale = False
+    await db.flush()
+    return aggregate
+
+
+async def render_analytics(
+    db: AsyncSession, aggregate: NoteAnalyticsModel
+) -> dict:
+    """
+    Build the analytics response from a user's aggregate.
+
+    Only the texts of the top notes are loaded from the database.
+
+    Args:
+        db: The asynchronous database session.
+        aggregate: The user's analytics aggregate.
+
+    Returns:
+        Dictionary matching NoteAnalyticsResponseSchema.
+    """
+    longest = aggregate.longest_candidates[:ANALYTICS_TOP_NOTES]
+    shortest = aggregate.shortest_candidates[:ANALYTICS_TOP_NOTES]
+    note_ids = {note_id for note_id, _ in longest + shortest}
+
+    stmt = select(NoteModel.id, NoteModel.text).where(
+        NoteModel.id.in_(note_ids)
+    )
+    result = await db.execute(stmt)
+    texts = dict(result.all())
+    texts.update(
+        await load_version_texts(
+            db, [note_id for note_id, text in texts.items() if text is None]
+        )
+    )
+
+    def top_notes(candidates: list[list[int]]) -> list[dict]:
+        return [
+            {"id": note_id, "text": texts[note_id], "word_count": word_count}
+            for note_id, word_count in candidates
+            if note_id in texts
+        ]
+
+    most_common_words = Counter(aggregate.word_frequencies).most_common(3)
+    return {
+        "total_word_count": aggregate.total_word_count,
+        "average_note_length": (
+            aggregate.total_word_count / aggregate.note_count
+        ),
+        "most_common_words": most_common_words,
+        "top_3_longest_notes": top_notes(longest),
+        "top_3_shortest_notes": top_notes(shortest),
+    }
@@ -0,0 +1,230 @@
+import asyncio
+import json
+import logging
+import time
+from typing import Awaitable, Callable
+
+from core.cache_backends import (
+    CacheBackendError,
+    CacheBackendInterface,
+    create_cache_backend,
+)
+from core.metrics import register_metrics_source
+from core.settings import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsCache:
+    """
+    A cache of rendered analytics payloads in a shared cache backend.
+
+    Entries are keyed by user and hold the version of the user's notes
+    they were computed at. An entry of another version is a miss, so
+    analytics are never served stale, even if an invalidation by a write
+    route was lost.
+
+    Concurrent misses for the same user and version are computed once:
+    requests of a process wait for the same computation, and across
+    processes a lock in the backend lets one worker compute while the
+    others poll for its result. Backend failures are logged and treated
+    as misses.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackendInterface,
+        ttl_seconds: float,
+        lock_seconds: float,
+        poll_seconds: float = 0.05,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            backend: The store of the entries.
+            ttl_seconds: Seconds an entry stays valid after it is computed.
+            lock_seconds: The maximum time other workers wait for the
+                worker computing an entry.
+            poll_seconds: Seconds between polls of a waiting worker.
+        """
+        self.backend = backend
+        self._ttl_seconds = ttl_seconds
+        self._lock_seconds = lock_seconds
+        self._poll_seconds = poll_seconds
+        self._in_flight: dict[tuple[int, int], asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.computations = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    @staticmethod
+    def _key(user_id: int) -> str:
+        return f"notes:analytics:{user_id}"
+
+    def _log_error(self, error: CacheBackendError) -> None:
+        self.errors += 1
+        logger.warning(f"Analytics cache unavailable: {error}")
+
+    async def _read(self, user_id: int, version: int) -> dict | None:
+        try:
+            raw = await self.backend.get(self._key(user_id))
+        except CacheBackendError as e:
+            self._log_error(e)
+            return None
+        if raw is None:
+            return None
+        entry = json.loads(raw)
+        if entry["version"] != version:
+            return None
+        return entry["payload"]
+
+    async def _write(self, user_id: int, version: int, payload: dict) -> None:
+        raw = json.dumps({"version": version, "payload": payload}).encode()
+        try:
+            await self.backend.set(self._key(user_id), raw, self._ttl_seconds)
+        except CacheBackendError as e:
+            self._log_error(e)
+
+    async def _lock(self, user_id: int) -> bool:
+        try:
+            return await self.backend.set(
+                self._key(user_id) + ":lock",
+                b"1",
+                self._lock_seconds,
+                only_new=True,
+            )
+        except CacheBackendError as e:
+            self._log_error(e)
+            return True
+
+    async def _unlock(self, user_id: int) -> None:
+        try:
+            await self.backend.delete(self._key(user_id) + ":lock")
+        except CacheBackendError as e:
+            self._log_error(e)
+
+    async def _compute(
+        self,
+        user_id: int,
+        version: int,
+        compute: Callable[[], Awaitable[dict]],
+    ) -> dict:
+        self.computations += 1
+        payload = await compute()
+        await self._write(user_id, version, payload)
+        return payload
+
+    async def _compute_once(
+        self,
+        user_id: int,
+        version: int,
+        compute: Callable[[], Awaitable[dict]],
+    ) -> dict:
+        deadline = time.monotonic() + self._lock_seconds
+        while not await self._lock(user_id):
+            await asyncio.sleep(self._poll_seconds)
+            payload = await self._read(user_id, version)
+            if payload is not None:
+                self.coalesced += 1
+                return payload
+            if time.monotonic() >= deadline:
+                return await self._compute(user_id, version, compute)
+
+        try:
+            return await self._compute(user_id, version, compute)
+        finally:
+            await self._unlock(user_id)
+
+    async def get_or_compute(
+        self,
+        user_id: int,
+        version: int,
+        compute: Callable[[], Awaitable[dict]],
+    ) -> dict:
+        """
+        Return the analytics of a user, computing them only on a miss.
+
+        Exceptions of the computation are raised to every request waiting
+        for it and nothing is cached.
+
+        Args:
+            user_id: The ID of the user.
+            version: The current version of the user's notes.
+            compute: Computes the analytics payload.
+
+        Returns:
+            The analytics payload.
+        """
+        payload = await self._read(user_id, version)
+        if payload is not None:
+            self.hits += 1
+            return payload
+        self.misses += 1
+
+        in_flight = self._in_flight.get((user_id, version))
+        if in_flight is not None:
+            self.coalesced += 1
+            return await asyncio.shield(in_flight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[(user_id, version)] = future
+        try:
+            payload = await self._compute_once(user_id, version, compute)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception retrieved in case nobody waits for it.
+            future.exception()
+            raise
+        else:
+            future.set_result(payload)
+            return payload
+        finally:
+            del self._in_flight[(user_id, version)]
+
+    async def invalidate(self, user_id: int) -> None:
+        """
+        Drop the cached analytics of a user.
+
+        Args:
+            user_id: The ID of the user.
+        """
+        try:
+            await self.backend.delete(self._key(user_id))
+        except CacheBackendError as e:
+            self._log_error(e)
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters.
+
+        Returns:
+            Dictionary of cache and backend counters.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "computations": self.computations,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "backend": self.backend.stats(),
+        }
+
+
+analytics_cache = AnalyticsCache(
+    create_cache_backend(
+        settings.cache_redis_url,
+        max_entries=settings.cache_memory_max_entries,
+        max_connections=settings.cache_redis_max_connections,
+    ),
+    ttl_seconds=settings.analytics_cache_ttl_seconds,
+    lock_seconds=settings.analytics_timeout_seconds,
+)
+register_metrics_source("analytics_cache", analytics_cache.stats)
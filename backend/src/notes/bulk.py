@@ -0,0 +1,218 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Select, delete, insert, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from sqlalchemy.orm.util import identity_key
+
+from core.database import record_writer
+from src.notes.analytics import mark_analytics_stale
+from src.notes.models import (
+    NoteModel,
+    SummaryJobModel,
+    SummaryJobStatus,
+    SummaryStatus,
+    increment_note_data_versions,
+)
+from src.notes.summary_cache import summary_cache
+from src.notes.versions import load_version_texts
+
+
+async def create_notes(
+    db: AsyncSession, user_id: int, texts: list[str]
+) -> list[NoteModel]:
+    """
+    Create many notes of a user with set-based statements.
+
+    Cached summaries are looked up with one query, the notes are written
+    with one multi-row ``INSERT ... RETURNING`` and the summarization jobs
+    of the remaining notes with one more insert, so the summary workers
+    summarize them in batches. The user's analytics aggregate is marked
+    stale instead of being updated note by note, and the version of the
+    user's notes is incremented. The caller is responsible for committing.
+
+    Args:
+        db: The asynchronous database session.
+        user_id: The ID of the owner of the notes.
+        texts: The validated note texts.
+
+    Returns:
+        The created notes in the order of ``texts``.
+    """
+    summaries = await summary_cache.get_many(db, texts)
+    rows = [
+        {
+            "text": text,
+            "user_id": user_id,
+            "summary": summary,
+            "summary_status": (
+                SummaryStatus.COMPLETED.value
+                if summary is not None
+                else SummaryStatus.PENDING.value
+            ),
+        }
+        for text, summary in zip(texts, summaries)
+    ]
+    result = await db.scalars(
+        insert(NoteModel).returning(NoteModel, sort_by_parameter_order=True),
+        rows,
+    )
+    notes = result.all()
+
+    now = datetime.now(timezone.utc)
+    jobs = [
+        {
+            "note_id": note.id,
+            "status": SummaryJobStatus.QUEUED.value,
+            "run_after": now,
+        }
+        for note in notes
+        if note.summary_status == SummaryStatus.PENDING.value
+    ]
+    if jobs:
+        await db.execute(insert(SummaryJobModel), jobs)
+
+    await db.run_sync(increment_note_data_versions, [user_id])
+    await mark_analytics_stale(db, user_id)
+    record_writer(db.sync_session, user_id)
+    return notes
+
+
+def _expire_loaded(db: AsyncSession, note_ids: list[int]) -> None:
+    # Bulk updates by primary key bypass the identity map.
+    identity_map = db.sync_session.identity_map
+    for note_id in note_ids:
+        note = identity_map.get(identity_key(NoteModel, note_id))
+        if note is not None:
+            db.expire(note)
+
+
+def _select_chain_ids(user_id: int, chain_id: int) -> Select:
+    chain = (
+        select(NoteModel.id, NoteModel.previous_version_id)
+        .where(NoteModel.id == chain_id, NoteModel.user_id == user_id)
+        .cte("chain", recursive=True)
+    )
+    linked = aliased(NoteModel)
+    chain = chain.union(
+        select(linked.id, linked.previous_version_id)
+        .join(
+            chain,
+            or_(
+                linked.id == chain.c.previous_version_id,
+                linked.previous_version_id == chain.c.id,
+            ),
+        )
+        .where(linked.user_id == user_id)
+    )
+    return select(chain.c.id)
+
+
+async def delete_notes(
+    db: AsyncSession,
+    user_id: int,
+    note_ids: list[int] | None = None,
+    chain_id: int | None = None,
+) -> int:
+    """
+    Delete many notes of a user with set-based statements.
+
+    Deletes either the given notes or every version of the chain containing
+    ``chain_id``, forks included. Notes of other users are skipped. The
+    versions kept are fixed up like in a single delete, with one statement
+    per kind of change instead of several per note:
+
+    * versions that replaced a deleted version are linked to its nearest
+      kept predecessor;
+    * versions stored as deltas against a deleted version get their full
+      text back;
+    * the nearest kept predecessor of a deleted head becomes the head of
+      its chain unless another version replaced it.
+
+    The user's analytics aggregate is marked stale and the version of the
+    user's notes is incremented. The caller is responsible for committing.
+
+    Args:
+        db: The asynchronous database session.
+        user_id: The ID of the owner of the notes.
+        note_ids: The IDs of the notes to delete.
+        chain_id: The ID of any version of the chain to delete.
+
+    Returns:
+        The number of deleted notes.
+    """
+    if chain_id is not None:
+        selected = NoteModel.id.in_(_select_chain_ids(user_id, chain_id))
+    else:
+        selected = NoteModel.id.in_(note_ids)
+    result = await db.execute(
+        select(
+            NoteModel.id, NoteModel.previous_version_id, NoteModel.is_head
+        ).where(selected, NoteModel.user_id == user_id)
+    )
+    deleted = {
+        note_id: (previous_id, is_head)
+        for note_id, previous_id, is_head in result.all()
+    }
+    if not deleted:
+        return 0
+    ids = list(deleted)
+
+    def kept_predecessor(note_id: int) -> int | None:
+        previous_id = deleted[note_id][0]
+        while previous_id in deleted:
+            previous_id = deleted[previous_id][0]
+        return previous_id
+
+    result = await db.execute(
+        select(NoteModel.id, NoteModel.previous_version_id).where(
+            NoteModel.previous_version_id.in_(ids), NoteModel.id.not_in(ids)
+        )
+    )
+    relinks = [
+        {"id": note_id, "previous_version_id": kept_predecessor(previous_id)}
+        for note_id, previous_id in result.all()
+    ]
+
+    result = await db.execute(
+        select(NoteModel.id).where(
+            NoteModel.delta_base_id.in_(ids), NoteModel.id.not_in(ids)
+        )
+    )
+    texts = await load_version_texts(db, result.scalars().all())
+    expansions = [
+        {"id": note_id, "text": text, "delta": None, "delta_base_id": None}
+        for note_id, text in texts.items()
+    ]
+
+    candidates = {
+        kept_predecessor(note_id)
+        for note_id, (_, is_head) in deleted.items()
+        if is_head
+    } - {None}
+    result = await db.execute(
+        select(NoteModel.previous_version_id).where(
+            NoteModel.previous_version_id.in_(candidates),
+            NoteModel.id.not_in(ids),
+        )
+    )
+    replaced = set(result.scalars().all())
+    replaced.update(relink["previous_version_id"] for relink in relinks)
+    heads = [
+        {"id": note_id, "is_head": True} for note_id in candidates - replaced
+    ]
+
+    for changes in (relinks, expansions, heads):
+        if changes:
+            await db.execute(update(NoteModel), changes)
+            _expire_loaded(db, [change["id"] for change in changes])
+    await db.execute(
+        delete(NoteModel)
+        .where(NoteModel.id.in_(ids))
+        .execution_options(synchronize_session="fetch")
+    )
+
+    await db.run_sync(increment_note_data_versions, [user_id])
+    await mark_analytics_stale(db, user_id)
+    record_writer(db.sync_session, user_id)
+    return len(ids)
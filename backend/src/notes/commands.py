@@ -0,0 +1,119 @@
+"""
+Maintenance commands for notes.
+
+Usage:
+    python -m src.notes.commands rebuild-analytics [--user-id USER_ID]
+    python -m src.notes.commands compress-versions [--user-id USER_ID]
+                                                   [--expand]
+"""
+
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import select
+
+from core.database import async_session
+from src.auth.models import UserModel
+from src.notes.analytics import rebuild_user_analytics
+from src.notes.versions import compress_user_versions, expand_user_versions
+
+
+logger = logging.getLogger(__name__)
+
+
+async def _get_user_ids(db, user_id: int | None) -> list[int]:
+    if user_id is not None:
+        return [user_id]
+    result = await db.execute(select(UserModel.id))
+    return result.scalars().all()
+
+
+async def rebuild_analytics(user_id: int | None = None) -> int:
+    """
+    Rebuild analytics aggregates from the stored notes.
+
+    Each user's aggregate is rebuilt and committed in its own transaction.
+
+    Args:
+        user_id: The ID of a single user to rebuild, or None for all users.
+
+    Returns:
+        The number of rebuilt aggregates.
+    """
+    async with async_session() as db:
+        user_ids = await _get_user_ids(db, user_id)
+        for current_user_id in user_ids:
+            await rebuild_user_analytics(db, current_user_id)
+            await db.commit()
+            logger.info(f"Rebuilt analytics for user {current_user_id}")
+
+    return len(user_ids)
+
+
+async def compress_versions(
+    user_id: int | None = None, expand: bool = False
+) -> int:
+    """
+    Store old note versions as deltas, or restore their full texts.
+
+    Each user's versions are processed and committed in their own
+    transaction.
+
+    Args:
+        user_id: The ID of a single user to process, or None for all users.
+        expand: Restore full texts instead of compressing, e.g. before
+            downgrading the database.
+
+    Returns:
+        The number of compressed or expanded versions.
+    """
+    total = 0
+    async with async_session() as db:
+        for current_user_id in await _get_user_ids(db, user_id):
+            if expand:
+                count = await expand_user_versions(db, current_user_id)
+            else:
+                count = await compress_user_versions(db, current_user_id)
+            await db.commit()
+            logger.info(
+                f"Processed {count} version(s) of user {current_user_id}"
+            )
+            total += count
+    return total
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Notes maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    rebuild_parser = subparsers.add_parser(
+        "rebuild-analytics",
+        help="Recompute per-user analytics aggregates from the notes table.",
+    )
+    rebuild_parser.add_argument("--user-id", type=int, default=None)
+
+    compress_parser = subparsers.add_parser(
+        "compress-versions",
+        help="Store note versions as deltas against newer versions.",
+    )
+    compress_parser.add_argument("--user-id", type=int, default=None)
+    compress_parser.add_argument(
+        "--expand",
+        action="store_true",
+        help="Restore the full text of every delta version instead.",
+    )
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "rebuild-analytics":
+        count = asyncio.run(rebuild_analytics(args.user_id))
+        logger.info(f"Rebuilt {count} analytics aggregate(s)")
+    elif args.command == "compress-versions":
+        count = asyncio.run(compress_versions(args.user_id, args.expand))
+        logger.info(f"Processed {count} note version(s)")
+
+
+if __name__ == "__main__":
+    main()
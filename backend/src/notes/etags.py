@@ -0,0 +1,116 @@
+from fastapi import Response, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.notes.models import NoteDataVersionModel, NoteModel
+
+
+# Responses are per user and must be revalidated before every reuse.
+CACHE_CONTROL = "private, no-cache"
+
+
+async def get_data_version(db: AsyncSession, user_id: int) -> int:
+    """
+    Return the version of a user's notes.
+
+    Args:
+        db: The asynchronous database session.
+        user_id: The ID of the user.
+
+    Returns:
+        The version, 0 if the user never wrote a note.
+    """
+    version = await db.scalar(
+        select(NoteDataVersionModel.version).where(
+            NoteDataVersionModel.user_id == user_id
+        )
+    )
+    return version or 0
+
+
+async def get_note_data_version(db: AsyncSession, note_id: int) -> int | None:
+    """
+    Return the version of the notes of the owner of a note.
+
+    Args:
+        db: The asynchronous database session.
+        note_id: The ID of the note.
+
+    Returns:
+        The version, or None if the note does not exist.
+    """
+    result = await db.execute(
+        select(NoteModel.id, NoteDataVersionModel.version)
+        .outerjoin(
+            NoteDataVersionModel,
+            NoteDataVersionModel.user_id == NoteModel.user_id,
+        )
+        .where(NoteModel.id == note_id)
+    )
+    row = result.first()
+    if row is None:
+        return None
+    return row.version or 0
+
+
+def make_etag(*parts: object) -> str:
+    """
+    Build a strong ETag from the parts identifying a representation.
+
+    Args:
+        *parts: The resource kind, IDs and data version.
+
+    Returns:
+        The quoted ETag.
+    """
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Return whether an If-None-Match header matches an ETag.
+
+    Uses the weak comparison required for If-None-Match, so ``W/``
+    prefixed tags match as well.
+
+    Args:
+        if_none_match: The value of the If-None-Match header, if sent.
+        etag: The current ETag of the resource.
+
+    Returns:
+        True if the client's copy is current.
+    """
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in {
+        tag.strip().removeprefix("W/") for tag in if_none_match.split(",")
+    }
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """
+    Set the caching headers of a response.
+
+    Args:
+        response: The response to send.
+        etag: The current ETag of the resource.
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+
+
+def not_modified(etag: str) -> Response:
+    """
+    Return a ``304 Not Modified`` response for a current client copy.
+
+    Args:
+        etag: The current ETag of the resource.
+
+    Returns:
+        The empty response.
+    """
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_etag(response, etag)
+    return response
@@ -0,0 +1,106 @@
+import csv
+import io
+import json
+from enum import Enum
+from typing import AsyncIterator
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.notes.models import NoteModel
+from src.notes.versions import load_version_texts
+
+
+EXPORT_BATCH_SIZE = 500
+
+EXPORT_COLUMNS = (
+    NoteModel.id,
+    NoteModel.text,
+    NoteModel.summary,
+    NoteModel.summary_status,
+    NoteModel.previous_version_id,
+    NoteModel.created_at,
+    NoteModel.user_id,
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+
+class ExportFormat(str, Enum):
+    """Supported note export formats."""
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        if self is ExportFormat.CSV:
+            return "text/csv"
+        return "application/x-ndjson"
+
+
+def _serialize_row(row, texts: dict[int, str]) -> dict:
+    data = dict(zip(EXPORT_FIELDS, row))
+    if data["text"] is None:
+        data["text"] = texts[data["id"]]
+    data["created_at"] = data["created_at"].isoformat()
+    return data
+
+
+def _render_ndjson(rows, texts: dict[int, str]) -> str:
+    return "".join(
+        json.dumps(_serialize_row(row, texts)) + "\n" for row in rows
+    )
+
+
+def _render_csv(
+    rows, texts: dict[int, str], include_header: bool = False
+) -> str:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS)
+    if include_header:
+        writer.writeheader()
+    writer.writerows(_serialize_row(row, texts) for row in rows)
+    return buffer.getvalue()
+
+
+async def stream_user_notes(
+    db: AsyncSession, user_id: int, export_format: ExportFormat
+) -> AsyncIterator[str]:
+    """
+    Stream all notes of a user in the requested format.
+
+    Rows are read from a server-side cursor in batches of EXPORT_BATCH_SIZE
+    and rendered one batch at a time, so memory use does not depend on the
+    number of notes. Versions stored as deltas are reconstructed per batch.
+    The generator owns the session from the moment the response starts and
+    closes it when the stream ends.
+
+    Args:
+        db: The asynchronous database session.
+        user_id: The ID of the user whose notes are exported.
+        export_format: The output format.
+
+    Yields:
+        Chunks of the rendered export.
+    """
+    stmt = (
+        select(*EXPORT_COLUMNS)
+        .where(NoteModel.user_id == user_id)
+        .order_by(NoteModel.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    try:
+        if export_format is ExportFormat.CSV:
+            yield _render_csv([], {}, include_header=True)
+
+        result = await db.stream(stmt)
+        async for rows in result.partitions():
+            texts = await load_version_texts(
+                db, [row.id for row in rows if row.text is None]
+            )
+            if export_format is ExportFormat.CSV:
+                yield _render_csv(rows, texts)
+            else:
+                yield _render_ndjson(rows, texts)
+    finally:
+        await db.close()
@@ -0,0 +1,95 @@
+from sqlalchemy import Select, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from src.notes.models import NoteModel
+from src.notes.versions import load_note_texts
+
+
+def build_history_query(
+    note_id: int, user_id: int, limit: int, before_id: int | None = None
+) -> Select:
+    """
+    Build the query for a page of a note's version history.
+
+    The chain is followed through ``previous_version_id`` by a recursive
+    CTE, newest version first. The recursion stops after ``limit + 1``
+    versions, so a page costs one indexed lookup per returned version
+    regardless of the length of the chain.
+
+    Args:
+        note_id: The ID of the newest version of the page's chain.
+        user_id: The ID of the owner; versions of other users are skipped.
+        limit: The number of versions in the page.
+        before_id: Cursor from the previous page; the page starts at the
+            version preceding it instead of at ``note_id``.
+
+    Returns:
+        A select of NoteModel rows ordered from newest to oldest.
+    """
+    if before_id is None:
+        start = NoteModel.id == note_id
+    else:
+        start = (
+            NoteModel.id
+            == select(NoteModel.previous_version_id)
+            .where(NoteModel.id == before_id, NoteModel.user_id == user_id)
+            .scalar_subquery()
+        )
+
+    chain = (
+        select(
+            NoteModel.id,
+            NoteModel.previous_version_id,
+            literal(0).label("depth"),
+        )
+        .where(start, NoteModel.user_id == user_id)
+        .cte("note_history", recursive=True)
+    )
+    previous = aliased(NoteModel)
+    chain = chain.union_all(
+        select(
+            previous.id,
+            previous.previous_version_id,
+            chain.c.depth + 1,
+        )
+        .join(chain, previous.id == chain.c.previous_version_id)
+        .where(previous.user_id == user_id, chain.c.depth < limit)
+    )
+    return (
+        select(NoteModel)
+        .join(chain, NoteModel.id == chain.c.id)
+        .order_by(chain.c.depth)
+    )
+
+
+async def get_note_history(
+    db: AsyncSession,
+    note_id: int,
+    user_id: int,
+    limit: int,
+    before_id: int | None = None,
+) -> tuple[list[NoteModel], int | None]:
+    """
+    Return a page of a note's version history.
+
+    Versions stored as deltas are reconstructed.
+
+    Args:
+        db: The asynchronous database session.
+        note_id: The ID of the note whose history is listed.
+        user_id: The ID of the owner of the note.
+        limit: The maximum number of versions in the page.
+        before_id: Cursor from the previous page.
+
+    Returns:
+        The versions of the page, newest first, and the cursor of the next
+        page, or None on the last page.
+    """
+    result = await db.execute(
+        build_history_query(note_id, user_id, limit, before_id)
+    )
+    versions = result.scalars().all()
+    await load_note_texts(db, versions)
+    next_cursor = versions[limit - 1].id if len(versions) > limit else None
+    return versions[:limit], next_cursor
@@ -0,0 +1,228 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.settings import settings
+from src.notes.models import (
+    NoteModel,
+    SummaryJobModel,
+    SummaryJobStatus,
+    SummaryStatus,
+)
+from src.notes.summary_cache import summary_cache
+from src.notes.versions import load_note_texts
+
+
+logger = logging.getLogger(__name__)
+
+Summarizer = Callable[[str], Awaitable[str]]
+
+
+def get_retry_delay(attempts: int) -> timedelta:
+    """
+    Return the exponential backoff before the next attempt of a job.
+
+    Args:
+        attempts: The number of attempts made so far.
+
+    Returns:
+        The delay before the job may run again.
+    """
+    delay = settings.summary_job_backoff_seconds * 2 ** (attempts - 1)
+    return timedelta(
+        seconds=min(delay, settings.summary_job_max_backoff_seconds)
+    )
+
+
+def enqueue_summary_job(db: AsyncSession, note: NoteModel) -> SummaryJobModel:
+    """
+    Queue summarization of a note in the caller's transaction.
+
+    Args:
+        db: The asynchronous database session.
+        note: The flushed note to summarize.
+
+    Returns:
+        The new SummaryJobModel instance.
+    """
+    job = SummaryJobModel(
+        note_id=note.id,
+        status=SummaryJobStatus.QUEUED.value,
+        run_after=datetime.now(timezone.utc),
+    )
+    db.add(job)
+    return job
+
+
+async def schedule_note_summary(db: AsyncSession, note: NoteModel) -> None:
+    """
+    Fill a new note's summary from the cache or queue its summarization.
+
+    Runs in the caller's transaction without calling the summarizer, so
+    writes are not bound by LLM latency.
+
+    Args:
+        db: The asynchronous database session.
+        note: The flushed note.
+    """
+    summary = await summary_cache.get(db, note.text)
+    if summary is not None:
+        note.summary = summary
+        note.summary_status = SummaryStatus.COMPLETED.value
+        return
+
+    note.summary_status = SummaryStatus.PENDING.value
+    enqueue_summary_job(db, note)
+
+
+async def claim_summary_jobs(
+    db: AsyncSession, worker_id: str, limit: int
+) -> list[SummaryJobModel]:
+    """
+    Claim due jobs for a worker and commit the claim.
+
+    Rows are locked with ``FOR UPDATE SKIP LOCKED``, so concurrent workers
+    never claim the same job. Jobs whose lease expired, because their worker
+    died while processing them, are claimed again.
+
+    Args:
+        db: The asynchronous database session.
+        worker_id: Identifier of the claiming worker.
+        limit: The maximum number of jobs to claim.
+
+    Returns:
+        The claimed jobs.
+    """
+    now = datetime.now(timezone.utc)
+    lease_expired_before = now - timedelta(
+        seconds=settings.summary_job_lease_seconds
+    )
+    stmt = (
+        select(SummaryJobModel)
+        .where(
+            or_(
+                and_(
+                    SummaryJobModel.status == SummaryJobStatus.QUEUED.value,
+                    SummaryJobModel.run_after <= now,
+                ),
+                and_(
+                    SummaryJobModel.status
+                    == SummaryJobStatus.PROCESSING.value,
+                    SummaryJobModel.locked_at < lease_expired_before,
+                ),
+            )
+        )
+        .order_by(SummaryJobModel.run_after, SummaryJobModel.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    result = await db.execute(stmt)
+    jobs = result.scalars().all()
+
+    for job in jobs:
+        job.status = SummaryJobStatus.PROCESSING.value
+        job.locked_by = worker_id
+        job.locked_at = now
+        job.attempts += 1
+    await db.commit()
+    return jobs
+
+
+def _schedule_retry(
+    job: SummaryJobModel, note: NoteModel, error: BaseException
+) -> None:
+    job.last_error = repr(error)
+    job.locked_by = None
+    job.locked_at = None
+
+    if job.attempts >= settings.summary_job_max_attempts:
+        job.status = SummaryJobStatus.FAILED.value
+        note.summary_status = SummaryStatus.FAILED.value
+        logger.error(
+            f"Summary job {job.id} for note {note.id} failed permanently: "
+            f"{error!r}"
+        )
+        return
+
+    job.status = SummaryJobStatus.QUEUED.value
+    job.run_after = datetime.now(timezone.utc) + get_retry_delay(job.attempts)
+    logger.warning(
+        f"Summary job {job.id} for note {note.id} failed "
+        f"(attempt {job.attempts}), retrying at {job.run_after}: {error!r}"
+    )
+
+
+def _complete_job(job: SummaryJobModel, note: NoteModel, summary: str) -> None:
+    note.summary = summary
+    note.summary_status = SummaryStatus.COMPLETED.value
+    job.status = SummaryJobStatus.DONE.value
+    job.locked_by = None
+    job.locked_at = None
+
+
+async def run_summary_jobs(
+    db: AsyncSession, jobs: list[SummaryJobModel], summarize: Summarizer
+) -> None:
+    """
+    Summarize the notes of claimed jobs and commit the outcome.
+
+    Summaries go through the summary cache, and the misses of all jobs are
+    summarized concurrently, so a batching summarizer can serve them with a
+    single request. Failures, including timeouts, reschedule a job with
+    backoff or mark it failed once it ran out of attempts.
+
+    Args:
+        db: The asynchronous database session.
+        jobs: Jobs claimed by this worker.
+        summarize: The summarizer to call on cache misses.
+    """
+
+    async def summarize_with_timeout(text: str) -> str:
+        return await asyncio.wait_for(
+            summarize(text), timeout=settings.summary_timeout_seconds
+        )
+
+    claimed = []
+    for job in jobs:
+        note = await db.get(NoteModel, job.note_id)
+        if note is None:
+            job.status = SummaryJobStatus.DONE.value
+            job.last_error = "Note no longer exists"
+            continue
+        claimed.append((job, note))
+    await load_note_texts(db, [note for _, note in claimed])
+
+    summaries = await summary_cache.get_or_summarize_many(
+        db, [note.text for _, note in claimed], summarize_with_timeout
+    )
+    for (job, note), summary in zip(claimed, summaries):
+        if isinstance(summary, BaseException):
+            _schedule_retry(job, note, summary)
+        else:
+            _complete_job(job, note, summary)
+    await db.commit()
+
+
+async def process_summary_jobs(
+    db: AsyncSession, summarize: Summarizer, worker_id: str, batch_size: int
+) -> int:
+    """
+    Claim and run one batch of due summarization jobs.
+
+    Args:
+        db: The asynchronous database session.
+        summarize: The summarizer to call on cache misses.
+        worker_id: Identifier of the worker.
+        batch_size: The maximum number of jobs to claim.
+
+    Returns:
+        The number of processed jobs.
+    """
+    jobs = await claim_summary_jobs(db, worker_id, batch_size)
+    if jobs:
+        await run_summary_jobs(db, jobs, summarize)
+    return len(jobs)
@@ -1,26 +1,89 @@
 from datetime import datetime
+from enum import Enum
+from typing import Iterable
 
-from sqlalchemy import Integer, DateTime, ForeignKey, Text, func
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    DDL,
+    JSON,
+    Boolean,
+    Integer,
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    Text,
+    event,
+    func,
+)
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Mapped, Session, mapped_column, relationship
+from sqlalchemy.sql import expression
 
 from core.database import BaseModel
 
 
+class SummaryStatus(str, Enum):
+    """Lifecycle of a note's summary."""
+
+    PENDING = "pending"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class SummaryJobStatus(str, Enum):
+    """Lifecycle of a summarization job."""
+
+    QUEUED = "queued"
+    PROCESSING = "processing"
+    DONE = "done"
+    FAILED = "failed"
+
+
 class NoteModel(BaseModel):
     """
     Database model representing a note.
 
     This model stores note information including text, summary, and versioning,
     with a relationship to the owning user.
+
+    Older versions may be stored as a delta against a newer version of the
+    same chain (``delta_base_id``) instead of a full text; their ``text`` is
+    then None until reconstructed with ``src.notes.versions``. ``is_head``
+    marks the latest version of each chain, the only one listed and counted
+    in analytics.
     """
 
     __tablename__ = "notes"
+    __table_args__ = (
+        Index("ix_notes_user_id_id", "user_id", "id"),
+        Index("ix_notes_previous_version_id", "previous_version_id"),
+        Index("ix_notes_delta_base_id", "delta_base_id"),
+        Index(
+            "ix_notes_user_id_id_head",
+            "user_id",
+            "id",
+            postgresql_where=expression.text("is_head"),
+            sqlite_where=expression.text("is_head"),
+        ),
+    )
 
     id: Mapped[int] = mapped_column(
         Integer, primary_key=True, autoincrement=True
     )
-    text: Mapped[str] = mapped_column(Text, nullable=False)
+    text: Mapped[str] = mapped_column(Text, nullable=True)
+    delta: Mapped[str] = mapped_column(Text, nullable=True)
+    delta_base_id: Mapped[int] = mapped_column(Integer, nullable=True)
+    version: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    is_head: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=True, server_default=expression.true()
+    )
     summary: Mapped[str] = mapped_column(Text, nullable=True)
+    summary_status: Mapped[str] = mapped_column(
+        String(16), nullable=False, default=SummaryStatus.PENDING.value
+    )
     previous_version_id: Mapped[int] = mapped_column(Integer, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -41,3 +104,229 @@ class NoteModel(BaseModel):
             A string in the format '<Note user_email text>'.
         """
         return f"<Note {self.user.email} \n {self.text}>"
+
+
+# Full-text search support, see src/notes/search.py. Postgres keeps a
+# generated tsvector column with a GIN index over head versions; SQLite keeps
+# an external-content FTS5 table in sync with triggers.
+NOTES_SEARCH_POSTGRESQL_DDL = [
+    "ALTER TABLE notes ADD COLUMN search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('english', coalesce(text, ''))) "
+    "STORED",
+    "CREATE INDEX ix_notes_search_vector ON notes "
+    "USING gin (search_vector) WHERE is_head",
+]
+NOTES_SEARCH_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE notes_fts USING fts5("
+    "text, content='notes', content_rowid='id')",
+    "CREATE TRIGGER notes_fts_insert AFTER INSERT ON notes BEGIN "
+    "INSERT INTO notes_fts(rowid, text) VALUES (new.id, new.text); END",
+    "CREATE TRIGGER notes_fts_delete AFTER DELETE ON notes BEGIN "
+    "INSERT INTO notes_fts(notes_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); END",
+    "CREATE TRIGGER notes_fts_update AFTER UPDATE OF text ON notes BEGIN "
+    "INSERT INTO notes_fts(notes_fts, rowid, text) "
+    "VALUES ('delete', old.id, old.text); "
+    "INSERT INTO notes_fts(rowid, text) VALUES (new.id, new.text); END",
+]
+
+for statement in NOTES_SEARCH_POSTGRESQL_DDL:
+    event.listen(
+        NoteModel.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
+for statement in NOTES_SEARCH_SQLITE_DDL:
+    event.listen(
+        NoteModel.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="sqlite"),
+    )
+event.listen(
+    NoteModel.__table__,
+    "before_drop",
+    DDL("DROP TABLE IF EXISTS notes_fts").execute_if(dialect="sqlite"),
+)
+
+
+class NoteAnalyticsModel(BaseModel):
+    """
+    Database model representing the analytics aggregate of a user's notes.
+
+    The aggregate is maintained incrementally by the note write routes, so
+    reading analytics does not require re-tokenizing every note. Candidate
+    lists hold ``[note_id, word_count]`` pairs of the longest and shortest
+    notes and are trimmed to a fixed size.
+    """
+
+    __tablename__ = "note_analytics"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    note_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    total_word_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0
+    )
+    word_frequencies: Mapped[dict] = mapped_column(
+        JSON, nullable=False, default=dict
+    )
+    longest_candidates: Mapped[list] = mapped_column(
+        JSON, nullable=False, default=list
+    )
+    shortest_candidates: Mapped[list] = mapped_column(
+        JSON, nullable=False, default=list
+    )
+    is_stale: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<NoteAnalyticsModel(user_id={self.user_id}, "
+            f"note_count={self.note_count})>"
+        )
+
+
+class NoteDataVersionModel(BaseModel):
+    """
+    Database model representing the version of a user's notes.
+
+    The version is incremented in the transaction of every write to the
+    user's notes, so it changes whenever anything the note read endpoints
+    return may have changed. Their ETags are derived from it.
+    """
+
+    __tablename__ = "note_data_versions"
+
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return (
+            f"<NoteDataVersionModel(user_id={self.user_id}, "
+            f"version={self.version})>"
+        )
+
+
+def increment_note_data_versions(
+    session: Session, user_ids: Iterable[int]
+) -> None:
+    """
+    Increment the note data versions of users in the session's transaction.
+
+    Writes of NoteModel instances increment the version of their owner
+    when flushed; statements executed without them, such as bulk inserts,
+    must increment it here.
+
+    Args:
+        session: The synchronous session, ``AsyncSession.sync_session``.
+        user_ids: The IDs of the users whose notes are written.
+    """
+    user_ids = sorted(set(user_ids))
+    if not user_ids:
+        return
+
+    connection = session.connection()
+    if connection.dialect.name == "postgresql":
+        insert = postgresql_insert
+    else:
+        insert = sqlite_insert
+    table = NoteDataVersionModel.__table__
+    stmt = (
+        insert(table)
+        .values([{"user_id": user_id, "version": 1} for user_id in user_ids])
+        .on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={"version": table.c.version + 1},
+        )
+    )
+    connection.execute(stmt)
+
+
+@event.listens_for(Session, "after_flush")
+def _increment_written_note_versions(session: Session, flush_context) -> None:
+    increment_note_data_versions(
+        session,
+        (
+            instance.user_id
+            for instance in (*session.new, *session.dirty, *session.deleted)
+            if isinstance(instance, NoteModel)
+            and (instance in session.new or session.is_modified(instance))
+        ),
+    )
+
+
+class SummaryCacheModel(BaseModel):
+    """
+    Database model representing a cached note summary.
+
+    Summaries are keyed by a SHA-256 digest of the summarization model name
+    and the normalized note text, so identical texts are summarized once.
+    """
+
+    __tablename__ = "summary_cache"
+
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    model_name: Mapped[str] = mapped_column(String(64), nullable=False)
+    summary: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<SummaryCacheModel(key={self.key}, "
+            f"model_name={self.model_name})>"
+        )
+
+
+class SummaryJobModel(BaseModel):
+    """
+    Database model representing a queued note summarization job.
+
+    Jobs are claimed by summary workers with ``FOR UPDATE SKIP LOCKED`` and
+    retried with exponential backoff until they succeed or run out of
+    attempts.
+    """
+
+    __tablename__ = "summary_jobs"
+    __table_args__ = (
+        Index("ix_summary_jobs_status_run_after", "status", "run_after"),
+    )
+
+    id: Mapped[int] = mapped_column(
+        Integer, primary_key=True, autoincrement=True
+    )
+    note_id: Mapped[int] = mapped_column(
+        ForeignKey("notes.id", ondelete="CASCADE"), nullable=False
+    )
+    status: Mapped[str] = mapped_column(
+        String(16), nullable=False, default=SummaryJobStatus.QUEUED.value
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    run_after: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False
+    )
+    locked_by: Mapped[str] = mapped_column(String(64), nullable=True)
+    locked_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    last_error: Mapped[str] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<SummaryJobModel(id={self.id}, note_id={self.note_id}, "
+            f"status={self.status}, attempts={self.attempts})>"
+        )
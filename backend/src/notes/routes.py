@@ -1,23 +1,66 @@
 import asyncio
-from collections import Counter
 
-import pandas as pd
-from nltk import word_tokenize
-from fastapi import APIRouter, status, Depends, HTTPException
-from google.api_core import exceptions
+from fastapi import (
+    APIRouter,
+    status,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Response,
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.database import get_db
-from core.dependencies import get_current_user
-from core.utils import summarize_note
+from core.dependencies import (
+    get_analytics_executor,
+    get_current_principal,
+    get_current_user,
+    get_read_db,
+)
+from core.executors import BoundedProcessExecutor, ExecutorSaturatedError
+from security.principals import CurrentPrincipal
 from src.auth.models import UserModel
-from src.notes.models import NoteModel
+from src.notes.analytics import (
+    record_note_added,
+    record_note_removed,
+    rebuild_user_analytics,
+    render_analytics,
+)
+from src.notes.analytics_cache import analytics_cache
+from src.notes.bulk import create_notes, delete_notes
+from src.notes.etags import (
+    etag_matches,
+    get_data_version,
+    get_note_data_version,
+    make_etag,
+    not_modified,
+    set_etag,
+)
+from src.notes.export import ExportFormat, stream_user_notes
+from src.notes.history import get_note_history
+from src.notes.search import InvalidSearchCursorError, search_notes
+from src.notes.jobs import schedule_note_summary
+from src.notes.models import NoteModel, NoteAnalyticsModel
+from src.notes.versions import (
+    compress_version,
+    expand_dependent_versions,
+    load_note_texts,
+    restore_previous_head,
+)
 from src.notes.schemas import (
+    NoteBulkCreateRequestSchema,
+    NoteBulkCreateResponseSchema,
+    NoteBulkDeleteRequestSchema,
+    NoteBulkDeleteResponseSchema,
     NoteCreateResponseSchema,
     NoteCreateRequestSchema,
     NoteBaseSchema,
+    NotePageResponseSchema,
+    NoteSearchResponseSchema,
     NoteUpdateRequestSchema,
     NoteAnalyticsResponseSchema,
 )
@@ -25,6 +68,9 @@ from src.notes.schemas import (
 
 router = APIRouter()
 
+NOTES_PAGE_DEFAULT_LIMIT = 50
+NOTES_PAGE_MAX_LIMIT = 100
+
 
 @router.get(
     "/analytics/",
@@ -34,6 +80,9 @@ router = APIRouter()
     description="Retrieve analytics for the authenticated user's notes, including total word count, "
                 "average note length, most common words, and top 3 longest and shortest notes.",
     responses={
+        304: {
+            "description": "Not Modified - The ETag in If-None-Match is current.",
+        },
         404: {
             "description": "Not Found - No notes found for the user.",
             "content": {
@@ -52,78 +101,93 @@ router = APIRouter()
                 }
             },
         },
+        503: {
+            "description": "Service Unavailable - Analytics workers are busy.",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Analytics service is busy, try again later"
+                    }
+                }
+            },
+        },
+        504: {
+            "description": "Gateway Timeout - Analytics took too long.",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Analytics computation took too long"
+                    }
+                }
+            },
+        },
     },
 )
 async def get_notes_analytics(
+    response: Response,
+    if_none_match: str | None = Header(None),
     db: AsyncSession = Depends(get_db),
+    read_db: AsyncSession = Depends(get_read_db),
     user: UserModel = Depends(get_current_user),
+    executor: BoundedProcessExecutor = Depends(get_analytics_executor),
 ) -> NoteAnalyticsResponseSchema:
     """
     Retrieve analytics for the user's notes.
 
+    Analytics are served from the analytics cache, keyed by user and by
+    version of the user's notes. On a miss they are read from the user's
+    incrementally maintained aggregate, which is rebuilt from the notes
+    only when it is missing or stale. The rebuild tokenizes in the
+    analytics process pool and runs on the primary; fresh aggregates are
+    read through the read session.
+
+    The ETag is derived from the version of the user's notes, so a client
+    sending a current ETag in If-None-Match gets a 304 before the
+    aggregate is read.
+
     Args:
-        db: The asynchronous database session.
+        response: The response, to set the ETag on.
+        if_none_match: ETag of the client's copy, if any.
+        db: The asynchronous database session on the primary.
+        read_db: The read session, possibly on a replica.
         user: The authenticated user.
+        executor: The analytics process pool.
 
     Returns:
         Dictionary containing analytics: total word count, average note length,
-        most common words, and top 3 longest/shortest notes.
+        most common words, and top 3 longest/shortest notes, or an empty 304
+        response if the client's copy is current.
 
     Raises:
-        HTTPException: 404 if no notes found, 500 if database or NLTK error occurs.
+        HTTPException: 404 if no notes found, 500 if database or NLTK error occurs,
+            503 if the analytics pool is saturated, 504 on analytics timeout.
     """
     try:
-        stmt = select(NoteModel).where(NoteModel.user_id == user.id)
-        result = await db.execute(stmt)
-        notes = result.scalars().all()
-
-        if not notes:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="No notes found for the user",
-            )
+        version = await get_data_version(read_db, user.id)
+        etag = make_etag("analytics", user.id, version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+        async def compute() -> dict:
+            session = read_db
+            aggregate = await read_db.get(NoteAnalyticsModel, user.id)
+            if aggregate is None or aggregate.is_stale:
+                aggregate = await rebuild_user_analytics(db, user.id, executor)
+                await db.commit()
+                session = db
+
+            if not aggregate.note_count:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="No notes found for the user",
+                )
+            return await render_analytics(session, aggregate)
 
-        notes_data = [{"id": note.id, "text": note.text} for note in notes]
-        df = pd.DataFrame(notes_data)
-
-        df["word_count"] = df["text"].apply(lambda x: len(word_tokenize(x)))
-        total_word_count = int(df["word_count"].sum())
-        average_note_length = float(df["word_count"].mean())
-
-        all_text = " ".join(df["text"]).lower()
-        words = [
-            word.lower() for word in word_tokenize(all_text) if word.isalpha()
-        ]
-        most_common_words = Counter(words).most_common(3)
-
-        top_3_longest = [
-            {
-                "id": int(row["id"]),
-                "text": row["text"],
-                "word_count": int(row["word_count"]),
-            }
-            for row in df.nlargest(3, "word_count")[
-                ["id", "text", "word_count"]
-            ].to_dict("records")
-        ]
-        top_3_shortest = [
-            {
-                "id": int(row["id"]),
-                "text": row["text"],
-                "word_count": int(row["word_count"]),
-            }
-            for row in df.nsmallest(3, "word_count")[
-                ["id", "text", "word_count"]
-            ].to_dict("records")
-        ]
-
-        return {
-            "total_word_count": total_word_count,
-            "average_note_length": average_note_length,
-            "most_common_words": most_common_words,
-            "top_3_longest_notes": top_3_longest,
-            "top_3_shortest_notes": top_3_shortest,
-        }
+        analytics = await analytics_cache.get_or_compute(
+            user.id, version, compute
+        )
+        set_etag(response, etag)
+        return analytics
     except SQLAlchemyError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -134,15 +198,29 @@ async def get_notes_analytics(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve analytics: NLTK resource punkt_tab not found. Run `nltk.download('punkt_tab')`",
         )
+    except ExecutorSaturatedError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Analytics service is busy, try again later",
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+            detail="Analytics computation took too long",
+        )
 
 
 @router.get(
     "/",
-    response_model=list[NoteBaseSchema],
+    response_model=NotePageResponseSchema,
     status_code=status.HTTP_200_OK,
     summary="Get All Notes",
-    description="Retrieve a list of all notes from the database. Accessible to authenticated users.",
+    description="Retrieve a page of the latest versions of the authenticated user's notes "
+    "ordered by ID. Older versions are listed by the history endpoint. Pass `next_cursor` from the response as `after_id` to get the next page.",
     responses={
+        304: {
+            "description": "Not Modified - The ETag in If-None-Match is current.",
+        },
         500: {
             "description": "Internal Server Error - Database error occurred.",
             "content": {
@@ -150,61 +228,203 @@ async def get_notes_analytics(
                     "example": {"detail": "Database connection failed"}
                 }
             },
-        }
+        },
     },
 )
 async def get_notes(
-    db: AsyncSession = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user),  # noqa F401
-) -> list[NoteBaseSchema]:
+    response: Response,
+    after_id: int | None = Query(
+        None, description="Return notes with an ID greater than this cursor."
+    ),
+    limit: int = Query(
+        NOTES_PAGE_DEFAULT_LIMIT, ge=1, le=NOTES_PAGE_MAX_LIMIT
+    ),
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+    principal: CurrentPrincipal = Depends(get_current_principal),
+) -> NotePageResponseSchema:
     """
-    Retrieve all notes from the database for the authenticated user.
+    Retrieve a page of notes for the authenticated user.
+
+    Only the latest version of each note is listed. Uses keyset pagination
+    over the partial ``(user_id, id) WHERE is_head`` index, so the cost of a
+    page depends neither on the size of the notes table nor on the number
+    of old versions. A client sending the current ETag in If-None-Match
+    gets a 304 before the notes are queried.
 
     Args:
+        response: The response, to set the ETag on.
+        after_id: Cursor from the previous page; notes with a greater ID are returned.
+        limit: The maximum number of notes in the page.
+        if_none_match: ETag of the client's copy, if any.
         db: The asynchronous database session.
-        current_user: The authenticated user (currently unused but required for authentication).
+        principal: The authenticated caller whose notes are listed.
 
     Returns:
-        A list of notes in NoteBaseSchema format.
+        NotePageResponseSchema with the notes and the next page cursor, or
+        an empty 304 response if the client's copy is current.
 
     Raises:
         HTTPException: 500 if a database error occurs.
     """
     try:
-        stmt = select(NoteModel)
+        version = await get_data_version(db, principal.user_id)
+        etag = make_etag("notes", principal.user_id, version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+        stmt = (
+            select(NoteModel)
+            .where(NoteModel.user_id == principal.user_id, NoteModel.is_head)
+            .order_by(NoteModel.id)
+            .limit(limit + 1)
+        )
+        if after_id is not None:
+            stmt = stmt.where(NoteModel.id > after_id)
         result = await db.execute(stmt)
-        return result.scalars().all()
+        notes = result.scalars().all()
+        await load_note_texts(db, notes)
+
+        next_cursor = notes[limit - 1].id if len(notes) > limit else None
+        set_etag(response, etag)
+        return NotePageResponseSchema(
+            items=notes[:limit], next_cursor=next_cursor
+        )
     except SQLAlchemyError as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
         )
 
 
-@router.post(
-    "/",
-    response_model=NoteCreateResponseSchema,
-    status_code=status.HTTP_201_CREATED,
-    summary="Create a New Note",
-    description="Create a new note with text and automatically generated summary using Gemini API. Requires authentication.",
+@router.get(
+    "/export/",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Export Notes",
+    description="Stream all of the authenticated user's notes, including every version, "
+    "as NDJSON (one JSON object per line) or CSV.",
     responses={
-        504: {
-            "description": "Gateway Timeout - Summarization took too long.",
+        200: {
+            "content": {"application/x-ndjson": {}, "text/csv": {}},
+            "description": "The exported notes.",
+        }
+    },
+)
+async def export_notes(
+    export_format: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    db: AsyncSession = Depends(get_db),
+    principal: CurrentPrincipal = Depends(get_current_principal),
+) -> StreamingResponse:
+    """
+    Stream an export of the user's notes.
+
+    Args:
+        export_format: The output format, ``ndjson`` or ``csv``.
+        db: The asynchronous database session, closed when the stream ends.
+        principal: The authenticated caller whose notes are exported.
+
+    Returns:
+        A StreamingResponse producing the export.
+    """
+    return StreamingResponse(
+        stream_user_notes(db, principal.user_id, export_format),
+        media_type=export_format.media_type,
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="notes.{export_format.value}"'
+            )
+        },
+    )
+
+
+@router.get(
+    "/search/",
+    response_model=NoteSearchResponseSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Search Notes",
+    description="Full-text search over the latest versions of the authenticated user's notes, "
+    "best match first. Pass `next_cursor` from the response as `cursor` to get the next page.",
+    responses={
+        422: {
+            "description": "Unprocessable Entity - Empty query or invalid cursor.",
             "content": {
                 "application/json": {
-                    "example": {"detail": "Summarization took too long"}
+                    "example": {"detail": "Invalid search cursor: abc"}
                 }
             },
         },
-        503: {
-            "description": "Service Unavailable - Gemini API error.",
+        500: {
+            "description": "Internal Server Error - Database error occurred.",
             "content": {
                 "application/json": {
-                    "example": {
-                        "detail": "Gemini API error: Failed to connect"
-                    }
+                    "example": {"detail": "Failed to search notes"}
                 }
             },
         },
+    },
+)
+async def search_user_notes(
+    q: str = Query(..., max_length=256, description="The search terms."),
+    cursor: str | None = Query(
+        None, description="Cursor from the previous page."
+    ),
+    limit: int = Query(
+        NOTES_PAGE_DEFAULT_LIMIT, ge=1, le=NOTES_PAGE_MAX_LIMIT
+    ),
+    db: AsyncSession = Depends(get_read_db),
+    principal: CurrentPrincipal = Depends(get_current_principal),
+) -> NoteSearchResponseSchema:
+    """
+    Search the authenticated user's notes.
+
+    Matches go through the full-text index of the database, a GIN index on
+    Postgres and an FTS5 table on SQLite, instead of scanning note texts.
+
+    Args:
+        q: The search terms.
+        cursor: Cursor from the previous page.
+        limit: The maximum number of results in the page.
+        db: The asynchronous database session.
+        principal: The authenticated caller whose notes are searched.
+
+    Returns:
+        NoteSearchResponseSchema with the matches and the next page cursor.
+
+    Raises:
+        HTTPException:
+            - 422 if the query is empty or the cursor is invalid.
+            - 500 if a database error occurs.
+    """
+    if not q.strip():
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Search query must not be empty",
+        )
+
+    try:
+        notes, next_cursor = await search_notes(
+            db, principal.user_id, q, limit, cursor
+        )
+    except InvalidSearchCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=str(e)
+        )
+    except SQLAlchemyError:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to search notes",
+        )
+    return NoteSearchResponseSchema(items=notes, next_cursor=next_cursor)
+
+
+@router.post(
+    "/",
+    response_model=NoteCreateResponseSchema,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create a New Note",
+    description="Create a new note with text. The summary is generated asynchronously using Gemini API "
+    "and `summary_status` stays `pending` until it is ready. Requires authentication.",
+    responses={
         500: {
             "description": "Internal Server Error - Database or unexpected error.",
             "content": {
@@ -221,7 +441,11 @@ async def create_note(
     user: UserModel = Depends(get_current_user),
 ) -> NoteCreateResponseSchema:
     """
-    Create a new note with an auto-generated summary.
+    Create a new note and schedule its summary.
+
+    The note is stored right away. Summaries of previously seen texts are
+    filled from the summary cache; otherwise a summarization job is queued
+    for the summary workers.
 
     Args:
         note_data: The request data containing the note text.
@@ -232,39 +456,146 @@ async def create_note(
         The created note in NoteCreateResponseSchema format.
 
     Raises:
-        HTTPException:
-            - 504 if summarization exceeds the timeout (10 seconds).
-            - 503 if the Gemini API encounters an error.
-            - 500 if a database error occurs.
+        HTTPException: 500 if a database error occurs.
     """
     try:
-        note_summary = await asyncio.wait_for(
-            summarize_note(note_data.text), timeout=10
-        )
-        note = NoteModel(
-            text=note_data.text,
-            summary=note_summary,
-            user_id=user.id,
-        )
+        note = NoteModel(text=note_data.text, user_id=user.id)
         db.add(note)
+        await db.flush()
+        await schedule_note_summary(db, note)
+        await record_note_added(db, note)
         await db.commit()
+        await analytics_cache.invalidate(user.id)
         await db.refresh(note)
         return note
-    except asyncio.TimeoutError:
+    except SQLAlchemyError:
+        await db.rollback()
         raise HTTPException(
-            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
-            detail="Summarization took too long",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create note",
+        )
+
+
+@router.post(
+    "/bulk/",
+    response_model=NoteBulkCreateResponseSchema,
+    status_code=status.HTTP_201_CREATED,
+    summary="Create Many Notes",
+    description="Create up to NOTES_BULK_MAX_SIZE notes in one transaction, e.g. to import an "
+    "archive. Summaries are generated asynchronously in batches. Requires authentication.",
+    responses={
+        500: {
+            "description": "Internal Server Error - Database or unexpected error.",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Failed to create notes"}
+                }
+            },
+        },
+    },
+)
+async def create_notes_bulk(
+    notes_data: NoteBulkCreateRequestSchema,
+    db: AsyncSession = Depends(get_db),
+    user: UserModel = Depends(get_current_user),
+) -> NoteBulkCreateResponseSchema:
+    """
+    Create many notes with a single multi-row insert.
+
+    Args:
+        notes_data: The request data containing the note texts.
+        db: The asynchronous database session.
+        user: The authenticated user who owns the notes.
+
+    Returns:
+        NoteBulkCreateResponseSchema with the created notes in request
+        order.
+
+    Raises:
+        HTTPException: 500 if a database error occurs.
+    """
+    try:
+        notes = await create_notes(
+            db, user.id, [note.text for note in notes_data.notes]
         )
-    except exceptions.GoogleAPIError as api_err:
+        await db.commit()
+        await analytics_cache.invalidate(user.id)
+        return NoteBulkCreateResponseSchema(items=notes)
+    except SQLAlchemyError:
+        await db.rollback()
         raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Gemini API error: {str(api_err)}",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to create notes",
+        )
+
+
+@router.delete(
+    "/bulk/",
+    response_model=NoteBulkDeleteResponseSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Delete Many Notes",
+    description="Delete the given notes, or every version of the chain of `chain_id`, in one "
+    "transaction, updating the version history of the notes kept. Requires authentication "
+    "and ownership; notes of other users are skipped.",
+    responses={
+        404: {
+            "description": "Not Found - No note found or user lacks permission.",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "detail": "Notes not found or you don't have permission"
+                    }
+                }
+            },
+        },
+        500: {
+            "description": "Internal Server Error - Database error.",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Failed to delete notes"}
+                }
+            },
+        },
+    },
+)
+async def delete_notes_bulk(
+    notes_data: NoteBulkDeleteRequestSchema,
+    db: AsyncSession = Depends(get_db),
+    user: UserModel = Depends(get_current_user),
+) -> NoteBulkDeleteResponseSchema:
+    """
+    Delete many notes with a handful of set-based statements.
+
+    Args:
+        notes_data: The request data with the note IDs or the chain.
+        db: The asynchronous database session.
+        user: The authenticated user who owns the notes.
+
+    Returns:
+        NoteBulkDeleteResponseSchema with the number of deleted notes.
+
+    Raises:
+        HTTPException:
+            - 404 if none of the notes is found or owned by the user.
+            - 500 if a database error occurs.
+    """
+    try:
+        deleted = await delete_notes(
+            db, user.id, notes_data.ids, notes_data.chain_id
         )
+        if not deleted:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Notes not found or you don't have permission",
+            )
+        await db.commit()
+        await analytics_cache.invalidate(user.id)
+        return NoteBulkDeleteResponseSchema(deleted=deleted)
     except SQLAlchemyError:
         await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to create note",
+            detail="Failed to delete notes",
         )
 
 
@@ -275,6 +606,9 @@ async def create_note(
     summary="Get a Specific Note",
     description="Retrieve a single note by its ID. Accessible to authenticated users.",
     responses={
+        304: {
+            "description": "Not Modified - The ETag in If-None-Match is current.",
+        },
         404: {
             "description": "Not Found - Note with the specified ID does not exist.",
             "content": {
@@ -293,19 +627,28 @@ async def create_note(
 )
 async def get_note(
     note_id: int,
-    db: AsyncSession = Depends(get_db),
-    user: UserModel = Depends(get_current_user),  # noqa F401
+    response: Response,
+    if_none_match: str | None = Header(None),
+    db: AsyncSession = Depends(get_read_db),
+    principal: CurrentPrincipal = Depends(get_current_principal),  # noqa F401
 ) -> NoteBaseSchema:
     """
     Retrieve a specific note by its ID.
 
+    The ETag is derived from the version of the notes of the note's owner,
+    so a client sending a current ETag in If-None-Match gets a 304 before
+    the note is loaded.
+
     Args:
         note_id: The ID of the note to retrieve.
+        response: The response, to set the ETag on.
+        if_none_match: ETag of the client's copy, if any.
         db: The asynchronous database session.
-        user: The authenticated user (currently unused but required for authentication).
+        principal: The authenticated caller (currently unused but required for authentication).
 
     Returns:
-        The requested note in NoteBaseSchema format.
+        The requested note in NoteBaseSchema format, or an empty 304
+        response if the client's copy is current.
 
     Raises:
         HTTPException:
@@ -313,6 +656,15 @@ async def get_note(
             - 500 if a database error occurs.
     """
     try:
+        version = await get_note_data_version(db, note_id)
+        if version is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Note not found"
+            )
+        etag = make_etag("note", note_id, version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
         stmt = select(NoteModel).where(NoteModel.id == note_id)
         result = await db.execute(stmt)
         note = result.scalars().first()
@@ -321,6 +673,8 @@ async def get_note(
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Note not found"
             )
+        await load_note_texts(db, [note])
+        set_etag(response, etag)
         return note
     except SQLAlchemyError:
         raise HTTPException(
@@ -329,33 +683,105 @@ async def get_note(
         )
 
 
-@router.patch(
-    "/{note_id}/",
-    response_model=NoteBaseSchema,
+@router.get(
+    "/{note_id}/history/",
+    response_model=NotePageResponseSchema,
     status_code=status.HTTP_200_OK,
-    summary="Update a Note",
-    description="Update an existing note by creating a new version with the provided text and summary. Requires authentication.",
+    summary="Get Note History",
+    description="Retrieve a page of a note's versions, starting at the note and following "
+    "`previous_version_id` from newest to oldest. Pass `next_cursor` from the response as "
+    "`before_id` to get the next page. Requires ownership.",
     responses={
         404: {
-            "description": "Not Found - Note with the specified ID does not exist.",
+            "description": "Not Found - Note not found or user lacks permission.",
             "content": {
-                "application/json": {"example": {"detail": "Note not found"}}
+                "application/json": {
+                    "example": {
+                        "detail": "Note not found or you don't have permission"
+                    }
+                }
             },
         },
-        504: {
-            "description": "Gateway Timeout - Summarization took too long.",
+        500: {
+            "description": "Internal Server Error - Database error.",
             "content": {
                 "application/json": {
-                    "example": {"detail": "Summarization took too long"}
+                    "example": {"detail": "Failed to retrieve note history"}
                 }
             },
         },
-        503: {
-            "description": "Service Unavailable - Gemini API error.",
+    },
+)
+async def get_note_history_page(
+    note_id: int,
+    before_id: int | None = Query(
+        None, description="Return versions older than this version."
+    ),
+    limit: int = Query(
+        NOTES_PAGE_DEFAULT_LIMIT, ge=1, le=NOTES_PAGE_MAX_LIMIT
+    ),
+    db: AsyncSession = Depends(get_read_db),
+    principal: CurrentPrincipal = Depends(get_current_principal),
+) -> NotePageResponseSchema:
+    """
+    Retrieve a page of the version history of a note.
+
+    The whole page is fetched with one recursive query over the
+    ``previous_version_id`` index.
+
+    Args:
+        note_id: The ID of the note whose history is listed.
+        before_id: Cursor from the previous page.
+        limit: The maximum number of versions in the page.
+        db: The asynchronous database session.
+        principal: The authenticated caller, who must own the note.
+
+    Returns:
+        NotePageResponseSchema with the versions and the next page cursor.
+
+    Raises:
+        HTTPException:
+            - 404 if the note is not found or the user lacks permission.
+            - 500 if a database error occurs.
+    """
+    try:
+        versions, next_cursor = await get_note_history(
+            db, note_id, principal.user_id, limit, before_id
+        )
+    except SQLAlchemyError:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to retrieve note history",
+        )
+
+    if not versions and before_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Note not found or you don't have permission",
+        )
+    return NotePageResponseSchema(items=versions, next_cursor=next_cursor)
+
+
+@router.patch(
+    "/{note_id}/",
+    response_model=NoteBaseSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Update a Note",
+    description="Update an existing note by creating a new version with the provided text. "
+    "The summary of the new version is generated asynchronously. Requires authentication.",
+    responses={
+        404: {
+            "description": "Not Found - Note does not exist or is not owned by the user.",
+            "content": {
+                "application/json": {"example": {"detail": "Note not found"}}
+            },
+        },
+        409: {
+            "description": "Conflict - The note is not the latest version.",
             "content": {
                 "application/json": {
                     "example": {
-                        "detail": "Gemini API error: Failed to connect"
+                        "detail": "Only the latest version can be updated"
                     }
                 }
             },
@@ -379,6 +805,8 @@ async def update_note(
     """
     Update an existing note by creating a new version.
 
+    The summary of the new version is scheduled like in create_note.
+
     Args:
         note_id: The ID of the note to update.
         note_data: The request data containing the updated note text.
@@ -390,13 +818,18 @@ async def update_note(
 
     Raises:
         HTTPException:
-            - 404 if the note with the specified ID is not found.
-            - 504 if summarization exceeds the timeout (10 seconds).
-            - 503 if the Gemini API encounters an error.
+            - 404 if the note is not found or not owned by the user.
+            - 409 if the note is not the latest version of its chain.
             - 500 if a database error occurs.
     """
     try:
-        stmt = select(NoteModel).where(NoteModel.id == note_id)
+        # Concurrent updates of the same version wait for each other, so
+        # only one of them replaces it as the head.
+        stmt = (
+            select(NoteModel)
+            .where(NoteModel.id == note_id, NoteModel.user_id == user.id)
+            .with_for_update()
+        )
         result = await db.execute(stmt)
         note = result.scalars().first()
 
@@ -404,30 +837,32 @@ async def update_note(
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Note not found"
             )
+        # A new version of an older one would fork the chain.
+        if not note.is_head:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Only the latest version can be updated",
+            )
 
-        note_summary = await asyncio.wait_for(
-            summarize_note(note_data.text), timeout=10
-        )
+        previous = note
         note = NoteModel(
             text=note_data.text,
             previous_version_id=note_id,
-            summary=note_summary,
             user_id=user.id,
+            version=previous.version + 1,
         )
         db.add(note)
+        await db.flush()
+        previous.is_head = False
+        await load_note_texts(db, [previous])
+        await record_note_removed(db, previous)
+        compress_version(previous, note)
+        await schedule_note_summary(db, note)
+        await record_note_added(db, note)
         await db.commit()
+        await analytics_cache.invalidate(user.id)
         await db.refresh(note)
         return note
-    except asyncio.TimeoutError:
-        raise HTTPException(
-            status_code=status.HTTP_504_GATEWAY_TIMEOUT,
-            detail="Summarization took too long",
-        )
-    except exceptions.GoogleAPIError as api_err:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail=f"Gemini API error: {str(api_err)}",
-        )
     except SQLAlchemyError:
         await db.rollback()
         raise HTTPException(
@@ -514,8 +949,18 @@ async def delete_note(
                 else:
                     parent_note.previous_version_id = None
 
+        await load_note_texts(db, [note])
+        await expand_dependent_versions(db, note.id)
+        # Flushing bumps the data version before the aggregate is locked.
         await db.delete(note)
+        await db.flush()
+        if note.is_head:
+            await record_note_removed(db, note)
+            new_head = await restore_previous_head(db, note)
+            if new_head is not None:
+                await record_note_added(db, new_head)
         await db.commit()
+        await analytics_cache.invalidate(user.id)
     except SQLAlchemyError:
         await db.rollback()
         raise HTTPException(
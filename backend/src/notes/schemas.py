@@ -1,8 +1,9 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 
+from core.settings import settings
 from src.notes.validators import validate_note
 
 
@@ -19,6 +20,7 @@ class NoteBaseSchema(BaseModel):
     text: str
     previous_version_id: Optional[int] = None
     summary: Optional[str] = None
+    summary_status: str
     created_at: datetime
     user_id: int
 
@@ -26,6 +28,30 @@ class NoteBaseSchema(BaseModel):
         from_attributes = True
 
 
+class NotePageResponseSchema(BaseModel):
+    """
+    Schema for a page of notes.
+
+    Contains the notes of the current page and the cursor to pass as
+    ``after_id`` to fetch the next page, or None on the last page.
+    """
+
+    items: list[NoteBaseSchema]
+    next_cursor: Optional[int] = None
+
+
+class NoteSearchResponseSchema(BaseModel):
+    """
+    Schema for a page of search results.
+
+    Contains the matching notes, best match first, and the opaque cursor
+    to pass as ``cursor`` to fetch the next page, or None on the last page.
+    """
+
+    items: list[NoteBaseSchema]
+    next_cursor: Optional[str] = None
+
+
 class NoteCreateRequestSchema(BaseModel):
     """
     Schema for creating a new note request.
@@ -62,6 +88,66 @@ class NoteCreateResponseSchema(NoteBaseSchema):
     pass
 
 
+class NoteBulkCreateRequestSchema(BaseModel):
+    """
+    Schema for creating many notes at once.
+
+    Accepts between one and NOTES_BULK_MAX_SIZE notes, each validated like
+    a single note.
+    """
+
+    notes: list[NoteCreateRequestSchema] = Field(
+        min_length=1, max_length=settings.notes_bulk_max_size
+    )
+
+
+class NoteBulkCreateResponseSchema(BaseModel):
+    """
+    Schema for the bulk note creation response.
+
+    Contains the created notes in request order.
+    """
+
+    items: list[NoteBaseSchema]
+
+
+class NoteBulkDeleteRequestSchema(BaseModel):
+    """
+    Schema for deleting many notes at once.
+
+    Exactly one of ``ids``, up to NOTES_BULK_MAX_SIZE note IDs, or
+    ``chain_id``, any version of a chain whose versions are all deleted,
+    must be given.
+    """
+
+    ids: Optional[list[int]] = Field(
+        None, min_length=1, max_length=settings.notes_bulk_max_size
+    )
+    chain_id: Optional[int] = None
+
+    @model_validator(mode="after")
+    def validate_target(self) -> "NoteBulkDeleteRequestSchema":
+        """
+        Check that exactly one deletion target is given.
+
+        Returns:
+            The validated schema.
+        """
+        if (self.ids is None) == (self.chain_id is None):
+            raise ValueError("Provide either ids or chain_id")
+        return self
+
+
+class NoteBulkDeleteResponseSchema(BaseModel):
+    """
+    Schema for the bulk note deletion response.
+
+    Contains the number of deleted notes.
+    """
+
+    deleted: int
+
+
 class NoteUpdateRequestSchema(NoteCreateRequestSchema):
     """
     Schema for updating a note request.
@@ -0,0 +1,182 @@
+from sqlalchemy import (
+    Select,
+    and_,
+    column,
+    func,
+    literal_column,
+    or_,
+    select,
+    table,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.notes.models import NoteModel
+
+
+# Must match the configuration of the generated search_vector column.
+SEARCH_CONFIG = literal_column("'english'::regconfig")
+
+notes_fts = table("notes_fts", column("rowid"))
+
+
+class InvalidSearchCursorError(ValueError):
+    """Raised when a search cursor was not produced by search_notes."""
+
+
+def encode_search_cursor(rank: float, note_id: int) -> str:
+    """
+    Encode the position after a search result as a page cursor.
+
+    Args:
+        rank: The rank of the result.
+        note_id: The ID of the result.
+
+    Returns:
+        The opaque cursor.
+    """
+    return f"{rank!r}:{note_id}"
+
+
+def decode_search_cursor(cursor: str) -> tuple[float, int]:
+    """
+    Decode a cursor created by encode_search_cursor.
+
+    Args:
+        cursor: The cursor.
+
+    Returns:
+        The rank and the ID of the last result of the previous page.
+
+    Raises:
+        InvalidSearchCursorError: If the cursor is malformed.
+    """
+    try:
+        rank, note_id = cursor.split(":")
+        return float(rank), int(note_id)
+    except ValueError:
+        raise InvalidSearchCursorError(f"Invalid search cursor: {cursor}")
+
+
+def _fts5_query(query: str) -> str:
+    # Quote every term, so user input cannot use FTS5 query syntax.
+    return " ".join(
+        '"' + term.replace('"', '""') + '"' for term in query.split()
+    )
+
+
+def _match_postgresql(query: str) -> tuple:
+    search_vector = literal_column("notes.search_vector")
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    return (
+        func.ts_rank(search_vector, ts_query),
+        search_vector.op("@@")(ts_query),
+        None,
+    )
+
+
+def _match_sqlite(query: str) -> tuple:
+    fts = literal_column("notes_fts")
+    return (
+        -func.bm25(fts),
+        fts.op("MATCH")(_fts5_query(query)),
+        notes_fts,
+    )
+
+
+def build_search_query(
+    dialect: str,
+    user_id: int,
+    query: str,
+    limit: int,
+    after: tuple[float, int] | None = None,
+) -> Select:
+    """
+    Build the query for a page of full-text search results.
+
+    On Postgres the query matches the ``search_vector`` column with
+    ``websearch_to_tsquery`` and ranks with ``ts_rank``; on SQLite it
+    matches the ``notes_fts`` FTS5 table and ranks with ``bm25``. Only the
+    user's head versions are searched. Results are ordered by rank, then
+    by ID, and paginated by keyset on both.
+
+    Args:
+        dialect: The name of the database dialect.
+        user_id: The ID of the user whose notes are searched.
+        query: The search terms.
+        limit: The number of results in the page.
+        after: Rank and ID of the last result of the previous page.
+
+    Returns:
+        A select of NoteModel rows and their rank, with one extra row to
+        detect the next page.
+    """
+    if dialect == "postgresql":
+        rank, match, fts_table = _match_postgresql(query)
+    else:
+        rank, match, fts_table = _match_sqlite(query)
+
+    ranked = select(NoteModel.id.label("id"), rank.label("rank")).where(
+        match, NoteModel.user_id == user_id, NoteModel.is_head
+    )
+    if fts_table is not None:
+        ranked = ranked.select_from(
+            NoteModel.__table__.join(
+                fts_table, NoteModel.id == fts_table.c.rowid
+            )
+        )
+    ranked = ranked.subquery("ranked")
+
+    stmt = (
+        select(NoteModel, ranked.c.rank)
+        .join(ranked, NoteModel.id == ranked.c.id)
+        .order_by(ranked.c.rank.desc(), ranked.c.id.desc())
+        .limit(limit + 1)
+    )
+    if after is not None:
+        after_rank, after_id = after
+        stmt = stmt.where(
+            or_(
+                ranked.c.rank < after_rank,
+                and_(ranked.c.rank == after_rank, ranked.c.id < after_id),
+            )
+        )
+    return stmt
+
+
+async def search_notes(
+    db: AsyncSession,
+    user_id: int,
+    query: str,
+    limit: int,
+    cursor: str | None = None,
+) -> tuple[list[NoteModel], str | None]:
+    """
+    Return a page of the user's notes matching a full-text query.
+
+    Args:
+        db: The asynchronous database session.
+        user_id: The ID of the user whose notes are searched.
+        query: The search terms.
+        limit: The maximum number of results in the page.
+        cursor: Cursor from the previous page.
+
+    Returns:
+        The matching notes, best match first, and the cursor of the next
+        page, or None on the last page.
+
+    Raises:
+        InvalidSearchCursorError: If the cursor is malformed.
+    """
+    after = decode_search_cursor(cursor) if cursor is not None else None
+    stmt = build_search_query(
+        db.bind.dialect.name, user_id, query, limit, after
+    )
+    result = await db.execute(stmt)
+    rows = result.all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        note, rank = rows[limit - 1]
+        next_cursor = encode_search_cursor(rank, note.id)
+
+    return [note for note, _ in rows[:limit]], next_cursor
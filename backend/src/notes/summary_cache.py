@@ -0,0 +1,245 @@
+import asyncio
+import hashlib
+import time
+import unicodedata
+from typing import Awaitable, Callable
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.cache import TTLCache
+from core.metrics import register_metrics_source
+from core.settings import settings
+from src.notes.models import SummaryCacheModel
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize note text before hashing.
+
+    Applies Unicode NFC normalization and collapses runs of whitespace, so
+    texts that differ only in formatting share a cache entry.
+
+    Args:
+        text: The note text.
+
+    Returns:
+        The normalized text.
+    """
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def make_summary_key(text: str, model_name: str) -> str:
+    """
+    Build the cache key for a text and summarization model.
+
+    Args:
+        text: The note text.
+        model_name: The name of the summarization model.
+
+    Returns:
+        Hex SHA-256 digest of the model name and the normalized text.
+    """
+    payload = f"{model_name}\0{normalize_text(text)}".encode()
+    return hashlib.sha256(payload).hexdigest()
+
+
+class SummaryCache:
+    """
+    A two-tier, content-addressed cache of note summaries.
+
+    Lookups go to an in-process TTL/LRU tier first and then to the
+    ``summary_cache`` table. Only misses on both tiers call the summarizer.
+    """
+
+    def __init__(self, memory: TTLCache, model_name: str) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            memory: The in-process tier.
+            model_name: The summarization model, part of every key.
+        """
+        self._memory = memory
+        self._model_name = model_name
+        self.memory_hits = 0
+        self.database_hits = 0
+        self.misses = 0
+        self._summarize_seconds = 0.0
+
+    async def _store(self, db: AsyncSession, key: str, summary: str) -> None:
+        if db.bind.dialect.name == "postgresql":
+            insert = postgresql_insert
+        else:
+            insert = sqlite_insert
+        stmt = (
+            insert(SummaryCacheModel)
+            .values(key=key, model_name=self._model_name, summary=summary)
+            .on_conflict_do_nothing(index_elements=["key"])
+        )
+        await db.execute(stmt)
+
+    async def get(self, db: AsyncSession, text: str) -> str | None:
+        """
+        Return the cached summary of a text without summarizing on a miss.
+
+        Args:
+            db: The asynchronous database session.
+            text: The note text.
+
+        Returns:
+            The cached summary, or None if neither tier has it.
+        """
+        key = make_summary_key(text, self._model_name)
+
+        summary = self._memory.get(key)
+        if summary is not None:
+            self.memory_hits += 1
+            return summary
+
+        record = await db.get(SummaryCacheModel, key)
+        if record is not None:
+            self.database_hits += 1
+            self._memory.set(key, record.summary)
+            return record.summary
+
+        return None
+
+    async def get_many(
+        self, db: AsyncSession, texts: list[str]
+    ) -> list[str | None]:
+        """
+        Return the cached summaries of several texts without summarizing.
+
+        Memory misses are looked up in the database tier with one query.
+
+        Args:
+            db: The asynchronous database session.
+            texts: The note texts.
+
+        Returns:
+            The cached summary of every text, or None where neither tier
+            has it.
+        """
+        keys = [make_summary_key(text, self._model_name) for text in texts]
+        found: dict[str, str] = {}
+        for key in keys:
+            summary = self._memory.get(key)
+            if summary is not None:
+                self.memory_hits += 1
+                found[key] = summary
+
+        missing = set(keys) - found.keys()
+        if missing:
+            result = await db.execute(
+                select(SummaryCacheModel.key, SummaryCacheModel.summary).where(
+                    SummaryCacheModel.key.in_(missing)
+                )
+            )
+            for key, summary in result.all():
+                self.database_hits += 1
+                self._memory.set(key, summary)
+                found[key] = summary
+
+        return [found.get(key) for key in keys]
+
+    async def get_or_summarize_many(
+        self,
+        db: AsyncSession,
+        texts: list[str],
+        summarize: Callable[[str], Awaitable[str]],
+    ) -> list[str | BaseException]:
+        """
+        Return the summaries of several texts.
+
+        Cache lookups run one after another on the session; the misses,
+        deduplicated by key, are then summarized concurrently, so a batching
+        summarizer can send them in one request. New summaries are written
+        to the database tier in the caller's transaction, so they are
+        persisted together with the notes.
+
+        Args:
+            db: The asynchronous database session.
+            texts: The note texts.
+            summarize: The summarizer to call on misses.
+
+        Returns:
+            The summary of every text, or the exception raised while
+            summarizing it.
+        """
+        keys = [make_summary_key(text, self._model_name) for text in texts]
+        results: dict[str, str | BaseException] = {}
+        missing: dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in results or key in missing:
+                continue
+            summary = await self.get(db, text)
+            if summary is None:
+                missing[key] = text
+            else:
+                results[key] = summary
+
+        summaries = await asyncio.gather(
+            *(self._summarize(summarize, text) for text in missing.values()),
+            return_exceptions=True,
+        )
+        for key, summary in zip(missing, summaries):
+            results[key] = summary
+            if isinstance(summary, BaseException):
+                continue
+            await self._store(db, key, summary)
+            self._memory.set(key, summary)
+
+        return [results[key] for key in keys]
+
+    async def _summarize(
+        self, summarize: Callable[[str], Awaitable[str]], text: str
+    ) -> str:
+        started_at = time.perf_counter()
+        summary = await summarize(text)
+        self._summarize_seconds += time.perf_counter() - started_at
+        self.misses += 1
+        return summary
+
+    def clear_memory(self) -> None:
+        """Drop all entries of the in-process tier."""
+        self._memory.clear()
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss counters and the LLM work they saved.
+
+        The saved time is estimated from the average latency of the
+        summarizer calls made on misses.
+
+        Returns:
+            Dictionary of cache counters.
+        """
+        hits = self.memory_hits + self.database_hits
+        average_seconds = (
+            self._summarize_seconds / self.misses if self.misses else 0.0
+        )
+        return {
+            "memory": self._memory.stats(),
+            "memory_hits": self.memory_hits,
+            "database_hits": self.database_hits,
+            "misses": self.misses,
+            "llm_calls_saved": hits,
+            "llm_seconds_saved_estimate": hits * average_seconds,
+            "timeout_budget_seconds_saved": (
+                hits * settings.summary_timeout_seconds
+            ),
+        }
+
+
+summary_cache = SummaryCache(
+    memory=TTLCache(
+        max_entries=settings.summary_cache_max_entries,
+        ttl_seconds=settings.summary_cache_ttl_seconds,
+        max_bytes=settings.summary_cache_max_bytes,
+    ),
+    model_name=settings.summary_model,
+)
+register_metrics_source("summary_cache", summary_cache.stats)
@@ -0,0 +1,93 @@
+import re
+from typing import Iterable, Iterator, NamedTuple
+
+from nltk import word_tokenize
+from nltk.tokenize.destructive import NLTKWordTokenizer
+
+
+# Plain ASCII text without periods, quotes, brackets or symbols. For such
+# text Punkt sentence splitting cannot change the tokens and only a handful
+# of the NLTKWordTokenizer rules can fire, so they are applied directly.
+FAST_PATH_PATTERN = re.compile(r"[A-Za-z0-9\s,;!?]*", re.ASCII)
+
+# The rules below are the subset of NLTKWordTokenizer.PUNCTUATION that can
+# match such text, in their original order.
+_FAST_PATH_RULES = [
+    (re.compile(r"([:,])([^\d])"), r" \1 \2"),
+    (re.compile(r"([:,])$"), r" \1 "),
+    (re.compile(r"[;@#$%&]"), r" \g<0> "),
+    (re.compile(r"[?!]"), r" \g<0> "),
+]
+_CONTRACTION_RULES = NLTKWordTokenizer.CONTRACTIONS2
+
+
+class TokenizedNote(NamedTuple):
+    """Tokenization result of a single note."""
+
+    word_count: int
+    words: list[str]
+
+
+def _fast_tokenize(text: str) -> list[str]:
+    for regexp, substitution in _FAST_PATH_RULES:
+        text = regexp.sub(substitution, text)
+
+    text = f" {text} "
+    for regexp in _CONTRACTION_RULES:
+        text = regexp.sub(r" \1 \2 ", text)
+    return text.split()
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into tokens exactly like ``nltk.word_tokenize``.
+
+    Plain ASCII text takes a compiled-regex fast path that skips Punkt
+    sentence splitting; anything else is delegated to NLTK.
+
+    Args:
+        text: The text to tokenize.
+
+    Returns:
+        The list of tokens.
+
+    Raises:
+        LookupError: If NLTK's punkt_tab resource is needed but missing.
+    """
+    if FAST_PATH_PATTERN.fullmatch(text):
+        return _fast_tokenize(text)
+    return word_tokenize(text)
+
+
+def tokenize_note(text: str) -> TokenizedNote:
+    """
+    Tokenize a note once for both word counting and word frequencies.
+
+    Args:
+        text: The note text.
+
+    Returns:
+        TokenizedNote with the total token count and the alphabetic,
+        lowercased words.
+    """
+    tokens = tokenize(text)
+    return TokenizedNote(
+        word_count=len(tokens),
+        words=[token.lower() for token in tokens if token.isalpha()],
+    )
+
+
+def tokenize_notes(
+    notes: Iterable[tuple[int, str]],
+) -> Iterator[tuple[int, TokenizedNote]]:
+    """
+    Lazily tokenize a stream of notes.
+
+    Args:
+        notes: Pairs of note id and note text.
+
+    Yields:
+        Pairs of note id and its TokenizedNote.
+    """
+    for note_id, text in notes:
+        yield note_id, tokenize_note(text)
@@ -1,8 +1,88 @@
+import re
+from typing import Iterable
+
 from fastapi import HTTPException, status
 from profanityfilter import ProfanityFilter
+from profanityfilter.profanityfilter import (
+    ENDS_WITH_WORD_CHAR,
+    STARTS_WITH_WORD_CHAR,
+)
+
+
+# A regex atom of the escaped words: an escaped character or a character.
+_ATOM_PATTERN = re.compile(r"\\.|.", re.DOTALL)
+
+# Marks the end of a word in the trie.
+_END = ""
+
+
+def _trie_to_regex(node: dict) -> str:
+    alternatives = [
+        atom + _trie_to_regex(child)
+        for atom, child in sorted(node.items())
+        if atom != _END
+    ]
+    if not alternatives:
+        return ""
+    optional = _END in node
+    if len(alternatives) == 1 and not optional:
+        return alternatives[0]
+    return "(?:" + "|".join(alternatives) + ")" + ("?" if optional else "")
+
+
+def compile_profanity_pattern(words: Iterable[str]) -> re.Pattern:
+    """
+    Compile profane words into a single case-insensitive regex.
+
+    Each word is bounded by ``\\b`` like in ``ProfanityFilter.censor``, and
+    the words are merged into a trie, so words sharing a prefix share its
+    branch. A search tries at most one branch per character of the longest
+    word at each position of the text, so it runs in linear time in the
+    length of the text whatever the number of words.
 
+    Args:
+        words: The profane words, escaped as by
+            ``ProfanityFilter.get_profane_words``.
 
-pf = ProfanityFilter()
+    Returns:
+        The compiled pattern.
+    """
+    trie: dict = {}
+    for word in words:
+        if not word:
+            continue
+        atoms = _ATOM_PATTERN.findall(word)
+        if STARTS_WITH_WORD_CHAR.search(word):
+            atoms.insert(0, r"\b")
+        if ENDS_WITH_WORD_CHAR.search(word):
+            atoms.append(r"\b")
+        node = trie
+        for atom in atoms:
+            node = node.setdefault(atom, {})
+        node[_END] = {}
+    return re.compile(_trie_to_regex(trie), re.IGNORECASE)
+
+
+profanity_pattern = compile_profanity_pattern(
+    ProfanityFilter().get_profane_words()
+)
+
+
+def contains_profanity(text: str) -> bool:
+    """
+    Return whether a text contains profanity.
+
+    Gives the same results as ``ProfanityFilter.is_profane`` with the
+    default word list, with one pass of a precompiled pattern instead of
+    one regex substitution per word.
+
+    Args:
+        text: The text to check.
+
+    Returns:
+        True if the text contains a profane word.
+    """
+    return profanity_pattern.search(text) is not None
 
 
 def validate_note(note: str) -> str:
@@ -12,7 +92,7 @@ def validate_note(note: str) -> str:
     Checks if the provided note text contains profanity using profanity_filter.
     If profanity is detected, an HTTPException is raised.
     """
-    if pf.is_profane(note):
+    if contains_profanity(note):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Note contains inappropriate language",
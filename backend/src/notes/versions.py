@@ -0,0 +1,317 @@
+import json
+import re
+from difflib import SequenceMatcher
+from typing import Iterable
+
+from sqlalchemy import exists, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from core.settings import settings
+from src.notes.models import NoteModel
+
+
+# Words with their trailing whitespace, or a run of leading whitespace.
+# Joining the tokens of a text always gives back the text.
+_TOKEN_PATTERN = re.compile(r"\S+\s*|\s+")
+
+
+def _tokenize(text: str) -> list[str]:
+    return _TOKEN_PATTERN.findall(text)
+
+
+def make_delta(base: str, target: str) -> str:
+    """
+    Encode a text as a delta against another text.
+
+    The delta is a JSON list of operations applied in order: ``[start,
+    end]`` copies tokens ``start:end`` of the base, a string is inserted
+    as is.
+
+    Args:
+        base: The text the delta is applied to.
+        target: The text the delta produces.
+
+    Returns:
+        The serialized delta.
+    """
+    base_tokens = _tokenize(base)
+    target_tokens = _tokenize(target)
+    operations = []
+    matcher = SequenceMatcher(None, base_tokens, target_tokens)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            operations.append([i1, i2])
+        elif j1 < j2:
+            operations.append("".join(target_tokens[j1:j2]))
+    return json.dumps(operations, separators=(",", ":"))
+
+
+def apply_delta(base: str, delta: str) -> str:
+    """
+    Rebuild a text from its base and a delta created by make_delta.
+
+    Args:
+        base: The text the delta was created against.
+        delta: The serialized delta.
+
+    Returns:
+        The reconstructed text.
+    """
+    base_tokens = _tokenize(base)
+    return "".join(
+        "".join(base_tokens[operation[0] : operation[1]])
+        if isinstance(operation, list)
+        else operation
+        for operation in json.loads(delta)
+    )
+
+
+def is_snapshot_version(version: int) -> bool:
+    """
+    Return whether a version of a chain always keeps its full text.
+
+    Every NOTE_SNAPSHOT_INTERVAL-th version is a snapshot, which bounds
+    the number of deltas applied to reconstruct any version.
+
+    Args:
+        version: The position of the version in its chain, 0 for the first.
+
+    Returns:
+        True if the version is a snapshot.
+    """
+    interval = settings.note_snapshot_interval
+    return interval <= 1 or version % interval == 0
+
+
+def compress_version(note: NoteModel, newer: NoteModel) -> bool:
+    """
+    Replace the full text of a version by a delta against a newer version.
+
+    Snapshots, versions that are already deltas, versions of another owner
+    and versions whose delta would not be smaller than their text are left
+    unchanged.
+
+    Args:
+        note: The version to compress, with its full text loaded.
+        newer: The flushed, full-text version following it in the chain.
+
+    Returns:
+        True if the version was compressed.
+    """
+    if (
+        note.text is None
+        or note.user_id != newer.user_id
+        or is_snapshot_version(note.version)
+    ):
+        return False
+
+    delta = make_delta(newer.text, note.text)
+    if len(delta) >= len(note.text):
+        return False
+
+    note.text = None
+    note.delta = delta
+    note.delta_base_id = newer.id
+    return True
+
+
+async def load_version_texts(
+    db: AsyncSession, note_ids: Iterable[int]
+) -> dict[int, str]:
+    """
+    Return the full texts of note versions, reconstructing deltas.
+
+    The bases of delta versions are loaded level by level with one query
+    per level, so at most NOTE_SNAPSHOT_INTERVAL queries are made however
+    many versions are requested.
+
+    Args:
+        db: The asynchronous database session.
+        note_ids: The IDs of the versions.
+
+    Returns:
+        Dictionary mapping the ID of each existing version to its text.
+    """
+    rows: dict[int, tuple] = {}
+    pending = set(note_ids)
+    while pending:
+        stmt = select(
+            NoteModel.id,
+            NoteModel.text,
+            NoteModel.delta,
+            NoteModel.delta_base_id,
+        ).where(NoteModel.id.in_(pending))
+        result = await db.execute(stmt)
+        pending = set()
+        for note_id, text, delta, delta_base_id in result.all():
+            rows[note_id] = (text, delta, delta_base_id)
+            if text is None and delta_base_id not in rows:
+                pending.add(delta_base_id)
+        pending -= rows.keys()
+
+    texts: dict[int, str] = {}
+    for note_id in rows:
+        unresolved = []
+        current_id = note_id
+        while current_id not in texts:
+            text, _, delta_base_id = rows[current_id]
+            if text is not None:
+                texts[current_id] = text
+                break
+            unresolved.append(current_id)
+            current_id = delta_base_id
+        for version_id in reversed(unresolved):
+            _, delta, delta_base_id = rows[version_id]
+            texts[version_id] = apply_delta(texts[delta_base_id], delta)
+    return texts
+
+
+async def load_note_texts(
+    db: AsyncSession, notes: Iterable[NoteModel]
+) -> None:
+    """
+    Fill in the text of loaded delta versions.
+
+    The texts are set as committed values, so they are not written back.
+
+    Args:
+        db: The asynchronous database session.
+        notes: Loaded notes, some of which may be delta versions.
+    """
+    missing = [note for note in notes if note.text is None]
+    if not missing:
+        return
+
+    texts = await load_version_texts(db, [note.id for note in missing])
+    for note in missing:
+        set_committed_value(note, "text", texts[note.id])
+
+
+async def expand_dependent_versions(db: AsyncSession, note_id: int) -> None:
+    """
+    Store the full text of the versions stored as deltas against a note.
+
+    Must run before the note is deleted.
+
+    Args:
+        db: The asynchronous database session.
+        note_id: The ID of the note about to be deleted.
+    """
+    result = await db.execute(
+        select(NoteModel).where(NoteModel.delta_base_id == note_id)
+    )
+    dependents = result.scalars().all()
+    if not dependents:
+        return
+
+    texts = await load_version_texts(db, [note.id for note in dependents])
+    for note in dependents:
+        note.text = texts[note.id]
+        note.delta = None
+        note.delta_base_id = None
+
+
+async def compress_user_versions(db: AsyncSession, user_id: int) -> int:
+    """
+    Number and compress the version chains of a user.
+
+    Backfills ``version`` for every note of the user and stores each
+    version that is not a snapshot as a delta against the version that
+    replaced it. Versions that already are deltas are left unchanged. The
+    caller is responsible for committing.
+
+    Args:
+        db: The asynchronous database session.
+        user_id: The ID of the user whose notes are compressed.
+
+    Returns:
+        The number of versions compressed.
+    """
+    result = await db.execute(
+        select(NoteModel)
+        .where(NoteModel.user_id == user_id)
+        .order_by(NoteModel.id)
+    )
+    notes = result.scalars().all()
+    await load_note_texts(db, notes)
+
+    by_id = {note.id: note for note in notes}
+    newer: dict[int, NoteModel] = {}
+    for note in notes:
+        previous = by_id.get(note.previous_version_id)
+        note.version = previous.version + 1 if previous is not None else 0
+        if previous is not None:
+            newer.setdefault(previous.id, note)
+
+    compressed = 0
+    for note in notes:
+        if note.delta_base_id is None and note.id in newer:
+            compressed += compress_version(note, newer[note.id])
+    return compressed
+
+
+async def expand_user_versions(db: AsyncSession, user_id: int) -> int:
+    """
+    Store the full text of every delta version of a user.
+
+    The caller is responsible for committing.
+
+    Args:
+        db: The asynchronous database session.
+        user_id: The ID of the user whose notes are expanded.
+
+    Returns:
+        The number of versions expanded.
+    """
+    result = await db.execute(
+        select(NoteModel).where(
+            NoteModel.user_id == user_id, NoteModel.delta_base_id.is_not(None)
+        )
+    )
+    notes = result.scalars().all()
+    texts = await load_version_texts(db, [note.id for note in notes])
+    for note in notes:
+        note.text = texts[note.id]
+        note.delta = None
+        note.delta_base_id = None
+    return len(notes)
+
+
+async def restore_previous_head(
+    db: AsyncSession, note: NoteModel
+) -> NoteModel | None:
+    """
+    Make the previous version of a deleted head the head of its chain.
+
+    Nothing changes if the previous version was replaced by another
+    version as well. Must run after expand_dependent_versions, so the new
+    head has its full text.
+
+    Args:
+        db: The asynchronous database session.
+        note: The head version about to be deleted.
+
+    Returns:
+        The new head, or None if the chain has no new head.
+    """
+    if note.previous_version_id is None:
+        return None
+
+    other_newer = await db.scalar(
+        select(
+            exists().where(
+                NoteModel.previous_version_id == note.previous_version_id,
+                NoteModel.id != note.id,
+            )
+        )
+    )
+    if other_newer:
+        return None
+
+    previous = await db.get(NoteModel, note.previous_version_id)
+    if previous is None:
+        return None
+    previous.is_head = True
+    await load_note_texts(db, [previous])
+    return previous
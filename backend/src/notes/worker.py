@@ -0,0 +1,126 @@
+"""
+Summary worker.
+
+Claims queued summarization jobs and stores the generated summaries.
+Any number of workers can run against the same database. The texts of a
+claimed batch are summarized with batch prompts of up to
+SUMMARY_BATCH_MAX_SIZE notes. With SUMMARY_WORKER_ENABLED the API process
+runs a worker as well.
+
+Usage:
+    python -m src.notes.worker [--once] [--fake] [--batch-size N]
+                               [--poll-interval SECONDS]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import socket
+
+from core.database import async_session
+from core.settings import settings
+from src.auth.models import UserModel  # noqa F401
+from src.notes.jobs import Summarizer, process_summary_jobs
+from summarization.batcher import SummaryBatcher
+from summarization.interfaces import SummarizerBackendInterface
+from summarization.service import create_summarizer_service
+
+
+logger = logging.getLogger(__name__)
+
+
+def create_batcher(backend: SummarizerBackendInterface) -> SummaryBatcher:
+    """
+    Create the batcher the worker summarizes through.
+
+    Args:
+        backend: The backend, usually a SummarizerService.
+
+    Returns:
+        The SummaryBatcher instance.
+    """
+    return SummaryBatcher(
+        backend,
+        max_batch_size=settings.summary_batch_max_size,
+        max_wait_seconds=settings.summary_batch_window_seconds,
+    )
+
+
+async def run_worker(
+    summarize: Summarizer,
+    batch_size: int,
+    poll_interval: float,
+    once: bool = False,
+) -> None:
+    """
+    Process summarization jobs until stopped.
+
+    Args:
+        summarize: The summarizer to call on cache misses.
+        batch_size: The maximum number of jobs claimed at a time.
+        poll_interval: Seconds to sleep when no job is due or processing
+            failed.
+        once: Exit as soon as no job is due instead of polling.
+    """
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    logger.info(f"Summary worker {worker_id} started")
+
+    while True:
+        try:
+            async with async_session() as db:
+                processed = await process_summary_jobs(
+                    db, summarize, worker_id, batch_size
+                )
+        except Exception as e:
+            logger.error(f"Failed to process summary jobs: {str(e)}")
+            processed = 0
+        if processed:
+            logger.info(f"Processed {processed} summary job(s)")
+            continue
+        if once:
+            return
+        await asyncio.sleep(poll_interval)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Note summary worker")
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Exit when no job is due instead of polling.",
+    )
+    parser.add_argument(
+        "--fake",
+        action="store_true",
+        help="Use the deterministic local summarizer instead of Gemini.",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.summary_batch_max_size
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=settings.summary_worker_poll_seconds,
+    )
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    service = create_summarizer_service(fake=args.fake)
+    batcher = create_batcher(service)
+    try:
+        asyncio.run(
+            run_worker(
+                batcher.summarize,
+                args.batch_size,
+                args.poll_interval,
+                args.once,
+            )
+        )
+    finally:
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, status
+
+from core.dependencies import get_current_principal
+from core.metrics import collect_metrics
+from security.principals import CurrentPrincipal
+
+
+router = APIRouter()
+
+
+@router.get(
+    "/metrics/",
+    status_code=status.HTTP_200_OK,
+    summary="Get Service Metrics",
+    description="Retrieve in-process counters of caches, pools and other "
+    "internal components of this worker.",
+    responses={
+        401: {
+            "description": "Unauthorized - Missing or invalid token.",
+            "content": {
+                "application/json": {
+                    "example": {"detail": "Authorization header is missing"}
+                }
+            },
+        },
+    },
+)
+async def get_metrics(
+    principal: CurrentPrincipal = Depends(get_current_principal),  # noqa F401
+) -> dict:
+    """
+    Retrieve the metrics of all registered components of this worker.
+
+    The counters describe the service's internals, so only authenticated
+    callers get them.
+
+    Args:
+        principal: The authenticated caller.
+
+    Returns:
+        Dictionary mapping component names to their counters.
+    """
+    return collect_metrics()
@@ -0,0 +1,113 @@
+import asyncio
+import json
+from concurrent.futures import Executor
+
+from google import generativeai as genai
+
+from summarization.interfaces import SummarizerBackendInterface
+from summarization.prompts import BATCH_PROMPT_HEADER, SINGLE_PROMPT_PREFIX
+
+
+class GeminiSummarizerBackend(SummarizerBackendInterface):
+    """
+    A summarization backend calling the Gemini API.
+
+    The model client is created once and reused for every request. The
+    blocking client calls run on the given executor, or on the event loop's
+    default executor if none is given.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str,
+        executor: Executor | None = None,
+    ) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            api_key: The Gemini API key.
+            model_name: The name of the Gemini model.
+            executor: The executor running the blocking client calls.
+        """
+        genai.configure(api_key=api_key)
+        self._model = genai.GenerativeModel(model_name)
+        self._executor = executor
+
+    async def complete(self, prompt: str) -> str:
+        """
+        Generate text for a prompt in a worker thread.
+
+        Args:
+            prompt: The prompt.
+
+        Returns:
+            The generated text.
+        """
+        loop = asyncio.get_running_loop()
+        response = await loop.run_in_executor(
+            self._executor, self._model.generate_content, prompt
+        )
+        return response.text
+
+
+def fake_summary(text: str) -> str:
+    """
+    Return the deterministic summary the fake backend generates for a text.
+
+    Args:
+        text: The note text.
+
+    Returns:
+        The first twelve words of the text, prefixed with "Summary:".
+    """
+    words = text.split()
+    summary = " ".join(words[:12])
+    if len(words) > 12:
+        summary += "..."
+    return f"Summary: {summary}"
+
+
+class FakeSummarizerBackend(SummarizerBackendInterface):
+    """
+    A deterministic local summarization backend.
+
+    Answers both single and batch prompts without network access, with an
+    optional simulated round-trip latency. Intended for local development,
+    tests and benchmarks.
+    """
+
+    def __init__(self, latency_seconds: float = 0.0) -> None:
+        """
+        Initialize the backend.
+
+        Args:
+            latency_seconds: Simulated latency of every round trip.
+        """
+        self._latency_seconds = latency_seconds
+        self.calls = 0
+
+    async def complete(self, prompt: str) -> str:
+        """
+        Generate the fake summaries for a prompt.
+
+        Args:
+            prompt: A prompt built by ``summarization.prompts``.
+
+        Returns:
+            The summary, or a JSON array of summaries for a batch prompt.
+        """
+        self.calls += 1
+        if self._latency_seconds:
+            await asyncio.sleep(self._latency_seconds)
+
+        if prompt.startswith(BATCH_PROMPT_HEADER):
+            notes = json.loads(prompt.removeprefix(BATCH_PROMPT_HEADER))
+            return json.dumps(
+                [
+                    {"id": note["id"], "summary": fake_summary(note["text"])}
+                    for note in notes
+                ]
+            )
+        return fake_summary(prompt.removeprefix(SINGLE_PROMPT_PREFIX))
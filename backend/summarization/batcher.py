@@ -0,0 +1,129 @@
+import asyncio
+import logging
+
+from summarization.exceptions import SummaryParseError
+from summarization.interfaces import SummarizerBackendInterface
+from summarization.prompts import (
+    build_batch_prompt,
+    build_prompt,
+    parse_batch_response,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class SummaryBatcher:
+    """
+    Coalesces concurrent summarization requests into batch prompts.
+
+    Texts submitted within ``max_wait_seconds`` of the first pending text,
+    up to ``max_batch_size`` of them, are sent to the backend as one
+    structured prompt, and every caller receives its own summary. If the
+    batched response cannot be parsed, the texts of that batch are
+    summarized one by one instead.
+    """
+
+    def __init__(
+        self,
+        backend: SummarizerBackendInterface,
+        max_batch_size: int,
+        max_wait_seconds: float,
+    ) -> None:
+        """
+        Initialize the batcher.
+
+        Args:
+            backend: The backend performing the model round trips.
+            max_batch_size: The maximum number of texts per prompt.
+            max_wait_seconds: How long the first text of a batch waits for
+                others to join it.
+        """
+        self._backend = backend
+        self._max_batch_size = max_batch_size
+        self._max_wait_seconds = max_wait_seconds
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.batches = 0
+        self.fallbacks = 0
+
+    async def summarize(self, text: str) -> str:
+        """
+        Summarize a text as part of the next batch.
+
+        Args:
+            text: The note text.
+
+        Returns:
+            The summary of the text.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(
+                self._max_wait_seconds, self._flush
+            )
+        return await future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        batch = self._pending[: self._max_batch_size]
+        self._pending = self._pending[self._max_batch_size :]
+        if self._pending:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self._max_wait_seconds, self._flush
+            )
+
+        task = asyncio.create_task(self._run_batch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(
+        self, batch: list[tuple[str, asyncio.Future]]
+    ) -> None:
+        texts = [text for text, _ in batch]
+        futures = [future for _, future in batch]
+        try:
+            summaries = await self._summarize_texts(texts)
+        except Exception as error:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for future, summary in zip(futures, summaries):
+            if future.done():
+                continue
+            if isinstance(summary, BaseException):
+                future.set_exception(summary)
+            else:
+                future.set_result(summary)
+
+    async def _summarize_texts(
+        self, texts: list[str]
+    ) -> list[str | BaseException]:
+        if len(texts) == 1:
+            return [await self._backend.complete(build_prompt(texts[0]))]
+
+        self.batches += 1
+        response = await self._backend.complete(build_batch_prompt(texts))
+        try:
+            return parse_batch_response(response, len(texts))
+        except SummaryParseError as error:
+            self.fallbacks += 1
+            logger.warning(
+                f"Falling back to per-note summaries for a batch of "
+                f"{len(texts)}: {error}"
+            )
+        return await asyncio.gather(
+            *(self._backend.complete(build_prompt(text)) for text in texts),
+            return_exceptions=True,
+        )
@@ -0,0 +1,5 @@
+class SummaryParseError(Exception):
+    """Raised when a batched summarization response cannot be parsed."""
+
+    def __init__(self, message="Could not parse the batched summaries."):
+        super().__init__(message)
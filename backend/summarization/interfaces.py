@@ -0,0 +1,15 @@
+from abc import ABC, abstractmethod
+
+
+class SummarizerBackendInterface(ABC):
+    """
+    Interface for a summarization backend.
+    Defines a single model round trip; prompts are built by the callers.
+    """
+
+    @abstractmethod
+    async def complete(self, prompt: str) -> str:
+        """
+        Send a prompt to the model and return the generated text.
+        """
+        pass
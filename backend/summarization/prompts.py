@@ -0,0 +1,86 @@
+import json
+import re
+
+from summarization.exceptions import SummaryParseError
+
+
+SINGLE_PROMPT_PREFIX = "Write short description for "
+
+BATCH_PROMPT_HEADER = (
+    "Write a short description for each note below. Respond with a JSON "
+    'array only, one object per note: {"id": <note id>, "summary": '
+    "<description>}. Keep the ids of the notes.\n"
+    "Notes:\n"
+)
+
+_CODE_FENCE_PATTERN = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def build_prompt(text: str) -> str:
+    """
+    Build the prompt summarizing a single note.
+
+    Args:
+        text: The note text.
+
+    Returns:
+        The prompt.
+    """
+    return f"{SINGLE_PROMPT_PREFIX}{text}"
+
+
+def build_batch_prompt(texts: list[str]) -> str:
+    """
+    Build one structured prompt summarizing several notes.
+
+    The notes are embedded as a JSON array of ``{"id", "text"}`` objects,
+    so texts cannot break the structure of the prompt.
+
+    Args:
+        texts: The note texts.
+
+    Returns:
+        The prompt.
+    """
+    notes = [{"id": index, "text": text} for index, text in enumerate(texts)]
+    return BATCH_PROMPT_HEADER + json.dumps(notes, ensure_ascii=False)
+
+
+def parse_batch_response(response: str, count: int) -> list[str]:
+    """
+    Split a batched response back into per-note summaries.
+
+    Args:
+        response: The text generated for a batch prompt.
+        count: The number of notes in the batch.
+
+    Returns:
+        The summaries, in the order of the notes in the prompt.
+
+    Raises:
+        SummaryParseError: If the response is not a JSON array holding
+            exactly one string summary for every note.
+    """
+    try:
+        items = json.loads(_CODE_FENCE_PATTERN.sub("", response.strip()))
+    except json.JSONDecodeError as exc:
+        raise SummaryParseError(f"Invalid JSON: {exc}") from exc
+
+    if not isinstance(items, list):
+        raise SummaryParseError("Expected a JSON array.")
+
+    summaries: dict[int, str] = {}
+    for item in items:
+        if not isinstance(item, dict):
+            raise SummaryParseError("Expected an object per note.")
+        note_id, summary = item.get("id"), item.get("summary")
+        if not isinstance(note_id, int) or not isinstance(summary, str):
+            raise SummaryParseError(f"Malformed item: {item!r}")
+        summaries[note_id] = summary
+
+    if sorted(summaries) != list(range(count)):
+        raise SummaryParseError(
+            f"Expected summaries for {count} notes, got ids "
+            f"{sorted(summaries)}."
+        )
+    return [summaries[index] for index in range(count)]
@@ -0,0 +1,152 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.executors import ExecutorSaturatedError
+from core.settings import settings
+from summarization.backends import (
+    FakeSummarizerBackend,
+    GeminiSummarizerBackend,
+)
+from summarization.interfaces import SummarizerBackendInterface
+
+
+class SummarizerService(SummarizerBackendInterface):
+    """
+    A bounded front for a summarization backend.
+
+    At most ``max_in_flight`` calls reach the backend at a time and at most
+    ``max_pending`` more wait for a slot; further calls are rejected right
+    away instead of piling up. The service owns the thread pool the backend
+    runs its blocking calls on and reports how long calls wait for a slot
+    and how long the backend takes.
+    """
+
+    def __init__(
+        self,
+        backend: SummarizerBackendInterface,
+        max_in_flight: int,
+        max_pending: int,
+        executor: ThreadPoolExecutor | None = None,
+    ) -> None:
+        """
+        Initialize the service.
+
+        Args:
+            backend: The backend performing the model round trips.
+            max_in_flight: The maximum number of concurrent backend calls.
+            max_pending: The maximum number of calls waiting for a slot.
+            executor: The thread pool of the backend, shut down with the
+                service.
+        """
+        self._backend = backend
+        self._max_pending = max_pending
+        self._executor = executor
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._in_flight = 0
+        self._waiting = 0
+        self.calls = 0
+        self.failures = 0
+        self.rejected = 0
+        self._queue_wait_seconds = 0.0
+        self._call_seconds = 0.0
+
+    async def complete(self, prompt: str) -> str:
+        """
+        Send a prompt to the backend once a slot is free.
+
+        Args:
+            prompt: The prompt.
+
+        Returns:
+            The generated text.
+
+        Raises:
+            ExecutorSaturatedError: If max_pending calls already wait for a
+                slot.
+        """
+        if self._semaphore.locked() and self._waiting >= self._max_pending:
+            self.rejected += 1
+            raise ExecutorSaturatedError("Summarizer queue is full.")
+
+        queued_at = time.perf_counter()
+        self._waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        started_at = time.perf_counter()
+        self._queue_wait_seconds += started_at - queued_at
+        self._in_flight += 1
+        try:
+            return await self._backend.complete(prompt)
+        except Exception:
+            self.failures += 1
+            raise
+        finally:
+            self._in_flight -= 1
+            self.calls += 1
+            self._call_seconds += time.perf_counter() - started_at
+            self._semaphore.release()
+
+    def shutdown(self) -> None:
+        """Stop the backend's thread pool."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        """
+        Return call counters and the time spent waiting and calling.
+
+        Returns:
+            Dictionary of service counters.
+        """
+        return {
+            "in_flight": self._in_flight,
+            "waiting": self._waiting,
+            "calls": self.calls,
+            "failures": self.failures,
+            "rejected": self.rejected,
+            "queue_wait_seconds_total": self._queue_wait_seconds,
+            "queue_wait_seconds_avg": (
+                self._queue_wait_seconds / self.calls if self.calls else 0.0
+            ),
+            "call_seconds_total": self._call_seconds,
+            "call_seconds_avg": (
+                self._call_seconds / self.calls if self.calls else 0.0
+            ),
+        }
+
+
+def create_summarizer_service(fake: bool = False) -> SummarizerService:
+    """
+    Create the summarizer service configured by the settings.
+
+    Args:
+        fake: Use the deterministic local backend instead of Gemini.
+
+    Returns:
+        The SummarizerService instance.
+    """
+    if fake:
+        return SummarizerService(
+            FakeSummarizerBackend(),
+            max_in_flight=settings.summary_max_in_flight,
+            max_pending=settings.summary_max_pending,
+        )
+
+    executor = ThreadPoolExecutor(
+        max_workers=settings.summary_max_in_flight,
+        thread_name_prefix="summarizer",
+    )
+    backend = GeminiSummarizerBackend(
+        settings.gemini_api_key, settings.summary_model, executor=executor
+    )
+    return SummarizerService(
+        backend,
+        max_in_flight=settings.summary_max_in_flight,
+        max_pending=settings.summary_max_pending,
+        executor=executor,
+    )
@@ -4,13 +4,18 @@ import pytest
 import httpx
 from httpx import AsyncClient
 from asgi_lifespan import LifespanManager
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from jose import jwt
 
 from core.database import BaseModel, get_db
+from core.dependencies import get_read_db
 from core.settings import settings
+from src.auth.user_cache import user_cache
 from src.main import app
+from src.notes.models import SummaryCacheModel, SummaryJobModel
+from src.notes.summary_cache import summary_cache
 
 
 TEST_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
@@ -79,8 +84,9 @@ async def client(db_session):
     """
     Provide an asynchronous HTTP client for testing the FastAPI app.
 
-    Overrides the app's database dependency with the test session
-    and manages the app's lifespan.
+    Overrides the app's database dependencies with the test session,
+    empties the summary and user caches and the job queue and manages the
+    app's lifespan.
 
     Args:
         db_session: The asynchronous database session fixture.
@@ -93,6 +99,13 @@ async def client(db_session):
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+
+    summary_cache.clear_memory()
+    user_cache.clear()
+    await db_session.execute(delete(SummaryCacheModel))
+    await db_session.execute(delete(SummaryJobModel))
+    await db_session.commit()
 
     async with LifespanManager(app):
         async with AsyncClient(
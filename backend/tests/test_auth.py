@@ -3,11 +3,23 @@ from datetime import datetime, timezone, timedelta
 import pytest
 from fastapi import status
 from httpx import AsyncClient
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core.executors import ExecutorSaturatedError
 from core.settings import settings
 from src.auth.models import UserModel, RefreshTokenModel
-from core.dependencies import get_jwt_auth_manager
+from src.auth.refresh_tokens import (
+    hash_refresh_token,
+    issue_refresh_token,
+    purge_expired_refresh_tokens,
+)
+from src.auth.user_cache import user_cache
+from core.dependencies import get_current_user, get_jwt_auth_manager
+from security.exceptions import TokenExpiredError
+from security.jwt_manager import JWTAuthManager
+from security.passwords import PasswordHasher
+from security.token_cache import CachedJWTAuthManager
 
 
 jwt_auth_manager = get_jwt_auth_manager()
@@ -124,7 +136,9 @@ async def test_refresh_token_success(
     """
     Test successful token refresh.
 
-    Verifies that a valid refresh token can be used to obtain a new access token.
+    Verifies that a valid refresh token can be used to obtain a new access
+    token, that it is rotated, and that the used token is rejected
+    afterwards.
 
     Args:
         client: The asynchronous HTTP client for making requests.
@@ -138,7 +152,7 @@ async def test_refresh_token_success(
     token = jwt_auth_manager.create_refresh_token({"user_id": user.id})
 
     refresh_token = RefreshTokenModel(
-        token=token,
+        token_hash=hash_refresh_token(token),
         user_id=user.id,
         expires_at=datetime.now(timezone.utc)
         + timedelta(days=settings.refresh_time_days),
@@ -152,6 +166,65 @@ async def test_refresh_token_success(
 
     assert response.status_code == status.HTTP_200_OK
     assert "access_token" in response.json()
+    new_token = response.json()["refresh_token"]
+    assert new_token != token
+
+    response = await client.post(
+        "/auth/refresh/", json={"refresh_token": token}
+    )
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    response = await client.post(
+        "/auth/refresh/", json={"refresh_token": new_token}
+    )
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+async def test_refresh_tokens_are_capped_and_purged(db_session: AsyncSession):
+    """
+    Test the per-user cap and the purge of refresh tokens.
+
+    Verifies that only the newest REFRESH_TOKENS_PER_USER tokens of a user
+    are kept, that only digests are stored, and that expired tokens are
+    purged in batches.
+
+    Args:
+        db_session: The asynchronous database session for database operations.
+    """
+    user = UserModel(email="capped@example.com", password="StrongPass123!")
+    db_session.add(user)
+    await db_session.commit()
+
+    tokens = [
+        await issue_refresh_token(db_session, jwt_auth_manager, user.id)
+        for _ in range(settings.refresh_tokens_per_user + 2)
+    ]
+    await db_session.commit()
+
+    result = await db_session.execute(
+        select(RefreshTokenModel.token_hash).where(
+            RefreshTokenModel.user_id == user.id
+        )
+    )
+    stored = set(result.scalars().all())
+    assert len(stored) == settings.refresh_tokens_per_user
+    assert hash_refresh_token(tokens[-1]) in stored
+    assert tokens[-1] not in stored
+
+    await db_session.execute(
+        update(RefreshTokenModel)
+        .where(RefreshTokenModel.user_id == user.id)
+        .values(expires_at=datetime.now(timezone.utc) - timedelta(days=1))
+    )
+    await db_session.commit()
+
+    purged = await purge_expired_refresh_tokens(db_session, batch_size=2)
+    assert purged >= settings.refresh_tokens_per_user
+    result = await db_session.execute(
+        select(RefreshTokenModel).where(RefreshTokenModel.user_id == user.id)
+    )
+    assert result.scalars().all() == []
 
 
 @pytest.mark.asyncio
@@ -173,3 +246,177 @@ async def test_refresh_token_invalid(
 
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert "detail" in response.json()
+
+
+@pytest.mark.asyncio
+async def test_login_user_password_hasher_saturated(
+    client: AsyncClient, db_session: AsyncSession, mocker
+):
+    """
+    Test login while the password hashing pool is saturated.
+
+    Verifies that a login is rejected with a service unavailable error
+    instead of queuing behind other bcrypt calls, whether or not the email
+    is registered.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+        mocker: The pytest-mock fixture for mocking dependencies.
+    """
+    user = UserModel(email="busy-login@example.com", password="StrongPass123!")
+    db_session.add(user)
+    await db_session.commit()
+
+    mocker.patch.object(
+        PasswordHasher, "verify", side_effect=ExecutorSaturatedError
+    )
+
+    payload = {"email": "busy-login@example.com", "password": "StrongPass123!"}
+    response = await client.post("/auth/login/", json=payload)
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    payload = {"email": "unknown-login@example.com", "password": "Pass123!"}
+    response = await client.post("/auth/login/", json=payload)
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+
+@pytest.mark.asyncio
+async def test_current_user_is_cached_until_modified(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """
+    Test the authenticated-user cache.
+
+    Verifies that repeated requests reuse the cached user, and that updating
+    or deleting the user invalidates the entry.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+    """
+    user = UserModel(
+        email="cached-user@example.com", password="StrongPass123!"
+    )
+    db_session.add(user)
+    await db_session.commit()
+
+    token = jwt_auth_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {token}"}
+    stats_before = user_cache.stats()
+
+    for _ in range(3):
+        response = await client.get("/notes/", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+    stats = user_cache.stats()
+    assert stats["hits"] - stats_before["hits"] == 2
+    assert stats["misses"] - stats_before["misses"] == 1
+
+    user.email = "renamed-user@example.com"
+    await db_session.commit()
+    await client.get("/notes/", headers=headers)
+    assert user_cache.stats()["misses"] - stats_before["misses"] == 2
+
+    await db_session.delete(user)
+    await db_session.commit()
+    response = await client.get("/notes/", headers=headers)
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+@pytest.mark.asyncio
+async def test_current_user_lookup_releases_connection(
+    db_session: AsyncSession,
+):
+    """
+    Test that looking up the current user does not keep a connection.
+
+    Verifies that the read session ends its transaction after a user cache
+    miss, so write routes do not hold a second connection.
+
+    Args:
+        db_session: The asynchronous database session for database operations.
+    """
+    user = UserModel(email="released@example.com", password="StrongPass123!")
+    db_session.add(user)
+    await db_session.commit()
+    user_cache.invalidate(user.id)
+
+    token = jwt_auth_manager.create_access_token({"user_id": user.id})
+    current_user = await get_current_user(token, jwt_auth_manager, db_session)
+
+    assert current_user.id == user.id
+    assert not db_session.in_transaction()
+
+
+@pytest.mark.asyncio
+async def test_stateless_principal_skips_user_lookup(
+    client: AsyncClient, db_session: AsyncSession, mocker
+):
+    """
+    Test the stateless principal mode.
+
+    Verifies that opted-in endpoints authenticate from the token claims
+    without loading the user, and that tokens of a deleted user are
+    rejected through the deny-list.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+        mocker: The pytest-mock fixture for mocking dependencies.
+    """
+    user = UserModel(email="stateless@example.com", password="StrongPass123!")
+    db_session.add(user)
+    await db_session.commit()
+
+    mocker.patch.object(settings, "auth_stateless_principal", True)
+    user_lookup = mocker.spy(user_cache, "get")
+    token = jwt_auth_manager.create_access_token(
+        {"user_id": user.id, "email": user.email}
+    )
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.get("/notes/", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+    user_lookup.assert_not_called()
+
+    await db_session.delete(user)
+    await db_session.commit()
+    response = await client.get("/notes/", headers=headers)
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert response.json()["detail"] == "Token has been revoked."
+
+
+def test_cached_jwt_manager_verifies_token_once(mocker):
+    """
+    Test the verified-token cache of the JWT manager.
+
+    Verifies that a valid access token is parsed and verified only once,
+    and that expired tokens are never served from the cache.
+
+    Args:
+        mocker: The pytest-mock fixture for mocking dependencies.
+    """
+    manager = JWTAuthManager(
+        secret_key_access=settings.secret_key_access,
+        secret_key_refresh=settings.secret_key_refresh,
+        algorithm=settings.jwt_signing_algorithm,
+    )
+    decode_spy = mocker.spy(manager, "decode_access_token")
+    cached_manager = CachedJWTAuthManager(manager, max_entries=10)
+
+    token = cached_manager.create_access_token({"user_id": 1})
+    payloads = [cached_manager.decode_access_token(token) for _ in range(3)]
+
+    assert all(payload["user_id"] == 1 for payload in payloads)
+    assert decode_spy.call_count == 1
+
+    expired_token = cached_manager.create_access_token(
+        {"user_id": 1}, expires_delta=timedelta(seconds=-1)
+    )
+    for _ in range(2):
+        with pytest.raises(TokenExpiredError):
+            cached_manager.decode_access_token(expired_token)
+    assert decode_spy.call_count == 3
@@ -0,0 +1,217 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from core.cache import TTLCache
+from core.cache_backends import (
+    CacheBackendError,
+    MemoryCacheBackend,
+    RespCacheBackend,
+    encode_command,
+    read_reply,
+)
+from core.database import InstrumentedQueuePool, _create_engine
+
+
+def test_ttl_cache_evicts_least_recently_used():
+    """
+    Test LRU eviction by entry count and by size.
+
+    Verifies that the least recently used entry is evicted first and that
+    the byte limit is enforced.
+    """
+    cache = TTLCache(max_entries=2, ttl_seconds=60, max_bytes=10)
+    cache.set("a", "1234")
+    cache.set("b", "1234")
+    assert cache.get("a") == "1234"
+
+    cache.set("c", "1234")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1234"
+
+    cache.set("d", "12345678")
+    assert len(cache) == 1
+    assert cache.get("d") == "12345678"
+    assert cache.stats()["evictions"] == 3
+
+
+def test_ttl_cache_expires_entries(mocker):
+    """
+    Test that entries expire after their time to live.
+
+    Args:
+        mocker: The pytest-mock fixture for mocking dependencies.
+    """
+    now = time.monotonic()
+    monotonic = mocker.patch("core.cache.time.monotonic", return_value=now)
+    cache = TTLCache(max_entries=10, ttl_seconds=5)
+    cache.set("key", "value")
+
+    monotonic.return_value = now + 4
+    assert cache.get("key") == "value"
+
+    monotonic.return_value = now + 6
+    assert cache.get("key") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+async def test_query_timer_forgets_failed_statements():
+    """
+    Test the slow query timer on statements that fail.
+
+    Verifies that the start time of a failed statement is dropped, so
+    pooled connections do not accumulate them.
+    """
+    engine = _create_engine("sqlite+aiosqlite://")
+    try:
+        async with engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    await conn.execute(text("SELECT * FROM missing_table"))
+            await conn.execute(text("SELECT 1"))
+            info = (await conn.get_raw_connection()).info
+            assert info["query_started_at"] == []
+    finally:
+        await engine.dispose()
+
+
+async def test_instrumented_pool_reports_checkouts():
+    """
+    Test the statistics of the instrumented connection pool.
+
+    Verifies that checked out connections and checkouts are counted and
+    that the reported overflow never goes negative.
+    """
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+    )
+    try:
+        async with engine.connect() as first:
+            async with engine.connect() as second:
+                await first.execute(text("SELECT 1"))
+                await second.execute(text("SELECT 1"))
+                stats = engine.pool.stats()
+                assert stats["checked_out"] == 2
+                assert stats["overflow"] == 1
+
+        stats = engine.pool.stats()
+        assert stats["checked_out"] == 0
+        assert stats["checkouts"] == 2
+        assert stats["wait_seconds_max"] >= 0.0
+    finally:
+        await engine.dispose()
+
+
+class FakeRespServer:
+    """
+    A local server answering the GET, SET and DEL commands of the Redis
+    protocol, standing in for Redis in tests.
+    """
+
+    def __init__(self) -> None:
+        self.entries: dict[bytes, tuple[bytes, float]] = {}
+        self.commands: list[bytes] = []
+        self._server = None
+
+    async def start(self) -> str:
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"redis://127.0.0.1:{port}/0"
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    def _get(self, key: bytes) -> bytes | None:
+        value, expires_at = self.entries.get(key, (None, 0.0))
+        return value if expires_at > time.monotonic() else None
+
+    def _execute(self, name: bytes, *arguments: bytes) -> bytes:
+        if name == b"SELECT":
+            return b"+OK\r\n"
+        if name == b"GET":
+            value = self._get(arguments[0])
+            if value is None:
+                return b"$-1\r\n"
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        if name == b"SET":
+            key, value, _, milliseconds, *options = arguments
+            if b"NX" in options and self._get(key) is not None:
+                return b"$-1\r\n"
+            expires_at = time.monotonic() + int(milliseconds) / 1000
+            self.entries[key] = (value, expires_at)
+            return b"+OK\r\n"
+        if name == b"DEL":
+            deleted = [self.entries.pop(key, None) for key in arguments]
+            return b":%d\r\n" % sum(entry is not None for entry in deleted)
+        return b"-ERR unknown command\r\n"
+
+    async def _serve(self, reader, writer) -> None:
+        try:
+            while True:
+                name, *arguments = await read_reply(reader)
+                self.commands.append(name)
+                writer.write(self._execute(name, *arguments))
+                await writer.drain()
+        except (CacheBackendError, ConnectionError):
+            writer.close()
+
+
+@pytest.mark.parametrize("backend_name", ["memory", "resp"])
+async def test_cache_backends_store_entries(backend_name: str):
+    """
+    Test the in-memory and the Redis-protocol cache backends.
+
+    Both backends run the same commands, the latter against a local fake
+    server: entries expire, only_new keeps existing entries and deleted
+    entries are gone.
+
+    Args:
+        backend_name: The backend to test.
+    """
+    server = FakeRespServer()
+    if backend_name == "resp":
+        backend = RespCacheBackend(await server.start(), max_connections=2)
+    else:
+        backend = MemoryCacheBackend(TTLCache(max_entries=10, ttl_seconds=0))
+
+    assert await backend.get("key") is None
+    assert await backend.set("key", b"value", ttl_seconds=60)
+    assert not await backend.set("key", b"other", 60, only_new=True)
+    assert await backend.get("key") == b"value"
+    assert await backend.set("short", b"value", ttl_seconds=0.05)
+    await asyncio.sleep(0.1)
+    assert await backend.get("short") is None
+    await backend.delete("key", "missing")
+    assert await backend.get("key") is None
+    await backend.close()
+
+    if backend_name == "resp":
+        assert server.commands[0] == b"SELECT"
+        assert backend.stats()["errors"] == 0
+        await server.stop()
+
+
+async def test_resp_cache_backend_reports_unavailable_server():
+    """
+    Test that a missing server raises CacheBackendError and is counted.
+    """
+    server = FakeRespServer()
+    url = await server.start()
+    await server.stop()
+
+    backend = RespCacheBackend(url, max_connections=1)
+    with pytest.raises(CacheBackendError):
+        await backend.get("key")
+    assert backend.stats()["errors"] == 1
+    assert encode_command("GET", b"key") == (
+        b"*2\r\n$3\r\nGET\r\n$3\r\nkey\r\n"
+    )
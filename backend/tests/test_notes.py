@@ -1,14 +1,44 @@
 import asyncio
+import csv
+import io
+import json
+import time
+from datetime import datetime, timezone
 
 import pytest
+from nltk import word_tokenize
+from profanityfilter import ProfanityFilter
 from httpx import AsyncClient
 from fastapi import status
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
 
-from src.notes import routes
+from core.database import BaseModel, recent_writers
+from src.main import app
+from src.notes import routes, worker
 from src.auth.models import UserModel, NoteModel
+from src.notes.analytics import rebuild_user_analytics
+from src.notes.analytics_cache import AnalyticsCache, analytics_cache
+from src.notes.jobs import process_summary_jobs
+from src.notes.models import SummaryJobModel, SummaryJobStatus, SummaryStatus
+from src.notes.summary_cache import summary_cache
+from src.notes.tokenizer import tokenize, tokenize_note
+from src.notes.validators import contains_profanity
+from src.notes.versions import (
+    apply_delta,
+    compress_user_versions,
+    load_version_texts,
+    make_delta,
+)
 from unittest.mock import AsyncMock
-from core.dependencies import get_jwt_auth_manager
+from core.dependencies import get_jwt_auth_manager, get_read_db
+from core.settings import settings
+from core.cache import TTLCache
+from core.cache_backends import MemoryCacheBackend
+from core.executors import BoundedProcessExecutor, ExecutorSaturatedError
+from summarization.backends import FakeSummarizerBackend, fake_summary
+from summarization.batcher import SummaryBatcher
 
 
 jwt_auth_manager = get_jwt_auth_manager()
@@ -16,7 +46,7 @@ jwt_auth_manager = get_jwt_auth_manager()
 
 @pytest.mark.asyncio
 async def test_get_notes_success(
-    client: AsyncClient, db_session: AsyncSession, mocker, token
+    client: AsyncClient, db_session: AsyncSession, mocker
 ):
     """
     Test successful retrieval of all notes.
@@ -27,11 +57,11 @@ async def test_get_notes_success(
         client: The asynchronous HTTP client for making requests.
         db_session: The asynchronous database session for database operations.
         mocker: The pytest-mock fixture for mocking dependencies.
-        token: The JWT token fixture for authentication.
     """
     user = UserModel(email="notes@example.com", password="StrongPass123!")
     db_session.add(user)
     await db_session.commit()
+    token = jwt_auth_manager.create_access_token({"user_id": user.id})
 
     note = NoteModel(text="Test note", user_id=user.id, summary="Summary")
     db_session.add(note)
@@ -42,36 +72,33 @@ async def test_get_notes_success(
     response = await client.get("/notes/", headers=headers)
 
     assert response.status_code == status.HTTP_200_OK
-    assert len(response.json()) == 1
-    assert response.json()[0]["text"] == "Test note"
+    assert len(response.json()["items"]) == 1
+    assert response.json()["items"][0]["text"] == "Test note"
 
 
 @pytest.mark.asyncio
 async def test_create_note_success(
-    client: AsyncClient, db_session: AsyncSession, mocker, token
+    client: AsyncClient, db_session: AsyncSession, mocker
 ):
     """
     Test successful creation of a note.
 
-    Verifies that an authenticated user can create a note with a generated summary.
+    Verifies that an authenticated user can create a note, that the note is
+    stored with a pending summary and that a worker fills the summary in.
 
     Args:
         client: The asynchronous HTTP client for making requests.
         db_session: The asynchronous database session for database operations.
         mocker: The pytest-mock fixture for mocking dependencies.
-        token: The JWT token fixture for authentication.
     """
     user = UserModel(email="create@example.com", password="StrongPass123!")
     db_session.add(user)
     await db_session.commit()
+    await db_session.refresh(user)
+    token = jwt_auth_manager.create_access_token({"user_id": user.id})
 
     mocker.patch("core.dependencies.get_current_user", return_value=user)
-    mocker.patch.object(
-        routes,
-        "summarize_note",
-        new_callable=AsyncMock,
-        return_value="Summary",
-    )
+    summarize_mock = AsyncMock(return_value="Summary")
 
     payload = {"text": "New note"}
     headers = {"Authorization": f"Bearer {token}"}
@@ -79,42 +106,105 @@ async def test_create_note_success(
 
     assert response.status_code == status.HTTP_201_CREATED
     assert response.json()["text"] == "New note"
+    assert response.json()["summary"] is None
+    assert response.json()["summary_status"] == SummaryStatus.PENDING
+    summarize_mock.assert_not_awaited()
+
+    processed = await process_summary_jobs(
+        db_session, summarize_mock, "test-worker", batch_size=10
+    )
+    assert processed == 1
+
+    note_id = response.json()["id"]
+    response = await client.get(f"/notes/{note_id}/", headers=headers)
     assert response.json()["summary"] == "Summary"
+    assert response.json()["summary_status"] == SummaryStatus.COMPLETED
 
 
 @pytest.mark.asyncio
-async def test_create_note_timeout(
-    client: AsyncClient, db_session: AsyncSession, mocker, token
+async def test_summary_job_retries_with_backoff(
+    client: AsyncClient, db_session: AsyncSession, mocker
 ):
     """
-    Test note creation with a summarization timeout.
+    Test retries of a failing summarization job.
 
-    Verifies that a timeout during summarization returns a gateway timeout error.
+    Verifies that a summarizer timeout reschedules the job with backoff
+    instead of failing the write, and that the note is marked failed once
+    the job runs out of attempts.
 
     Args:
         client: The asynchronous HTTP client for making requests.
         db_session: The asynchronous database session for database operations.
         mocker: The pytest-mock fixture for mocking dependencies.
-        token: The JWT token fixture for authentication.
     """
     user = UserModel(email="timeout@example.com", password="StrongPass123!")
     db_session.add(user)
     await db_session.commit()
 
-    mocker.patch("core.dependencies.get_current_user", return_value=user)
-    mocker.patch.object(
-        routes,
-        "summarize_note",
-        new_callable=AsyncMock,
-        side_effect=asyncio.TimeoutError,
+    mocker.patch.object(settings, "summary_job_max_attempts", 2)
+    summarize_mock = AsyncMock(side_effect=asyncio.TimeoutError)
+    token = jwt_auth_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.post(
+        "/notes/", json={"text": "Slow note"}, headers=headers
     )
+    assert response.status_code == status.HTTP_201_CREATED
+    note_id = response.json()["id"]
 
-    payload = {"text": "New note"}
-    headers = {"Authorization": f"Bearer {token}"}
-    response = await client.post("/notes/", json=payload, headers=headers)
+    await process_summary_jobs(db_session, summarize_mock, "test-worker", 10)
+    job = await db_session.scalar(
+        select(SummaryJobModel).where(SummaryJobModel.note_id == note_id)
+    )
+    assert job.status == SummaryJobStatus.QUEUED
+    assert job.attempts == 1
+    assert "TimeoutError" in job.last_error
+
+    # The retry is not due until the backoff has elapsed.
+    assert (
+        await process_summary_jobs(
+            db_session, summarize_mock, "test-worker", 10
+        )
+        == 0
+    )
+
+    job.run_after = datetime.now(timezone.utc)
+    await db_session.commit()
+    await process_summary_jobs(db_session, summarize_mock, "test-worker", 10)
+    await db_session.refresh(job)
 
-    assert response.status_code == status.HTTP_504_GATEWAY_TIMEOUT
-    assert response.json()["detail"] == "Summarization took too long"
+    assert job.status == SummaryJobStatus.FAILED
+    assert summarize_mock.await_count == 2
+    response = await client.get(f"/notes/{note_id}/", headers=headers)
+    assert response.json()["summary_status"] == SummaryStatus.FAILED
+
+
+@pytest.mark.asyncio
+async def test_summary_worker_survives_failed_iterations(mocker):
+    """
+    Test that the summary worker keeps polling after an error.
+
+    Verifies that an exception while processing jobs is logged and the
+    worker backs off and tries again instead of exiting.
+
+    Args:
+        mocker: The pytest-mock fixture for mocking dependencies.
+    """
+    process_mock = mocker.patch(
+        "src.notes.worker.process_summary_jobs",
+        side_effect=[
+            RuntimeError("Database is down"),
+            1,
+            asyncio.CancelledError(),
+        ],
+    )
+    error_mock = mocker.patch.object(worker.logger, "error")
+
+    with pytest.raises(asyncio.CancelledError):
+        await worker.run_worker(AsyncMock(), batch_size=10, poll_interval=0)
+
+    assert process_mock.call_count == 3
+    assert "Database is down" in error_mock.call_args.args[0]
 
 
 @pytest.mark.asyncio
@@ -178,34 +268,30 @@ async def test_get_note_not_found(
 
 @pytest.mark.asyncio
 async def test_update_note_success(
-    client: AsyncClient, db_session: AsyncSession, mocker, token
+    client: AsyncClient, db_session: AsyncSession, mocker
 ):
     """
     Test successful update of a note.
 
-    Verifies that an authenticated user can update a note with new text and summary.
+    Verifies that an authenticated user can update a note with new text and
+    that the summary of the new version is queued.
 
     Args:
         client: The asynchronous HTTP client for making requests.
         db_session: The asynchronous database session for database operations.
         mocker: The pytest-mock fixture for mocking dependencies.
-        token: The JWT token fixture for authentication.
     """
     user = UserModel(email="update@example.com", password="StrongPass123!")
     db_session.add(user)
     await db_session.commit()
+    await db_session.refresh(user)
+    token = jwt_auth_manager.create_access_token({"user_id": user.id})
 
     note = NoteModel(text="Old note", user_id=user.id, summary="Old summary")
     db_session.add(note)
     await db_session.commit()
 
     mocker.patch("core.dependencies.get_current_user", return_value=user)
-    mocker.patch.object(
-        routes,
-        "summarize_note",
-        new_callable=AsyncMock,
-        return_value="New summary",
-    )
 
     payload = {"text": "Updated note"}
     headers = {"Authorization": f"Bearer {token}"}
@@ -215,7 +301,15 @@ async def test_update_note_success(
 
     assert response.status_code == status.HTTP_200_OK
     assert response.json()["text"] == "Updated note"
-    assert response.json()["summary"] == "New summary"
+    assert response.json()["summary"] is None
+    assert response.json()["summary_status"] == SummaryStatus.PENDING
+
+    jobs = await db_session.scalars(
+        select(SummaryJobModel).where(
+            SummaryJobModel.note_id == response.json()["id"]
+        )
+    )
+    assert len(jobs.all()) == 1
 
 
 @pytest.mark.asyncio
@@ -290,6 +384,95 @@ async def test_delete_note_not_owner(
     )
 
 
+@pytest.mark.asyncio
+async def test_update_note_not_owner(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """
+    Test update of a note by a non-owner.
+
+    Verifies that the update is rejected with a not found error and that
+    the owner's note stays the latest version in their listing and
+    analytics.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+    """
+    owner = UserModel(
+        email="update-owner@example.com", password="StrongPass123!"
+    )
+    other = UserModel(
+        email="update-other@example.com", password="StrongPass123!"
+    )
+    db_session.add_all([owner, other])
+    await db_session.commit()
+
+    owner_token = jwt_auth_manager.create_access_token({"user_id": owner.id})
+    owner_headers = {"Authorization": f"Bearer {owner_token}"}
+    response = await client.post(
+        "/notes/", json={"text": "Owner note text"}, headers=owner_headers
+    )
+    note_id = response.json()["id"]
+
+    other_token = jwt_auth_manager.create_access_token({"user_id": other.id})
+    response = await client.patch(
+        f"/notes/{note_id}/",
+        json={"text": "Hijacked text"},
+        headers={"Authorization": f"Bearer {other_token}"},
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    response = await client.get("/notes/", headers=owner_headers)
+    assert [note["id"] for note in response.json()["items"]] == [note_id]
+    response = await client.get("/notes/analytics/", headers=owner_headers)
+    assert response.json()["total_word_count"] == 3
+    versions = await db_session.scalars(
+        select(NoteModel).where(NoteModel.previous_version_id == note_id)
+    )
+    assert versions.all() == []
+
+
+@pytest.mark.asyncio
+async def test_update_note_not_head(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """
+    Test update of a version that was already replaced.
+
+    Verifies that updating an older version is rejected with a conflict
+    error, so the chain keeps a single head.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+    """
+    user = UserModel(
+        email="update-head@example.com", password="StrongPass123!"
+    )
+    db_session.add(user)
+    await db_session.commit()
+
+    token = jwt_auth_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.post(
+        "/notes/", json={"text": "First draft"}, headers=headers
+    )
+    first_id = response.json()["id"]
+    response = await client.patch(
+        f"/notes/{first_id}/", json={"text": "Second draft"}, headers=headers
+    )
+    second_id = response.json()["id"]
+
+    response = await client.patch(
+        f"/notes/{first_id}/", json={"text": "Forked draft"}, headers=headers
+    )
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    response = await client.get("/notes/", headers=headers)
+    assert [note["id"] for note in response.json()["items"]] == [second_id]
+
+
 @pytest.mark.asyncio
 async def test_get_notes_analytics_success(
     client: AsyncClient, db_session: AsyncSession, mocker
@@ -324,3 +507,1160 @@ async def test_get_notes_analytics_success(
 
     assert response.status_code == status.HTTP_200_OK
     assert response.json()["total_word_count"] == 7
+
+
+@pytest.mark.asyncio
+async def test_get_notes_analytics_tracks_note_writes(
+    client: AsyncClient, db_session: AsyncSession, mocker
+):
+    """
+    Test that note writes update the analytics aggregate incrementally.
+
+    Verifies that notes created and deleted after the aggregate was built
+    are reflected in the analytics without a full rebuild.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+        mocker: The pytest-mock fixture for mocking dependencies.
+    """
+    user = UserModel(
+        email="incremental@example.com", password="StrongPass123!"
+    )
+    db_session.add(user)
+    await db_session.commit()
+    await db_session.refresh(user)
+
+    rebuild_spy = mocker.spy(routes, "rebuild_user_analytics")
+    token = jwt_auth_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    await client.post(
+        "/notes/", json={"text": "apple banana apple"}, headers=headers
+    )
+    response = await client.get("/notes/analytics/", headers=headers)
+    assert response.json()["total_word_count"] == 3
+    assert rebuild_spy.call_count == 1
+
+    response = await client.post(
+        "/notes/", json={"text": "apple cherry"}, headers=headers
+    )
+    second_note_id = response.json()["id"]
+    response = await client.get("/notes/analytics/", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["total_word_count"] == 5
+    assert response.json()["average_note_length"] == 2.5
+    assert response.json()["most_common_words"][0] == ["apple", 3]
+    assert response.json()["top_3_shortest_notes"][0]["id"] == second_note_id
+
+    await client.delete(f"/notes/{second_note_id}/", headers=headers)
+    response = await client.get("/notes/analytics/", headers=headers)
+
+    assert response.json()["total_word_count"] == 3
+    assert response.json()["most_common_words"][0] == ["apple", 2]
+    assert rebuild_spy.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_get_notes_analytics_ranks_notes_added_after_deletes(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """
+    Test ranking a new note once deletes shrank the candidate lists.
+
+    Verifies that a note added while notes outside the candidate lists
+    exist does not take the place of those notes in the top notes.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+    """
+    user = UserModel(email="candidates@example.com", password="StrongPass123!")
+    db_session.add(user)
+    await db_session.commit()
+    await db_session.refresh(user)
+
+    token = jwt_auth_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    note_ids = {}
+    for word_count in range(1, 21):
+        response = await client.post(
+            "/notes/", json={"text": "word " * word_count}, headers=headers
+        )
+        note_ids[word_count] = response.json()["id"]
+    response = await client.get("/notes/analytics/", headers=headers)
+    assert response.status_code == status.HTTP_200_OK
+
+    await client.delete(f"/notes/{note_ids[20]}/", headers=headers)
+    await client.post("/notes/", json={"text": "word"}, headers=headers)
+    for word_count in range(19, 12, -1):
+        await client.delete(f"/notes/{note_ids[word_count]}/", headers=headers)
+    response = await client.get("/notes/analytics/", headers=headers)
+
+    assert [
+        note["word_count"] for note in response.json()["top_3_longest_notes"]
+    ] == [12, 11, 10]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_user_analytics_recovers_from_drift(
+    db_session: AsyncSession,
+):
+    """
+    Test rebuilding an analytics aggregate that drifted from the notes.
+
+    Verifies that notes written without going through the note routes are
+    picked up by a rebuild.
+
+    Args:
+        db_session: The asynchronous database session for database operations.
+    """
+    user = UserModel(email="drift@example.com", password="StrongPass123!")
+    db_session.add(user)
+    await db_session.commit()
+    await db_session.refresh(user)
+
+    db_session.add(NoteModel(text="One two", user_id=user.id))
+    await db_session.commit()
+    aggregate = await rebuild_user_analytics(db_session, user.id)
+    await db_session.commit()
+    assert aggregate.total_word_count == 2
+
+    db_session.add(NoteModel(text="Three four five", user_id=user.id))
+    await db_session.commit()
+    aggregate = await rebuild_user_analytics(db_session, user.id)
+    await db_session.commit()
+
+    assert aggregate.note_count == 2
+    assert aggregate.total_word_count == 5
+    assert aggregate.longest_candidates[0][1] == 3
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "This is a test note",
+        "I cannot go, gonna stay; wanna come?",
+        "Numbers like 1,000 and 2,b stay intact,",
+        "Wow!! Really?!",
+        "Mr. Smith said \"hello\" (twice) and it's 3.5 o'clock...",
+        "Ünïcödé tëxt, with accents!",
+        "",
+    ],
+)
+def test_tokenize_matches_word_tokenize(text: str):
+    """
+    Test that the analytics tokenizer matches NLTK's word_tokenize.
+
+    Covers both texts eligible for the fast path and texts that are
+    delegated to NLTK.
+
+    Args:
+        text: The text to tokenize.
+    """
+    assert tokenize(text) == word_tokenize(text)
+
+    tokens = word_tokenize(text)
+    assert tokenize_note(text) == (
+        len(tokens),
+        [token.lower() for token in tokens if token.isalpha()],
+    )
+
+
+def test_tokenize_fast_path_skips_nltk(mocker):
+    """
+    Test that plain ASCII text does not go through NLTK.
+
+    Args:
+        mocker: The pytest-mock fixture for mocking dependencies.
+    """
+    word_tokenize_mock = mocker.patch("src.notes.tokenizer.word_tokenize")
+
+    assert tokenize("Gimme two notes, please") == [
+        "Gim",
+        "me",
+        "two",
+        "notes",
+        ",",
+        "please",
+    ]
+    word_tokenize_mock.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "A perfectly clean note",
+        "Hello from Scunthorpe, the class passes the assessment",
+        "What the hell",
+        "Damn, DAMNS and Damned",
+        "Crappy but not crap-free",
+        "He is a s.o.b. indeed",
+        "sob. stories",
+        "x@$$y",
+        "shi+ happens",
+        "",
+    ],
+)
+def test_contains_profanity_matches_profanity_filter(text: str):
+    """
+    Test that the compiled matcher agrees with ProfanityFilter.is_profane.
+
+    Covers word boundaries, plurals, case and words with escaped
+    characters.
+
+    Args:
+        text: The text to check.
+    """
+    assert contains_profanity(text) == ProfanityFilter().is_profane(text)
+
+
+@pytest.mark.asyncio
+async def test_analytics_executor_rejects_when_saturated():
+    """
+    Test that the analytics executor bounds its pending tasks.
+
+    Verifies that a task beyond max_pending is rejected and that a task
+    exceeding the timeout raises a timeout error.
+    """
+    executor = BoundedProcessExecutor(
+        max_workers=1, max_pending=1, timeout=0.2
+    )
+    executor.start()
+    try:
+        slow_task = asyncio.create_task(executor.run(time.sleep, 1))
+        await asyncio.sleep(0)
+
+        with pytest.raises(ExecutorSaturatedError):
+            await executor.run(time.sleep, 0)
+        with pytest.raises(asyncio.TimeoutError):
+            await slow_task
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_get_notes_analytics_executor_saturated(
+    client: AsyncClient, db_session: AsyncSession, mocker
+):
+    """
+    Test analytics when the analytics process pool is saturated.
+
+    Verifies that a rebuild rejected by the executor returns
+    a service unavailable error.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+        mocker: The pytest-mock fixture for mocking dependencies.
+    """
+    user = UserModel(email="saturated@example.com", password="StrongPass123!")
+    db_session.add(user)
+    await db_session.commit()
+    await db_session.refresh(user)
+
+    db_session.add(NoteModel(text="Busy note", user_id=user.id))
+    await db_session.commit()
+
+    mocker.patch.object(
+        BoundedProcessExecutor, "run", side_effect=ExecutorSaturatedError
+    )
+    token = jwt_auth_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.get("/notes/analytics/", headers=headers)
+
+    assert response.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert (
+        response.json()["detail"]
+        == "Analytics service is busy, try again later"
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_notes_paginates_own_notes(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """
+    Test keyset pagination of the notes listing.
+
+    Verifies that only the current user's notes are listed and that
+    following next_cursor walks through all of them exactly once.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+    """
+    owner = UserModel(email="pages@example.com", password="StrongPass123!")
+    other = UserModel(email="others@example.com", password="StrongPass123!")
+    db_session.add_all([owner, other])
+    await db_session.commit()
+
+    db_session.add_all(
+        [NoteModel(text=f"Note {i}", user_id=owner.id) for i in range(5)]
+        + [NoteModel(text="Foreign note", user_id=other.id)]
+    )
+    await db_session.commit()
+
+    token = jwt_auth_manager.create_access_token({"user_id": owner.id})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    texts = []
+    params = {"limit": 2}
+    while True:
+        response = await client.get("/notes/", params=params, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        page = response.json()
+        assert len(page["items"]) <= 2
+        texts.extend(note["text"] for note in page["items"])
+        if page["next_cursor"] is None:
+            break
+        params["after_id"] = page["next_cursor"]
+
+    assert texts == [f"Note {i}" for i in range(5)]
+
+    response = await client.get(
+        "/notes/", params={"limit": 1000}, headers=headers
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_export_notes_streams_ndjson_and_csv(
+    client: AsyncClient, db_session: AsyncSession, mocker
+):
+    """
+    Test the streaming notes export.
+
+    Verifies that the export contains only the current user's notes in both
+    NDJSON and CSV formats and spans multiple cursor batches.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+        mocker: The pytest-mock fixture for mocking dependencies.
+    """
+    user = UserModel(email="export@example.com", password="StrongPass123!")
+    other = UserModel(email="noexport@example.com", password="StrongPass123!")
+    db_session.add_all([user, other])
+    await db_session.commit()
+    user_id = user.id
+
+    db_session.add_all(
+        [NoteModel(text=f"Export {i}", user_id=user_id) for i in range(5)]
+        + [NoteModel(text="Hidden", user_id=other.id)]
+    )
+    await db_session.commit()
+
+    mocker.patch("src.notes.export.EXPORT_BATCH_SIZE", 2)
+    token = jwt_auth_manager.create_access_token({"user_id": user_id})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    response = await client.get("/notes/export/", headers=headers)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["text"] for row in rows] == [f"Export {i}" for i in range(5)]
+    assert {row["user_id"] for row in rows} == {user_id}
+
+    response = await client.get(
+        "/notes/export/", params={"format": "csv"}, headers=headers
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["text"] for row in rows] == [f"Export {i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_create_note_reuses_cached_summary(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """
+    Test that identical note texts are summarized only once.
+
+    Verifies that once a worker summarized a text, new notes with the same
+    text get their summary from the in-process tier and, after it is
+    cleared, from the database tier, without queuing another job.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+    """
+    user = UserModel(email="cached@example.com", password="StrongPass123!")
+    db_session.add(user)
+    await db_session.commit()
+
+    summarize_mock = AsyncMock(return_value="Cached summary")
+    token = jwt_auth_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {token}"}
+    stats_before = summary_cache.stats()
+
+    await client.post("/notes/", json={"text": "Same text"}, headers=headers)
+    await process_summary_jobs(db_session, summarize_mock, "test-worker", 10)
+
+    response = await client.post(
+        "/notes/", json={"text": "  Same   text "}, headers=headers
+    )
+    assert response.json()["summary"] == "Cached summary"
+    assert response.json()["summary_status"] == SummaryStatus.COMPLETED
+
+    summary_cache.clear_memory()
+    response = await client.post(
+        "/notes/", json={"text": "Same text"}, headers=headers
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["summary"] == "Cached summary"
+    assert (
+        await process_summary_jobs(
+            db_session, summarize_mock, "test-worker", 10
+        )
+        == 0
+    )
+    summarize_mock.assert_awaited_once()
+
+    response = await client.get("/system/metrics/")
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    response = await client.get("/system/metrics/", headers=headers)
+    stats = response.json()["summary_cache"]
+    assert stats["memory_hits"] - stats_before["memory_hits"] == 1
+    assert stats["database_hits"] - stats_before["database_hits"] == 1
+    assert stats["misses"] - stats_before["misses"] == 1
+
+
+@pytest.mark.asyncio
+async def test_summary_jobs_share_batch_prompt(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """
+    Test that the jobs of a claimed batch are summarized together.
+
+    Verifies that pending notes are served by a single batch prompt and
+    that duplicate texts are summarized once.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+    """
+    user = UserModel(email="batched@example.com", password="StrongPass123!")
+    db_session.add(user)
+    await db_session.commit()
+
+    token = jwt_auth_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {token}"}
+    texts = ["Batched one", "Batched two", "Batched three", "Batched one"]
+    for text in texts:
+        await client.post("/notes/", json={"text": text}, headers=headers)
+
+    backend = FakeSummarizerBackend()
+    batcher = SummaryBatcher(backend, max_batch_size=8, max_wait_seconds=0.01)
+    processed = await process_summary_jobs(
+        db_session, batcher.summarize, "test-worker", batch_size=10
+    )
+
+    assert processed == 4
+    assert backend.calls == 1
+    response = await client.get("/notes/", headers=headers)
+    assert [note["summary"] for note in response.json()["items"]] == [
+        fake_summary(text) for text in texts
+    ]
+
+
+@pytest.mark.asyncio
+async def test_reads_use_replica_after_write_window(
+    client: AsyncClient, db_session: AsyncSession, async_engine, mocker
+):
+    """
+    Test routing of reads between the primary and a replica.
+
+    The replica is a second, lagging SQLite database that only knows the
+    user. Verifies that a user's reads go to the primary right after their
+    write and to the replica once the read-your-writes window is over.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+        async_engine: The engine of the primary test database.
+        mocker: The pytest-mock fixture for mocking dependencies.
+    """
+    user = UserModel(email="replica@example.com", password="StrongPass123!")
+    db_session.add(user)
+    await db_session.commit()
+
+    replica_engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with replica_engine.begin() as conn:
+        await conn.run_sync(BaseModel.metadata.create_all)
+    replica_session = sessionmaker(
+        replica_engine, class_=AsyncSession, expire_on_commit=False
+    )
+    async with replica_session() as replica_db:
+        replica_user = UserModel.create(user.email, user.hashed_password)
+        replica_user.id = user.id
+        replica_db.add(replica_user)
+        await replica_db.commit()
+
+    mocker.patch(
+        "core.database.async_session",
+        sessionmaker(
+            async_engine, class_=AsyncSession, expire_on_commit=False
+        ),
+    )
+    mocker.patch("core.database.replica_session", replica_session)
+    mocker.patch.dict(app.dependency_overrides)
+    del app.dependency_overrides[get_read_db]
+
+    token = jwt_auth_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {token}"}
+    try:
+        response = await client.post(
+            "/notes/", json={"text": "Fresh note"}, headers=headers
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+        note_id = response.json()["id"]
+        assert recent_writers.get(user.id) is not None
+
+        response = await client.get("/notes/", headers=headers)
+        assert [note["text"] for note in response.json()["items"]] == [
+            "Fresh note"
+        ]
+        response = await client.get(f"/notes/{note_id}/", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+
+        recent_writers.clear()
+        response = await client.get("/notes/", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["items"] == []
+        response = await client.get(f"/notes/{note_id}/", headers=headers)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+    finally:
+        await replica_engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_get_note_history_paginates_chain(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """
+    Test listing the version history of a note.
+
+    Verifies that the chain is returned newest first, that following
+    next_cursor walks it exactly once and that other users cannot read it.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+    """
+    owner = UserModel(email="history@example.com", password="StrongPass123!")
+    other = UserModel(
+        email="history-other@example.com", password="StrongPass123!"
+    )
+    db_session.add_all([owner, other])
+    await db_session.commit()
+
+    previous_version_id = None
+    for i in range(5):
+        note = NoteModel(
+            text=f"Version {i}",
+            user_id=owner.id,
+            previous_version_id=previous_version_id,
+        )
+        db_session.add(note)
+        await db_session.flush()
+        previous_version_id = note.id
+    await db_session.commit()
+
+    token = jwt_auth_manager.create_access_token({"user_id": owner.id})
+    headers = {"Authorization": f"Bearer {token}"}
+
+    texts = []
+    params = {"limit": 2}
+    while True:
+        response = await client.get(
+            f"/notes/{note.id}/history/", params=params, headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        page = response.json()
+        assert len(page["items"]) <= 2
+        texts.extend(version["text"] for version in page["items"])
+        if page["next_cursor"] is None:
+            break
+        params["before_id"] = page["next_cursor"]
+
+    assert texts == [f"Version {i}" for i in reversed(range(5))]
+
+    token = jwt_auth_manager.create_access_token({"user_id": other.id})
+    response = await client.get(
+        f"/notes/{note.id}/history/",
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.parametrize(
+    "base, target",
+    [
+        ("", "New text"),
+        ("Old text", ""),
+        ("  Leading space and trailing  ", "Leading  space, trailing\n"),
+        ("one two three four five", "one two 3 four five six"),
+    ],
+)
+def test_apply_delta_restores_target(base: str, target: str):
+    """
+    Test that applying a delta to its base gives back the target text.
+
+    Args:
+        base: The text the delta is created against.
+        target: The text the delta encodes.
+    """
+    assert apply_delta(base, make_delta(base, target)) == target
+
+
+@pytest.mark.asyncio
+async def test_note_versions_are_stored_as_deltas(
+    client: AsyncClient, db_session: AsyncSession, mocker
+):
+    """
+    Test delta storage of old note versions.
+
+    Verifies that replaced versions other than snapshots are stored as
+    deltas, that reading them reconstructs the original text and that
+    deleting a delta base keeps dependent versions readable.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+        mocker: The pytest-mock fixture for mocking dependencies.
+    """
+    mocker.patch.object(settings, "note_snapshot_interval", 3)
+    user = UserModel(email="deltas@example.com", password="StrongPass123!")
+    db_session.add(user)
+    await db_session.commit()
+
+    token = jwt_auth_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {token}"}
+    body = " ".join(f"word{i}" for i in range(200))
+    texts = [f"{body} edit {i}" for i in range(6)]
+
+    response = await client.post(
+        "/notes/", json={"text": texts[0]}, headers=headers
+    )
+    note_ids = [response.json()["id"]]
+    for text in texts[1:]:
+        response = await client.patch(
+            f"/notes/{note_ids[-1]}/", json={"text": text}, headers=headers
+        )
+        assert response.status_code == status.HTTP_200_OK
+        note_ids.append(response.json()["id"])
+
+    result = await db_session.execute(
+        select(NoteModel.id, NoteModel.version, NoteModel.text).where(
+            NoteModel.id.in_(note_ids)
+        )
+    )
+    stored = {note_id: (version, text) for note_id, version, text in result}
+    assert [stored[note_id][0] for note_id in note_ids] == list(range(6))
+    assert [stored[note_id][1] is None for note_id in note_ids] == [
+        False,
+        True,
+        True,
+        False,
+        True,
+        False,
+    ]
+
+    for note_id, text in zip(note_ids, texts):
+        response = await client.get(f"/notes/{note_id}/", headers=headers)
+        assert response.json()["text"] == text
+    response = await client.get(
+        f"/notes/{note_ids[-1]}/history/", headers=headers
+    )
+    assert [version["text"] for version in response.json()["items"]] == (
+        texts[::-1]
+    )
+
+    response = await client.delete(f"/notes/{note_ids[2]}/", headers=headers)
+    assert response.status_code == status.HTTP_204_NO_CONTENT
+    response = await client.get(f"/notes/{note_ids[1]}/", headers=headers)
+    assert response.json()["text"] == texts[1]
+
+
+@pytest.mark.asyncio
+async def test_compress_user_versions_backfills_chains(
+    db_session: AsyncSession, mocker
+):
+    """
+    Test compressing existing version chains.
+
+    Verifies that versions are numbered, that non-snapshot versions are
+    compressed once and that their texts are reconstructed unchanged.
+
+    Args:
+        db_session: The asynchronous database session for database operations.
+        mocker: The pytest-mock fixture for mocking dependencies.
+    """
+    mocker.patch.object(settings, "note_snapshot_interval", 4)
+    user = UserModel(email="backfill@example.com", password="StrongPass123!")
+    db_session.add(user)
+    await db_session.commit()
+
+    body = " ".join(f"word{i}" for i in range(100))
+    notes = []
+    for i in range(8):
+        note = NoteModel(
+            text=f"{body} {i}",
+            user_id=user.id,
+            previous_version_id=notes[-1].id if notes else None,
+        )
+        db_session.add(note)
+        await db_session.flush()
+        notes.append(note)
+    await db_session.commit()
+
+    assert await compress_user_versions(db_session, user.id) == 5
+    await db_session.commit()
+    assert [note.version for note in notes] == list(range(8))
+    assert await compress_user_versions(db_session, user.id) == 0
+
+    texts = await load_version_texts(db_session, [note.id for note in notes])
+    assert [texts[note.id] for note in notes] == [
+        f"{body} {i}" for i in range(8)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_listing_and_analytics_only_count_head_versions(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """
+    Test that only the latest version of a note is listed and analyzed.
+
+    Verifies that updating a note replaces it in the listing and in the
+    analytics, and that deleting the latest version restores the previous
+    one.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+    """
+    user = UserModel(email="heads@example.com", password="StrongPass123!")
+    db_session.add(user)
+    await db_session.commit()
+
+    token = jwt_auth_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.post(
+        "/notes/", json={"text": "first draft"}, headers=headers
+    )
+    first_id = response.json()["id"]
+    await client.post("/notes/", json={"text": "other note"}, headers=headers)
+    response = await client.get("/notes/analytics/", headers=headers)
+    assert response.json()["total_word_count"] == 4
+
+    response = await client.patch(
+        f"/notes/{first_id}/",
+        json={"text": "final text here"},
+        headers=headers,
+    )
+    second_id = response.json()["id"]
+
+    response = await client.get("/notes/", headers=headers)
+    assert [note["text"] for note in response.json()["items"]] == [
+        "other note",
+        "final text here",
+    ]
+    response = await client.get("/notes/analytics/", headers=headers)
+    assert response.json()["total_word_count"] == 5
+    assert response.json()["average_note_length"] == 2.5
+
+    await client.delete(f"/notes/{second_id}/", headers=headers)
+    response = await client.get("/notes/", headers=headers)
+    assert [note["id"] for note in response.json()["items"]][0] == first_id
+    response = await client.get("/notes/analytics/", headers=headers)
+    assert response.json()["total_word_count"] == 4
+
+
+@pytest.mark.asyncio
+async def test_search_notes_ranks_and_paginates(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """
+    Test full-text search over notes.
+
+    Verifies that only the user's latest versions match, that better
+    matches come first, that following next_cursor returns every match
+    once and that empty queries and invalid cursors are rejected.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+    """
+    owner = UserModel(email="search@example.com", password="StrongPass123!")
+    other = UserModel(
+        email="search-other@example.com", password="StrongPass123!"
+    )
+    db_session.add_all([owner, other])
+    await db_session.commit()
+
+    token = jwt_auth_manager.create_access_token({"user_id": owner.id})
+    headers = {"Authorization": f"Bearer {token}"}
+    texts = [
+        "Walrus walrus walrus on the beach",
+        "A walrus in the zoo",
+        "Penguins only",
+        "Another walrus note",
+    ]
+    note_ids = []
+    for text in texts:
+        response = await client.post(
+            "/notes/", json={"text": text}, headers=headers
+        )
+        note_ids.append(response.json()["id"])
+    await client.patch(
+        f"/notes/{note_ids[3]}/",
+        json={"text": "Edited without the animal"},
+        headers=headers,
+    )
+    db_session.add(NoteModel(text="Foreign walrus", user_id=other.id))
+    await db_session.commit()
+
+    response = await client.get(
+        "/notes/search/", params={"q": "walrus"}, headers=headers
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert [note["id"] for note in response.json()["items"]] == [
+        note_ids[0],
+        note_ids[1],
+    ]
+
+    ids = []
+    params = {"q": "walrus", "limit": 1}
+    while True:
+        response = await client.get(
+            "/notes/search/", params=params, headers=headers
+        )
+        page = response.json()
+        ids.extend(note["id"] for note in page["items"])
+        if page["next_cursor"] is None:
+            break
+        params["cursor"] = page["next_cursor"]
+    assert ids == [note_ids[0], note_ids[1]]
+
+    response = await client.get(
+        "/notes/search/", params={"q": "  "}, headers=headers
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    response = await client.get(
+        "/notes/search/",
+        params={"q": "walrus", "cursor": "abc"},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_create_notes_bulk(
+    client: AsyncClient, db_session: AsyncSession
+):
+    """
+    Test creating many notes in one request.
+
+    Verifies that the notes are created in request order, that cached
+    summaries are reused, that the other notes are queued for the summary
+    workers and that the analytics include the new notes.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+    """
+    user = UserModel(email="bulk@example.com", password="StrongPass123!")
+    db_session.add(user)
+    await db_session.commit()
+
+    token = jwt_auth_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {token}"}
+    await client.post("/notes/", json={"text": "Known text"}, headers=headers)
+    await client.get("/notes/analytics/", headers=headers)
+    summarize_mock = AsyncMock(return_value="Known summary")
+    await process_summary_jobs(db_session, summarize_mock, "test-worker", 10)
+
+    texts = ["Bulk one", "Known text", "Bulk three"]
+    response = await client.post(
+        "/notes/bulk/",
+        json={"notes": [{"text": text} for text in texts]},
+        headers=headers,
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    items = response.json()["items"]
+    assert [note["text"] for note in items] == texts
+    assert [note["summary_status"] for note in items] == [
+        SummaryStatus.PENDING,
+        SummaryStatus.COMPLETED,
+        SummaryStatus.PENDING,
+    ]
+    assert items[1]["summary"] == "Known summary"
+
+    jobs = await db_session.scalars(
+        select(SummaryJobModel.note_id).where(
+            SummaryJobModel.note_id.in_([note["id"] for note in items])
+        )
+    )
+    assert sorted(jobs.all()) == [items[0]["id"], items[2]["id"]]
+
+    response = await client.get("/notes/analytics/", headers=headers)
+    assert response.json()["total_word_count"] == 8
+
+    response = await client.post(
+        "/notes/bulk/", json={"notes": []}, headers=headers
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_delete_notes_bulk_keeps_chains_intact(
+    client: AsyncClient, db_session: AsyncSession, mocker
+):
+    """
+    Test deleting many notes at once.
+
+    Verifies that the versions kept are relinked to their nearest kept
+    predecessor, that delta versions stay readable, that the predecessor
+    of a deleted head becomes the head and that whole chains are deleted.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+        mocker: The pytest-mock fixture for mocking dependencies.
+    """
+    mocker.patch.object(settings, "note_snapshot_interval", 100)
+    user = UserModel(
+        email="bulk-delete@example.com", password="StrongPass123!"
+    )
+    other = UserModel(
+        email="bulk-delete-other@example.com", password="StrongPass123!"
+    )
+    db_session.add_all([user, other])
+    await db_session.commit()
+
+    token = jwt_auth_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {token}"}
+    body = " ".join(f"word{i}" for i in range(50))
+    texts = [f"{body} version {i}" for i in range(6)]
+    response = await client.post(
+        "/notes/", json={"text": texts[0]}, headers=headers
+    )
+    ids = [response.json()["id"]]
+    for text in texts[1:]:
+        response = await client.patch(
+            f"/notes/{ids[-1]}/", json={"text": text}, headers=headers
+        )
+        ids.append(response.json()["id"])
+
+    response = await client.request(
+        "DELETE",
+        "/notes/bulk/",
+        json={"ids": [ids[2], ids[3]]},
+        headers=headers,
+    )
+    assert response.json() == {"deleted": 2}
+    response = await client.get(f"/notes/{ids[5]}/history/", headers=headers)
+    assert [note["text"] for note in response.json()["items"]] == [
+        texts[5],
+        texts[4],
+        texts[1],
+        texts[0],
+    ]
+
+    response = await client.request(
+        "DELETE",
+        "/notes/bulk/",
+        json={"ids": [ids[4], ids[5]]},
+        headers=headers,
+    )
+    assert response.json() == {"deleted": 2}
+    response = await client.get("/notes/", headers=headers)
+    assert [note["text"] for note in response.json()["items"]] == [texts[1]]
+
+    response = await client.post(
+        "/notes/", json={"text": "Other chain"}, headers=headers
+    )
+    other_chain_id = response.json()["id"]
+    response = await client.request(
+        "DELETE", "/notes/bulk/", json={"chain_id": ids[0]}, headers=headers
+    )
+    assert response.json() == {"deleted": 2}
+    response = await client.get("/notes/", headers=headers)
+    assert [note["id"] for note in response.json()["items"]] == [
+        other_chain_id
+    ]
+
+    token = jwt_auth_manager.create_access_token({"user_id": other.id})
+    response = await client.request(
+        "DELETE",
+        "/notes/bulk/",
+        json={"ids": [other_chain_id]},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+    response = await client.request(
+        "DELETE",
+        "/notes/bulk/",
+        json={"ids": [other_chain_id], "chain_id": other_chain_id},
+        headers=headers,
+    )
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
+@pytest.mark.asyncio
+async def test_note_reads_return_not_modified_for_current_etag(
+    client: AsyncClient, db_session: AsyncSession, mocker
+):
+    """
+    Test conditional GETs of the notes, a note and the analytics.
+
+    Verifies that a current ETag in If-None-Match gets an empty 304 before
+    notes are loaded or analytics rendered, and that note writes, bulk
+    writes and summaries change the ETags.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+        mocker: The pytest-mock fixture for mocking dependencies.
+    """
+    user = UserModel(email="etag@example.com", password="StrongPass123!")
+    db_session.add(user)
+    await db_session.commit()
+
+    token = jwt_auth_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {token}"}
+    response = await client.post(
+        "/notes/", json={"text": "A note to poll"}, headers=headers
+    )
+    note_id = response.json()["id"]
+
+    etags = {}
+    for path in ("/notes/", f"/notes/{note_id}/", "/notes/analytics/"):
+        response = await client.get(path, headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["Cache-Control"] == "private, no-cache"
+        etags[path] = response.headers["ETag"]
+
+    load_note_texts_spy = mocker.spy(routes, "load_note_texts")
+    render_analytics_spy = mocker.spy(routes, "render_analytics")
+    for path, etag in etags.items():
+        response = await client.get(
+            path, headers={**headers, "If-None-Match": f"W/{etag}"}
+        )
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+        assert response.content == b""
+    load_note_texts_spy.assert_not_called()
+    render_analytics_spy.assert_not_called()
+
+    summarize_mock = AsyncMock(return_value="Summary of the note")
+    await process_summary_jobs(db_session, summarize_mock, "test-worker", 10)
+    response = await client.get(
+        f"/notes/{note_id}/",
+        headers={**headers, "If-None-Match": etags[f"/notes/{note_id}/"]},
+    )
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["summary"] == "Summary of the note"
+
+    etag = response.headers["ETag"]
+    await client.post(
+        "/notes/bulk/", json={"notes": [{"text": "Imported"}]}, headers=headers
+    )
+    for path in etags:
+        response = await client.get(
+            path, headers={**headers, "If-None-Match": etag}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+async def test_analytics_cache_computes_concurrent_misses_once():
+    """
+    Test the stampede protection of the analytics cache.
+
+    Two caches sharing a backend stand in for two workers. Concurrent
+    misses for the same version are computed once, a new version is a
+    miss and a failed computation is raised to its waiters uncached.
+    """
+    backend = MemoryCacheBackend(TTLCache(max_entries=10, ttl_seconds=0))
+    workers = [
+        AnalyticsCache(
+            backend, ttl_seconds=60, lock_seconds=5, poll_seconds=0.01
+        )
+        for _ in range(2)
+    ]
+    computed = []
+
+    async def compute() -> dict:
+        computed.append(True)
+        await asyncio.sleep(0.05)
+        return {"total_word_count": len(computed)}
+
+    results = await asyncio.gather(
+        *(workers[i % 2].get_or_compute(1, 7, compute) for i in range(10))
+    )
+    assert results == [{"total_word_count": 1}] * 10
+    assert len(computed) == 1
+    assert workers[1].stats()["coalesced"] == 5
+
+    assert await workers[0].get_or_compute(1, 8, compute) == {
+        "total_word_count": 2
+    }
+
+    async def fail() -> dict:
+        await asyncio.sleep(0.01)
+        raise ValueError("No notes")
+
+    results = await asyncio.gather(
+        *(workers[0].get_or_compute(1, 9, fail) for _ in range(3)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, ValueError) for result in results)
+    assert await backend.get("notes:analytics:1:lock") is None
+
+
+@pytest.mark.asyncio
+async def test_get_notes_analytics_is_cached_until_a_write(
+    client: AsyncClient, db_session: AsyncSession, mocker
+):
+    """
+    Test that analytics are served from the cache until the user writes.
+
+    Args:
+        client: The asynchronous HTTP client for making requests.
+        db_session: The asynchronous database session for database operations.
+        mocker: The pytest-mock fixture for mocking dependencies.
+    """
+    user = UserModel(
+        email="analytics-cache@example.com", password="StrongPass123!"
+    )
+    db_session.add(user)
+    await db_session.commit()
+
+    token = jwt_auth_manager.create_access_token({"user_id": user.id})
+    headers = {"Authorization": f"Bearer {token}"}
+    await client.post("/notes/", json={"text": "One two"}, headers=headers)
+
+    render_analytics_spy = mocker.spy(routes, "render_analytics")
+    invalidate_spy = mocker.spy(analytics_cache, "invalidate")
+    first = await client.get("/notes/analytics/", headers=headers)
+    second = await client.get("/notes/analytics/", headers=headers)
+    assert second.json() == first.json()
+    assert render_analytics_spy.call_count == 1
+
+    await client.post(
+        "/notes/", json={"text": "Three four five"}, headers=headers
+    )
+    invalidate_spy.assert_awaited_once_with(user.id)
+    response = await client.get("/notes/analytics/", headers=headers)
+    assert response.json()["total_word_count"] == 5
+    assert render_analytics_spy.call_count == 2
@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from core.executors import ExecutorSaturatedError
+from summarization.backends import FakeSummarizerBackend, fake_summary
+from summarization.batcher import SummaryBatcher
+from summarization.exceptions import SummaryParseError
+from summarization.prompts import (
+    BATCH_PROMPT_HEADER,
+    build_batch_prompt,
+    build_prompt,
+    parse_batch_response,
+)
+from summarization.service import SummarizerService
+
+
+class UnparsableBatchBackend(FakeSummarizerBackend):
+    """A fake backend answering batch prompts with free text."""
+
+    async def complete(self, prompt: str) -> str:
+        if prompt.startswith(BATCH_PROMPT_HEADER):
+            self.calls += 1
+            return "Here are your summaries!"
+        return await super().complete(prompt)
+
+
+@pytest.mark.asyncio
+async def test_batcher_coalesces_concurrent_texts():
+    """
+    Test that concurrent texts share batch prompts.
+
+    Verifies that texts submitted together are split into prompts of at
+    most max_batch_size texts and that every caller gets its own summary.
+    """
+    backend = FakeSummarizerBackend()
+    batcher = SummaryBatcher(backend, max_batch_size=4, max_wait_seconds=0.01)
+    texts = [f"note number {i}" for i in range(10)]
+
+    summaries = await asyncio.gather(*map(batcher.summarize, texts))
+
+    assert summaries == [fake_summary(text) for text in texts]
+    assert backend.calls == 3
+    assert batcher.batches == 3
+
+
+@pytest.mark.asyncio
+async def test_batcher_falls_back_on_parse_failure():
+    """
+    Test the per-note fallback of the batcher.
+
+    Verifies that an unparsable batch response is retried as one prompt per
+    text.
+    """
+    backend = UnparsableBatchBackend()
+    batcher = SummaryBatcher(backend, max_batch_size=8, max_wait_seconds=0.01)
+    texts = ["first note", "second note", "third note"]
+
+    summaries = await asyncio.gather(*map(batcher.summarize, texts))
+
+    assert summaries == [fake_summary(text) for text in texts]
+    assert backend.calls == 4
+    assert batcher.fallbacks == 1
+
+
+def test_parse_batch_response_validates_ids():
+    """
+    Test parsing of batched responses.
+
+    Verifies that code fences are accepted, summaries are reordered by id
+    and responses missing a note are rejected.
+    """
+    response = (
+        '```json\n[{"id": 1, "summary": "b"}, {"id": 0, "summary": "a"}]\n```'
+    )
+    assert parse_batch_response(response, 2) == ["a", "b"]
+
+    with pytest.raises(SummaryParseError):
+        parse_batch_response('[{"id": 0, "summary": "a"}]', 2)
+
+
+@pytest.mark.asyncio
+async def test_fake_backend_answers_batch_prompts():
+    """
+    Test that the fake backend answers structured batch prompts.
+
+    Verifies that texts containing quotes and newlines survive the round
+    trip through the prompt.
+    """
+    texts = ['a "quoted"\nnote', "Notes:\n[]"]
+    backend = FakeSummarizerBackend()
+
+    response = await backend.complete(build_batch_prompt(texts))
+
+    assert parse_batch_response(response, 2) == list(map(fake_summary, texts))
+
+
+@pytest.mark.asyncio
+async def test_summarizer_service_rejects_when_saturated():
+    """
+    Test the concurrency limit of the summarizer service.
+
+    Verifies that calls beyond max_in_flight wait for a slot, that calls
+    beyond max_pending are rejected right away, and that waiting and call
+    times are reported separately.
+    """
+    service = SummarizerService(
+        FakeSummarizerBackend(latency_seconds=0.05),
+        max_in_flight=1,
+        max_pending=1,
+    )
+
+    results = await asyncio.gather(
+        *(service.complete(build_prompt(f"note {i}")) for i in range(3)),
+        return_exceptions=True,
+    )
+
+    assert results[:2] == [fake_summary("note 0"), fake_summary("note 1")]
+    assert isinstance(results[2], ExecutorSaturatedError)
+
+    stats = service.stats()
+    assert stats["calls"] == 2
+    assert stats["rejected"] == 1
+    assert stats["in_flight"] == 0
+    assert stats["queue_wait_seconds_total"] >= 0.04
+    assert stats["call_seconds_total"] >= 0.1
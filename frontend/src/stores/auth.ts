@@ -54,8 +54,15 @@ export const useAuthStore = defineStore("auth", {
     },
     async fetchNotes(): Promise<any[]> {
       console.log("Sending request with Authorization:", api.defaults.headers.common["Authorization"]);
-      const response = await api.get('/notes/');
-      return response.data;
+      const notes: any[] = [];
+      let afterId: number | null = null;
+      do {
+        const params: Record<string, number> = afterId === null ? {} : { after_id: afterId };
+        const response = await api.get("/notes/", { params });
+        notes.push(...response.data.items);
+        afterId = response.data.next_cursor;
+      } while (afterId !== null);
+      return notes;
     },
     async createNote(text: string): Promise<any> {
       console.log("Sending request with Authorization:", api.defaults.headers.common["Authorization"]);